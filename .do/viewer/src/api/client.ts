@@ -1,4 +1,4 @@
-const WORKER_URL = 'http://127.0.0.1:3778'
+export const WORKER_URL = 'http://127.0.0.1:3778'
 
 export interface Project {
   id: string
@@ -41,10 +41,32 @@ export interface TeamMember {
 }
 
 export interface Summary {
-  date: string
-  sessions_count: number
-  observations_count: number
-  highlights?: string[]
+  id: number
+  session_id: string
+  type: string
+  content: string
+  created_at: string
+  request?: string
+  investigated?: string
+  learned?: string
+  completed?: string
+  next_steps?: string
+  source_message?: string
+  archived?: boolean
+}
+
+export interface UserPrompt {
+  id: number
+  session_id: string
+  prompt_number: number
+  prompt_text: string
+  response?: string
+  created_at: string
+}
+
+export interface Page<T> {
+  items: T[]
+  nextCursor: string | null
 }
 
 async function fetchJson<T>(url: string): Promise<T> {
@@ -55,16 +77,26 @@ async function fetchJson<T>(url: string): Promise<T> {
   return response.json()
 }
 
+// List endpoints return the cursor of the next page in X-Next-Cursor
+async function fetchPage<T>(url: string): Promise<Page<T>> {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`)
+  }
+  return {
+    items: (await response.json()) || [],
+    nextCursor: response.headers.get('X-Next-Cursor'),
+  }
+}
+
 export const api = {
   // Projects
   getProjects: () =>
     fetchJson<Project[]>(`${WORKER_URL}/api/projects`),
 
   // Sessions
-  getSessions: (projectId?: string) => {
-    const params = projectId ? `?project_id=${encodeURIComponent(projectId)}` : ''
-    return fetchJson<Session[]>(`${WORKER_URL}/api/sessions${params}`)
-  },
+  getSessions: (params: Record<string, string> = {}) =>
+    fetchPage<Session>(`${WORKER_URL}/api/sessions?${new URLSearchParams(params).toString()}`),
 
   getSession: (id: string) =>
     fetchJson<Session>(`${WORKER_URL}/api/sessions/${id}`),
@@ -75,6 +107,9 @@ export const api = {
     return fetchJson<Observation[]>(`${WORKER_URL}/api/observations${query ? `?${query}` : ''}`)
   },
 
+  getObservationsPage: (params: Record<string, string>) =>
+    fetchPage<Observation>(`${WORKER_URL}/api/observations?${new URLSearchParams(params).toString()}`),
+
   searchObservations: (q: string) =>
     fetchJson<Observation[]>(`${WORKER_URL}/api/observations/search?q=${encodeURIComponent(q)}`),
 
@@ -83,12 +118,19 @@ export const api = {
     fetchJson<TeamMember[]>(`${WORKER_URL}/api/team/context?project_path=${encodeURIComponent(projectPath)}`),
 
   // Plans
-  getPlans: () =>
-    fetchJson<Plan[]>(`${WORKER_URL}/api/plans`),
+  getPlans: (params: Record<string, string> = {}) =>
+    fetchPage<Plan>(`${WORKER_URL}/api/plans?${new URLSearchParams(params).toString()}`),
 
   // Summaries
-  getSummaries: (days?: number) =>
-    fetchJson<Summary[]>(`${WORKER_URL}/api/summaries?days=${days || 7}`),
+  getSummaries: (params: Record<string, string> = {}) =>
+    fetchPage<Summary>(`${WORKER_URL}/api/summaries?${new URLSearchParams(params).toString()}`),
+
+  getSummary: (id: number) =>
+    fetchJson<Summary>(`${WORKER_URL}/api/summaries/${id}`),
+
+  // User prompts
+  getPrompts: (params: Record<string, string> = {}) =>
+    fetchPage<UserPrompt>(`${WORKER_URL}/api/prompts?${new URLSearchParams(params).toString()}`),
 
   // Health check
   health: () =>
@@ -0,0 +1,74 @@
+import { useEffect, useRef } from 'react'
+import { WORKER_URL, type Observation, type Plan, type Session } from './client'
+
+export interface PromptEvent {
+  id: number
+  session_id: string
+  prompt_number: number
+  prompt_text: string
+  response?: string
+  created_at: string
+}
+
+export interface PromptResponseEvent {
+  session_id: string
+  response: string
+}
+
+export interface WorkerEvents {
+  'session.created': Session
+  'session.updated': Session
+  'observation.created': Observation
+  'prompt.created': PromptEvent
+  'prompt.updated': PromptResponseEvent
+  'plan.created': Plan
+  'summary.created': { id: number; session_id?: string; type: string; content: string; created_at: string }
+}
+
+export type WorkerEventHandlers = {
+  [K in keyof WorkerEvents]?: (data: WorkerEvents[K]) => void
+} & {
+  // Events were missed (e.g. the worker restarted); reload the full list
+  reset?: () => void
+}
+
+// Subscribes to the worker's live update stream (/api/events) while mounted.
+// EventSource reconnects on its own and resumes with Last-Event-ID.
+export function useWorkerEvents(handlers: WorkerEventHandlers) {
+  const handlersRef = useRef(handlers)
+  handlersRef.current = handlers
+
+  useEffect(() => {
+    const source = new EventSource(`${WORKER_URL}/api/events`)
+
+    const types = [
+      'session.created',
+      'session.updated',
+      'observation.created',
+      'prompt.created',
+      'prompt.updated',
+      'plan.created',
+      'summary.created',
+    ] as const
+    for (const type of types) {
+      source.addEventListener(type, (e) => {
+        const handler = handlersRef.current[type] as ((data: unknown) => void) | undefined
+        handler?.(JSON.parse((e as MessageEvent).data))
+      })
+    }
+    source.addEventListener('reset', () => handlersRef.current.reset?.())
+
+    return () => source.close()
+  }, [])
+}
+
+// Inserts or replaces an item by id, keeping newest items first.
+export function upsertById<T extends { id: string | number }>(items: T[], item: T): T[] {
+  const index = items.findIndex((existing) => existing.id === item.id)
+  if (index === -1) {
+    return [item, ...items]
+  }
+  const next = items.slice()
+  next[index] = item
+  return next
+}
@@ -0,0 +1,80 @@
+import { useCallback, useEffect, useRef, useState } from 'react'
+import type { Page } from './client'
+
+const PAGE_SIZE = 50
+
+// Loads a cursor-paginated list, following X-Next-Cursor as the loader element
+// scrolls into view. Changing params reloads from the first page.
+export function usePagedList<T>(
+  fetchPage: (params: Record<string, string>) => Promise<Page<T>>,
+  params: Record<string, string> = {},
+) {
+  const [items, setItems] = useState<T[]>([])
+  const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+  const [cursor, setCursor] = useState<string | null>(null)
+  const loaderRef = useRef<HTMLDivElement>(null)
+  // Responses for an older set of params (or a reload) are dropped
+  const generation = useRef(0)
+
+  const query = new URLSearchParams({ ...params, limit: String(PAGE_SIZE) }).toString()
+
+  const load = useCallback(async (reset: boolean) => {
+    const current = reset ? ++generation.current : generation.current
+    if (reset) {
+      setLoading(true)
+    } else {
+      setLoadingMore(true)
+    }
+    setError(null)
+
+    try {
+      const request = Object.fromEntries(new URLSearchParams(query))
+      if (!reset && cursor) {
+        request.cursor = cursor
+      }
+      const page = await fetchPage(request)
+      if (current !== generation.current) return
+
+      setItems(prev => (reset ? page.items : [...prev, ...page.items]))
+      setCursor(page.nextCursor)
+    } catch (err) {
+      if (current !== generation.current) return
+      setError(err instanceof Error ? err.message : 'Failed to load')
+    } finally {
+      if (current === generation.current) {
+        setLoading(false)
+        setLoadingMore(false)
+      }
+    }
+  }, [fetchPage, query, cursor])
+
+  const reload = useCallback(() => load(true), [load])
+
+  useEffect(() => {
+    load(true)
+  }, [query])
+
+  const hasMore = cursor !== null
+
+  // Infinite scroll with IntersectionObserver
+  useEffect(() => {
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries[0].isIntersecting && hasMore && !loading && !loadingMore) {
+          load(false)
+        }
+      },
+      { threshold: 0.1 }
+    )
+
+    if (loaderRef.current) {
+      observer.observe(loaderRef.current)
+    }
+
+    return () => observer.disconnect()
+  }, [hasMore, loading, loadingMore, load])
+
+  return { items, setItems, loading, loadingMore, error, hasMore, reload, loaderRef }
+}
@@ -0,0 +1,26 @@
+import type { RefObject } from 'react'
+
+interface ScrollLoaderProps {
+  loaderRef: RefObject<HTMLDivElement | null>
+  loadingMore: boolean
+}
+
+// Sentinel at the end of a paginated list; usePagedList loads the next page
+// when it scrolls into view.
+export default function ScrollLoader({ loaderRef, loadingMore }: ScrollLoaderProps) {
+  return (
+    <div ref={loaderRef} className="py-4 text-center">
+      {loadingMore ? (
+        <div className="flex items-center justify-center gap-2 text-gray-500">
+          <svg className="animate-spin h-5 w-5" viewBox="0 0 24 24">
+            <circle className="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" strokeWidth="4" fill="none" />
+            <path className="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4z" />
+          </svg>
+          <span>Loading more...</span>
+        </div>
+      ) : (
+        <span className="text-gray-400 text-sm">Scroll for more</span>
+      )}
+    </div>
+  )
+}
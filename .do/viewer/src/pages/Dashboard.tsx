@@ -1,5 +1,6 @@
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
 import { api, type Session, type Observation } from '../api/client'
+import { upsertById, useWorkerEvents } from '../api/events'
 import Timeline from '../components/Timeline'
 
 interface Stats {
@@ -15,41 +16,57 @@ export default function Dashboard() {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
-  useEffect(() => {
-    async function loadData() {
-      setLoading(true)
-      setError(null)
-
-      try {
-        // Health check
-        await api.health()
-
-        // Load data in parallel
-        const [sessions, observations] = await Promise.all([
-          api.getSessions(),
-          api.getObservations({ limit: '10' }),
-        ])
-
-        const sessionList = sessions || []
-        const observationList = observations || []
-
-        setStats({
-          sessions: sessionList.length,
-          observations: observationList.length,
-          connected: true,
-        })
-        setRecentSessions(sessionList.slice(0, 5))
-        setRecentObservations(observationList.slice(0, 10))
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to connect to Worker API')
-        setStats(prev => ({ ...prev, connected: false }))
-      } finally {
-        setLoading(false)
-      }
+  const loadData = useCallback(async () => {
+    setLoading(true)
+    setError(null)
+
+    try {
+      // Health check
+      await api.health()
+
+      // Load data in parallel
+      const [sessions, observations] = await Promise.all([
+        api.getSessions(),
+        api.getObservations({ limit: '10' }),
+      ])
+
+      const sessionList = sessions.items
+      const observationList = observations || []
+
+      setStats({
+        sessions: sessionList.length,
+        observations: observationList.length,
+        connected: true,
+      })
+      setRecentSessions(sessionList.slice(0, 5))
+      setRecentObservations(observationList.slice(0, 10))
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to connect to Worker API')
+      setStats(prev => ({ ...prev, connected: false }))
+    } finally {
+      setLoading(false)
     }
+  }, [])
 
+  useEffect(() => {
     loadData()
-  }, [])
+  }, [loadData])
+
+  // Apply live updates instead of refetching the lists
+  useWorkerEvents({
+    'session.created': (session) => {
+      setRecentSessions(prev => upsertById(prev, session).slice(0, 5))
+      setStats(prev => ({ ...prev, sessions: prev.sessions + 1 }))
+    },
+    'session.updated': (session) => {
+      setRecentSessions(prev => prev.map(s => (s.id === session.id ? session : s)))
+    },
+    'observation.created': (observation) => {
+      setRecentObservations(prev => upsertById(prev, observation).slice(0, 10))
+      setStats(prev => ({ ...prev, observations: prev.observations + 1 }))
+    },
+    reset: loadData,
+  })
 
   return (
     <div className="space-y-6">
@@ -1,5 +1,6 @@
 import { useEffect, useState, useCallback, useRef } from 'react'
 import { api, type Observation } from '../api/client'
+import { upsertById, useWorkerEvents } from '../api/events'
 import Timeline from '../components/Timeline'
 
 const PAGE_SIZE = 50
@@ -12,45 +13,44 @@ export default function Observations() {
   const [searchQuery, setSearchQuery] = useState('')
   const [typeFilter, setTypeFilter] = useState<string>('all')
   const [hasMore, setHasMore] = useState(true)
-  const [offset, setOffset] = useState(0)
+  const [cursor, setCursor] = useState<string | null>(null)
   const loaderRef = useRef<HTMLDivElement>(null)
 
   const loadObservations = useCallback(async (reset = true) => {
     if (reset) {
       setLoading(true)
-      setOffset(0)
+      setCursor(null)
     } else {
       setLoadingMore(true)
     }
     setError(null)
 
     try {
-      const currentOffset = reset ? 0 : offset
       const params: Record<string, string> = {
-        limit: String(PAGE_SIZE),
-        offset: String(currentOffset)
+        limit: String(PAGE_SIZE)
+      }
+      if (!reset && cursor) {
+        params.cursor = cursor
       }
       if (typeFilter !== 'all') {
         params.type = typeFilter
       }
-      const data = await api.getObservations(params)
-      const newData = data || []
+      const page = await api.getObservationsPage(params)
 
       if (reset) {
-        setObservations(newData)
-        setOffset(PAGE_SIZE)
+        setObservations(page.items)
       } else {
-        setObservations(prev => [...prev, ...newData])
-        setOffset(prev => prev + PAGE_SIZE)
+        setObservations(prev => [...prev, ...page.items])
       }
-      setHasMore(newData.length === PAGE_SIZE)
+      setCursor(page.nextCursor)
+      setHasMore(page.nextCursor !== null)
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load observations')
     } finally {
       setLoading(false)
       setLoadingMore(false)
     }
-  }, [typeFilter, offset])
+  }, [typeFilter, cursor])
 
   const handleSearch = async () => {
     if (!searchQuery.trim()) {
@@ -76,6 +76,17 @@ export default function Observations() {
     loadObservations(true)
   }, [typeFilter])
 
+  // Prepend new observations that match the current filter; search results stay as they are
+  useWorkerEvents({
+    'observation.created': (observation) => {
+      if (searchQuery || (typeFilter !== 'all' && observation.type !== typeFilter)) return
+      setObservations(prev => upsertById(prev, observation))
+    },
+    reset: () => {
+      if (!searchQuery) loadObservations(true)
+    },
+  })
+
   // Infinite scroll with IntersectionObserver
   useEffect(() => {
     const observer = new IntersectionObserver(
@@ -1,27 +1,20 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import { api, type Plan } from '../api/client'
+import { upsertById, useWorkerEvents } from '../api/events'
+import { usePagedList } from '../api/paging'
+import ScrollLoader from '../components/ScrollLoader'
 
 export default function Plans() {
-  const [plans, setPlans] = useState<Plan[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
+  const {
+    items: plans, setItems: setPlans, loading, loadingMore, error, hasMore, reload, loaderRef,
+  } = usePagedList(api.getPlans)
   const [selectedPlan, setSelectedPlan] = useState<Plan | null>(null)
 
-  useEffect(() => {
-    async function loadPlans() {
-      setLoading(true)
-      try {
-        const data = await api.getPlans()
-        setPlans(data || [])
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to load plans')
-      } finally {
-        setLoading(false)
-      }
-    }
-
-    loadPlans()
-  }, [])
+  // Apply live updates instead of refetching the list
+  useWorkerEvents({
+    'plan.created': (plan) => setPlans(prev => upsertById(prev, plan)),
+    reset: reload,
+  })
 
   const getStatusColor = (status: string) => {
     const colors: Record<string, string> = {
@@ -37,7 +30,7 @@ export default function Plans() {
     <div className="space-y-6">
       <div className="flex items-center justify-between">
         <h1 className="text-2xl font-bold text-gray-900">Plans</h1>
-        <p className="text-sm text-gray-500">{plans.length} total</p>
+        <p className="text-sm text-gray-500">{plans.length}{hasMore ? '+' : ''} total</p>
       </div>
 
       {error && (
@@ -85,6 +78,7 @@ export default function Plans() {
                 </button>
               ))
             )}
+            {!loading && hasMore && <ScrollLoader loaderRef={loaderRef} loadingMore={loadingMore} />}
           </div>
         </div>
 
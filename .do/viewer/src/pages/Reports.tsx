@@ -1,44 +1,26 @@
-import { useEffect, useState } from 'react'
-
-interface SessionSummary {
-  id: number
-  session_id: string
-  type: string
-  content: string
-  created_at: string
-  request?: string
-  investigated?: string
-  learned?: string
-  completed?: string
-  next_steps?: string
-  source_message?: string
-}
+import { useState } from 'react'
+import { api, type Summary } from '../api/client'
+import { usePagedList } from '../api/paging'
+import ScrollLoader from '../components/ScrollLoader'
 
 export default function Reports() {
-  const [summaries, setSummaries] = useState<SessionSummary[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
   const [days, setDays] = useState(7)
-  const [selectedSummary, setSelectedSummary] = useState<SessionSummary | null>(null)
+  const { items: summaries, loading, loadingMore, error, hasMore, loaderRef } =
+    usePagedList(api.getSummaries, { days: String(days) })
+  const [selectedSummary, setSelectedSummary] = useState<Summary | null>(null)
   const [showSource, setShowSource] = useState(false)
 
-  useEffect(() => {
-    async function loadSummaries() {
-      setLoading(true)
-      try {
-        const response = await fetch(`http://127.0.0.1:3778/api/summaries?days=${days}`)
-        if (!response.ok) throw new Error('Failed to fetch')
-        const data = await response.json()
-        setSummaries(Array.isArray(data) ? data : [])
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to load summaries')
-      } finally {
-        setLoading(false)
-      }
+  // Archived transcripts are not included in the list; load them when a summary is opened
+  async function openSummary(summary: Summary) {
+    setSelectedSummary(summary)
+    if (!summary.archived) return
+    try {
+      const full = await api.getSummary(summary.id)
+      setSelectedSummary((current) => (current?.id === full.id ? full : current))
+    } catch {
+      // Keep showing the summary without its source message
     }
-
-    loadSummaries()
-  }, [days])
+  }
 
   // Group summaries by date
   const groupedByDate = summaries.reduce((acc, s) => {
@@ -46,7 +28,7 @@ export default function Reports() {
     if (!acc[date]) acc[date] = []
     acc[date].push(s)
     return acc
-  }, {} as Record<string, SessionSummary[]>)
+  }, {} as Record<string, Summary[]>)
 
   const dates = Object.keys(groupedByDate).sort((a, b) =>
     new Date(b).getTime() - new Date(a).getTime()
@@ -83,7 +65,7 @@ export default function Reports() {
           {loading ? (
             <div className="animate-pulse h-8 w-16 bg-gray-200 rounded mt-1" />
           ) : (
-            <p className="text-2xl font-bold text-gray-900">{summaries.length}</p>
+            <p className="text-2xl font-bold text-gray-900">{summaries.length}{hasMore ? '+' : ''}</p>
           )}
         </div>
         <div className="bg-white rounded-lg shadow p-6">
@@ -136,7 +118,7 @@ export default function Reports() {
                   {groupedByDate[date].map((summary) => (
                     <button
                       key={summary.id}
-                      onClick={() => setSelectedSummary(summary)}
+                      onClick={() => openSummary(summary)}
                       className="w-full text-left bg-gray-50 rounded-lg p-3 hover:bg-gray-100 transition-colors"
                     >
                       <div className="flex items-center justify-between mb-2">
@@ -159,6 +141,7 @@ export default function Reports() {
               </div>
             ))
           )}
+          {!loading && hasMore && <ScrollLoader loaderRef={loaderRef} loadingMore={loadingMore} />}
         </div>
       </div>
 
@@ -1,5 +1,8 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
 import { api, type Session } from '../api/client'
+import { upsertById, useWorkerEvents } from '../api/events'
+import { usePagedList } from '../api/paging'
+import ScrollLoader from '../components/ScrollLoader'
 
 // Relative time helper
 function timeAgo(dateStr: string): string {
@@ -15,32 +18,26 @@ function timeAgo(dateStr: string): string {
 }
 
 export default function Sessions() {
-  const [sessions, setSessions] = useState<Session[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
+  const {
+    items: sessions, setItems: setSessions, loading, loadingMore, error, hasMore, reload, loaderRef,
+  } = usePagedList(api.getSessions)
   const [selectedSession, setSelectedSession] = useState<Session | null>(null)
 
-  useEffect(() => {
-    async function loadSessions() {
-      setLoading(true)
-      try {
-        const data = await api.getSessions()
-        setSessions(data || [])
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to load sessions')
-      } finally {
-        setLoading(false)
-      }
-    }
-
-    loadSessions()
-  }, [])
+  // Apply live updates instead of refetching the list
+  useWorkerEvents({
+    'session.created': (session) => setSessions(prev => upsertById(prev, session)),
+    'session.updated': (session) => {
+      setSessions(prev => upsertById(prev, session))
+      setSelectedSession(prev => (prev?.id === session.id ? session : prev))
+    },
+    reset: reload,
+  })
 
   return (
     <div className="space-y-6">
       <div className="flex items-center justify-between">
         <h1 className="text-2xl font-bold text-gray-900">Sessions</h1>
-        <p className="text-sm text-gray-500">{sessions.length} total</p>
+        <p className="text-sm text-gray-500">{sessions.length}{hasMore ? '+' : ''} total</p>
       </div>
 
       {error && (
@@ -106,6 +103,7 @@ export default function Sessions() {
                 </button>
               ))
             )}
+            {!loading && hasMore && <ScrollLoader loaderRef={loaderRef} loadingMore={loadingMore} />}
           </div>
         </div>
 
@@ -1,37 +1,35 @@
-import { useEffect, useState } from 'react'
-
-interface UserPrompt {
-  id: number
-  session_id: string
-  prompt_number: number
-  prompt_text: string
-  response?: string
-  created_at: string
-}
+import { useState } from 'react'
+import { api, type UserPrompt } from '../api/client'
+import { upsertById, useWorkerEvents } from '../api/events'
+import { usePagedList } from '../api/paging'
+import ScrollLoader from '../components/ScrollLoader'
 
 export default function UserPrompts() {
-  const [prompts, setPrompts] = useState<UserPrompt[]>([])
-  const [loading, setLoading] = useState(true)
-  const [error, setError] = useState<string | null>(null)
+  const {
+    items: prompts, setItems: setPrompts, loading, loadingMore, error, hasMore, reload, loaderRef,
+  } = usePagedList(api.getPrompts)
   const [selectedPrompt, setSelectedPrompt] = useState<UserPrompt | null>(null)
 
-  useEffect(() => {
-    async function loadPrompts() {
-      setLoading(true)
-      try {
-        const response = await fetch('http://127.0.0.1:3778/api/prompts?limit=100')
-        if (!response.ok) throw new Error(`HTTP ${response.status}`)
-        const data = await response.json()
-        setPrompts(Array.isArray(data) ? data : [])
-      } catch (err) {
-        setError(err instanceof Error ? err.message : 'Failed to load prompts')
-      } finally {
-        setLoading(false)
-      }
-    }
-
-    loadPrompts()
-  }, [])
+  // Apply live updates instead of refetching the list
+  useWorkerEvents({
+    'prompt.created': (prompt) => setPrompts(prev => upsertById(prev, prompt)),
+    'prompt.updated': ({ session_id, response }) => {
+      // The response belongs to the session's latest prompt
+      setPrompts(prev => {
+        let latest = -1
+        prev.forEach((p, i) => {
+          if (p.session_id === session_id && (latest === -1 || p.prompt_number > prev[latest].prompt_number)) {
+            latest = i
+          }
+        })
+        if (latest === -1) return prev
+        const next = prev.slice()
+        next[latest] = { ...next[latest], response }
+        return next
+      })
+    },
+    reset: reload,
+  })
 
   // Group by session
   const groupedBySession = prompts.reduce((acc, p) => {
@@ -44,7 +42,7 @@ export default function UserPrompts() {
     <div className="space-y-6">
       <div className="flex items-center justify-between">
         <h1 className="text-2xl font-bold text-gray-900">User Prompts</h1>
-        <p className="text-sm text-gray-500">{prompts.length} total</p>
+        <p className="text-sm text-gray-500">{prompts.length}{hasMore ? '+' : ''} total</p>
       </div>
 
       {error && (
@@ -135,6 +133,7 @@ export default function UserPrompts() {
               </button>
             ))
           )}
+          {!loading && hasMore && <ScrollLoader loaderRef={loaderRef} loadingMore={loadingMore} />}
         </div>
       </div>
 
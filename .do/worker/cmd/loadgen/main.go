@@ -0,0 +1,271 @@
+// Package main replays synthetic hook traffic against a running worker and
+// reports per-step latency percentiles.
+//
+// Each simulated session follows the hook lifecycle: SessionStart creates the
+// session and injects context, every prompt is recorded together with its tool
+// observations and response, and SessionEnd generates a summary and ends the
+// session. Point -url at a worker started with DO_DB_TYPE=sqlite or mysql to
+// compare adapters (see the loadgen-* Makefile targets).
+package main
+
+import (
+	"bufio"
+	"bytes"
+	"encoding/json"
+	"flag"
+	"fmt"
+	"io"
+	"log"
+	"math/rand"
+	"net/http"
+	"net/url"
+	"os"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+var observationTypes = []string{"decision", "pattern", "learning", "insight"}
+
+// recorder collects latencies per step.
+type recorder struct {
+	mu        sync.Mutex
+	latencies map[string][]time.Duration
+	errors    map[string]int
+	order     []string
+}
+
+func newRecorder() *recorder {
+	return &recorder{
+		latencies: make(map[string][]time.Duration),
+		errors:    make(map[string]int),
+	}
+}
+
+func (r *recorder) record(step string, d time.Duration, err error) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	if _, ok := r.latencies[step]; !ok {
+		r.order = append(r.order, step)
+		r.latencies[step] = nil
+	}
+	if err != nil {
+		r.errors[step]++
+		return
+	}
+	r.latencies[step] = append(r.latencies[step], d)
+}
+
+func (r *recorder) report(w io.Writer, elapsed time.Duration) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+
+	total := 0
+	fmt.Fprintf(w, "%-22s %7s %6s %9s %9s %9s %9s\n", "step", "count", "errors", "p50", "p95", "p99", "max")
+	for _, step := range r.order {
+		samples := r.latencies[step]
+		sort.Slice(samples, func(i, j int) bool { return samples[i] < samples[j] })
+		total += len(samples) + r.errors[step]
+		fmt.Fprintf(w, "%-22s %7d %6d %9s %9s %9s %9s\n", step, len(samples), r.errors[step],
+			percentile(samples, 0.50), percentile(samples, 0.95), percentile(samples, 0.99), percentile(samples, 1))
+	}
+	fmt.Fprintf(w, "\n%d requests in %s (%.1f req/s)\n", total, elapsed.Round(time.Millisecond), float64(total)/elapsed.Seconds())
+}
+
+// percentile returns the nearest-rank percentile of sorted samples.
+func percentile(sorted []time.Duration, p float64) time.Duration {
+	if len(sorted) == 0 {
+		return 0
+	}
+	i := int(float64(len(sorted))*p+0.5) - 1
+	if i < 0 {
+		i = 0
+	}
+	if i >= len(sorted) {
+		i = len(sorted) - 1
+	}
+	return sorted[i].Round(10 * time.Microsecond)
+}
+
+// client issues worker API calls and records their latency.
+type client struct {
+	base string
+	http *http.Client
+	rec  *recorder
+}
+
+func (c *client) do(step, method, path string, body any) error {
+	var reader io.Reader
+	if body != nil {
+		data, err := json.Marshal(body)
+		if err != nil {
+			return err
+		}
+		reader = bytes.NewReader(data)
+	}
+	req, err := http.NewRequest(method, c.base+path, reader)
+	if err != nil {
+		return err
+	}
+	if body != nil {
+		req.Header.Set("Content-Type", "application/json")
+	}
+
+	start := time.Now()
+	resp, err := c.http.Do(req)
+	if err == nil {
+		_, err = io.Copy(io.Discard, resp.Body)
+		resp.Body.Close()
+		if err == nil && resp.StatusCode >= 400 {
+			err = fmt.Errorf("%s %s: %s", method, path, resp.Status)
+		}
+	}
+	c.rec.record(step, time.Since(start), err)
+	return err
+}
+
+// session replays the hook traffic of one Claude session.
+func (c *client) session(rng *rand.Rand, id, user string, prompts, observations int) {
+	if err := c.do("session.create", http.MethodPost, "/api/sessions", map[string]string{
+		"id": id, "user_name": user, "project_id": "loadgen",
+	}); err != nil {
+		log.Printf("session %s: %v", id, err)
+		return
+	}
+	c.do("context.inject", http.MethodGet, "/api/context/inject?user="+url.QueryEscape(user), nil)
+
+	for p := 1; p <= prompts; p++ {
+		c.do("prompt.create", http.MethodPost, "/api/prompts", map[string]any{
+			"session_id":    id,
+			"prompt_number": p,
+			"prompt_text":   sentence(rng, 12),
+		})
+		for o := 0; o < observations; o++ {
+			c.do("observation.create", http.MethodPost, "/api/observations", map[string]any{
+				"session_id": id,
+				"agent_name": "loadgen",
+				"type":       observationTypes[rng.Intn(len(observationTypes))],
+				"content":    sentence(rng, 40),
+				"importance": 1 + rng.Intn(5),
+			})
+		}
+		c.do("prompt.response", http.MethodPut, "/api/prompts/latest/response", map[string]string{
+			"session_id": id,
+			"response":   sentence(rng, 60),
+		})
+		c.do("observation.list", http.MethodGet, "/api/observations?limit=20&session_id="+url.QueryEscape(id), nil)
+	}
+
+	c.do("summary.generate", http.MethodPost, "/api/summaries/generate", map[string]string{
+		"session_id":             id,
+		"last_assistant_message": sentence(rng, 80),
+	})
+	c.do("session.end", http.MethodPut, "/api/sessions/"+url.PathEscape(id)+"/end", map[string]string{})
+}
+
+var words = strings.Fields(`worker session context cache query index adapter batch
+flush summary prompt plan observation latency cursor stream event retry commit
+schema migration handler route pool queue decision pattern learning insight`)
+
+func sentence(rng *rand.Rand, n int) string {
+	parts := make([]string, n)
+	for i := range parts {
+		parts[i] = words[rng.Intn(len(words))]
+	}
+	return strings.Join(parts, " ")
+}
+
+// waitHealthy polls /health until the worker answers or the timeout passes.
+func waitHealthy(base string, timeout time.Duration) error {
+	deadline := time.Now().Add(timeout)
+	for {
+		resp, err := http.Get(base + "/health")
+		if err == nil {
+			resp.Body.Close()
+			if resp.StatusCode == http.StatusOK {
+				return nil
+			}
+		}
+		if time.Now().After(deadline) {
+			return fmt.Errorf("worker at %s not healthy after %s", base, timeout)
+		}
+		time.Sleep(200 * time.Millisecond)
+	}
+}
+
+// printWorkerMetrics prints the worker's queue and cache gauges after the run.
+func printWorkerMetrics(w io.Writer, base string) {
+	resp, err := http.Get(base + "/metrics")
+	if err != nil {
+		return
+	}
+	defer resp.Body.Close()
+
+	fmt.Fprintln(w, "\nworker metrics:")
+	scanner := bufio.NewScanner(resp.Body)
+	for scanner.Scan() {
+		line := scanner.Text()
+		for _, prefix := range []string{"do_observation_queue_depth", "do_cache_hit_ratio", "do_db_query_errors_total"} {
+			if strings.HasPrefix(line, prefix) {
+				fmt.Fprintln(w, "  "+line)
+			}
+		}
+	}
+}
+
+func main() {
+	base := flag.String("url", "http://127.0.0.1:3778", "Worker base URL")
+	sessions := flag.Int("sessions", 50, "Number of sessions to replay")
+	concurrency := flag.Int("concurrency", 8, "Sessions replayed in parallel")
+	prompts := flag.Int("prompts", 5, "Prompts per session")
+	observations := flag.Int("obs", 4, "Observations per prompt")
+	users := flag.Int("users", 4, "Distinct user names")
+	seed := flag.Int64("seed", 1, "Random seed for generated content")
+	wait := flag.Duration("wait", 0, "Wait up to this long for the worker to become healthy")
+	flag.Parse()
+
+	*base = strings.TrimRight(*base, "/")
+	if *concurrency < 1 || *users < 1 {
+		log.Fatal("-concurrency and -users must be at least 1")
+	}
+	if *wait > 0 {
+		if err := waitHealthy(*base, *wait); err != nil {
+			log.Fatal(err)
+		}
+	}
+
+	c := &client{
+		base: *base,
+		http: &http.Client{
+			Timeout:   30 * time.Second,
+			Transport: &http.Transport{MaxIdleConnsPerHost: *concurrency},
+		},
+		rec: newRecorder(),
+	}
+
+	run := time.Now().UnixNano()
+	ids := make(chan int)
+	var wg sync.WaitGroup
+	start := time.Now()
+	for w := 0; w < *concurrency; w++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for i := range ids {
+				rng := rand.New(rand.NewSource(*seed + int64(i)))
+				id := fmt.Sprintf("loadgen-%d-%d", run, i)
+				user := fmt.Sprintf("loadgen-user-%d", i%*users)
+				c.session(rng, id, user, *prompts, *observations)
+			}
+		}()
+	}
+	for i := 0; i < *sessions; i++ {
+		ids <- i
+	}
+	close(ids)
+	wg.Wait()
+
+	c.rec.report(os.Stdout, time.Since(start))
+	printWorkerMetrics(os.Stdout, *base)
+}
@@ -0,0 +1,82 @@
+package context
+
+import (
+	"context"
+	"fmt"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// newBenchAdapter opens a SQLite adapter holding a context-inject workload:
+// users with an ended and an open session each, observations, an active plan
+// and a summary per session.
+func newBenchAdapter(b *testing.B, users, observationsPerUser int) db.Adapter {
+	b.Helper()
+	adapter, err := db.New(db.Config{Type: "sqlite", Path: filepath.Join(b.TempDir(), "memory.db")})
+	if err != nil {
+		b.Fatal(err)
+	}
+	b.Cleanup(func() { adapter.Close() })
+
+	ctx := context.Background()
+	start := time.Now().Add(-48 * time.Hour)
+	for u := 0; u < users; u++ {
+		user := fmt.Sprintf("user-%d", u)
+		for i, id := range []string{user + "-ended", user + "-open"} {
+			session := &models.Session{ID: id, UserName: user, ProjectID: "project-" + user, StartedAt: start.Add(time.Duration(i) * time.Hour)}
+			if err := adapter.CreateSession(ctx, session); err != nil {
+				b.Fatal(err)
+			}
+			if err := adapter.CreatePlan(ctx, &models.Plan{SessionID: id, Title: "plan " + id, Content: "1. read\n2. change\n3. test", Status: "active"}); err != nil {
+				b.Fatal(err)
+			}
+		}
+		if err := adapter.EndSession(ctx, user+"-ended", "ended "+user); err != nil {
+			b.Fatal(err)
+		}
+		if err := adapter.CreateSummary(ctx, &models.Summary{SessionID: user + "-ended", Type: "session", Content: "previously on " + user}); err != nil {
+			b.Fatal(err)
+		}
+
+		batch := make([]models.Observation, observationsPerUser)
+		for i := range batch {
+			batch[i] = models.Observation{
+				SessionID:  user + "-open",
+				Type:       []string{"decision", "learning", "pattern"}[i%3],
+				Content:    fmt.Sprintf("observation %d of %s about the context builder", i, user),
+				Importance: 1 + i%5,
+			}
+		}
+		if err := adapter.CreateObservationsBatch(ctx, batch); err != nil {
+			b.Fatal(err)
+		}
+	}
+	return adapter
+}
+
+// BenchmarkBuildContextWithLevel measures a full context-inject build (reads
+// plus rendering) at each disclosure level, without the server's cache.
+func BenchmarkBuildContextWithLevel(b *testing.B) {
+	builder := NewBuilder(newBenchAdapter(b, 10, 1_000))
+	ctx := context.Background()
+
+	for _, level := range []models.ContextLevel{models.LevelMinimal, models.LevelStandard, models.LevelFull} {
+		b.Run(fmt.Sprintf("level-%d", level), func(b *testing.B) {
+			req := NewBuildRequest("user-0").WithLevel(level)
+			b.ReportAllocs()
+			for i := 0; i < b.N; i++ {
+				resp, err := builder.BuildContextWithLevel(ctx, req)
+				if err != nil {
+					b.Fatal(err)
+				}
+				if resp.Markdown == "" {
+					b.Fatal("empty context")
+				}
+			}
+		})
+	}
+}
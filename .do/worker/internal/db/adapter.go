@@ -3,11 +3,16 @@ package db
 
 import (
 	"context"
+	"time"
 
 	"github.com/do-focus/worker/pkg/models"
 )
 
 // Adapter defines the database interface.
+//
+// List methods visit rows in (created_at, id) keyset order, calling fn for each
+// row as it is read so callers can stream results; use Collect to build a slice.
+// Returning an error from fn stops the iteration and is returned by the method.
 type Adapter interface {
 	// Health checks database connectivity.
 	Health(ctx context.Context) error
@@ -23,25 +28,27 @@ type Adapter interface {
 
 	// Observation operations
 	CreateObservation(ctx context.Context, obs *models.Observation) error
+	CreateObservationsBatch(ctx context.Context, observations []models.Observation) error
 	GetObservations(ctx context.Context, sessionID string) ([]models.Observation, error)
 	GetRecentObservations(ctx context.Context, userName string, limit int) ([]models.Observation, error)
-	GetObservationsFiltered(ctx context.Context, sessionID string, obsType string, limit int, offset int) ([]models.Observation, error)
+	ListObservations(ctx context.Context, sessionID string, obsType string, page Page, fn func(*models.Observation) error) error
 	SearchObservations(ctx context.Context, query string, limit int) ([]models.Observation, error)
 
 	// Summary operations
 	CreateSummary(ctx context.Context, summary *models.Summary) error
 	GetSummaries(ctx context.Context, summaryType string, limit int) ([]models.Summary, error)
-	GetAllSummaries(ctx context.Context, days int, limit int) ([]models.Summary, error)
+	ListSummaries(ctx context.Context, days int, page Page, fn func(*models.Summary) error) error
+	GetSummary(ctx context.Context, id int64) (*models.Summary, error)
 	GetLatestSummary(ctx context.Context, userName string) (*models.Summary, error)
 
 	// Plan operations
 	CreatePlan(ctx context.Context, plan *models.Plan) error
 	GetActivePlan(ctx context.Context, userName string) (*models.Plan, error)
-	GetAllPlans(ctx context.Context, sessionID string, limit int) ([]models.Plan, error)
+	ListPlans(ctx context.Context, sessionID string, page Page, fn func(*models.Plan) error) error
 	UpdatePlanStatus(ctx context.Context, id int64, status string) error
 
 	// Session list operations
-	GetRecentSessions(ctx context.Context, limit int) ([]models.Session, error)
+	ListSessions(ctx context.Context, page Page, fn func(*models.Session) error) error
 
 	// Team operations
 	GetTeamContext(ctx context.Context, excludeUser string) ([]models.TeamContext, error)
@@ -51,13 +58,34 @@ type Adapter interface {
 
 	// UserPrompt operations
 	CreateUserPrompt(ctx context.Context, prompt *models.UserPrompt) error
-	GetUserPrompts(ctx context.Context, sessionID string, limit int) ([]models.UserPrompt, error)
+	ListUserPrompts(ctx context.Context, sessionID string, page Page, fn func(*models.UserPrompt) error) error
 	UpdateLatestPromptResponse(ctx context.Context, sessionID string, response string) error
 
 	// FTS5 Search operations
 	SearchFTS(ctx context.Context, query string, types []string, limit int) ([]models.SearchResult, error)
+
+	// Retention and maintenance operations
+	PruneTable(ctx context.Context, policy RetentionPolicy) (int64, error)
+	ArchiveTranscripts(ctx context.Context, before time.Time, limit int) (int, error)
+	StorageSize(ctx context.Context) (int64, error)
+	Compact(ctx context.Context, full bool) error // full permits rewriting whole tables
+
+	// Summary job queue operations
+	EnqueueSummaryJob(ctx context.Context, sessionID string, payload string) (*models.SummaryJob, error)
+	ClaimSummaryJob(ctx context.Context, now time.Time) (*models.SummaryJob, error)
+	CompleteSummaryJob(ctx context.Context, id int64, summaryID int64) error
+	RetrySummaryJob(ctx context.Context, id int64, errMsg string, runAfter time.Time) error
+	FailSummaryJob(ctx context.Context, id int64, errMsg string) error
+	RequeueRunningSummaryJobs(ctx context.Context) (int64, error)
+	PruneSummaryJobs(ctx context.Context, before time.Time) (int64, error)
+	GetSummaryJob(ctx context.Context, id int64) (*models.SummaryJob, error)
 }
 
+// activityRollupsVersion identifies the user_activity/project_activity
+// definitions. The adapters rebuild the rollups once per version and record it
+// in schema_versions; CreateSession and EndSession keep them current after that.
+const activityRollupsVersion = 1
+
 // Config holds database configuration.
 type Config struct {
 	Type     string // sqlite or mysql
@@ -0,0 +1,90 @@
+package db
+
+import (
+	"context"
+	"fmt"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// newTestSQLite opens a SQLite adapter on a fresh file in a temporary directory.
+func newTestSQLite(tb testing.TB) *SQLite {
+	tb.Helper()
+	s, err := NewSQLite(Config{Path: filepath.Join(tb.TempDir(), "memory.db")})
+	if err != nil {
+		tb.Fatalf("NewSQLite: %v", err)
+	}
+	tb.Cleanup(func() { s.Close() })
+	return s
+}
+
+// createTestSession inserts a session started at startedAt.
+func createTestSession(tb testing.TB, s *SQLite, id, user, project string, startedAt time.Time) {
+	tb.Helper()
+	session := &models.Session{ID: id, UserName: user, ProjectID: project, StartedAt: startedAt}
+	if err := s.CreateSession(context.Background(), session); err != nil {
+		tb.Fatalf("CreateSession(%s): %v", id, err)
+	}
+}
+
+var testWords = []string{
+	"worker", "session", "context", "cache", "query", "index", "adapter", "batch",
+	"flush", "summary", "prompt", "plan", "latency", "cursor", "stream", "retry",
+}
+
+// testContent returns deterministic filler text of n words for row i.
+func testContent(i, n int) string {
+	var b []byte
+	for w := 0; w < n; w++ {
+		if w > 0 {
+			b = append(b, ' ')
+		}
+		b = append(b, testWords[(i*7+w*3)%len(testWords)]...)
+	}
+	return string(b)
+}
+
+// seedObservations bulk-inserts n observations spread over sessions of the
+// given users, one minute apart and newest last. Every 100th row mentions
+// "needle" and only the oldest row mentions "rarity", giving searches a
+// common and a rare term.
+func seedObservations(tb testing.TB, s *SQLite, users []string, n int) {
+	tb.Helper()
+	ctx := context.Background()
+	start := time.Now().Add(-time.Duration(n) * time.Minute)
+	for i, user := range users {
+		createTestSession(tb, s, fmt.Sprintf("seed-%d", i), user, "project-"+user, start)
+	}
+
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		tb.Fatal(err)
+	}
+	defer tx.Rollback()
+	stmt, err := tx.PrepareContext(ctx, sqliteInsertObservation)
+	if err != nil {
+		tb.Fatal(err)
+	}
+	defer stmt.Close()
+
+	for i := 0; i < n; i++ {
+		session := fmt.Sprintf("seed-%d", i%len(users))
+		content := testContent(i, 12)
+		if i%100 == 0 {
+			content += " needle"
+		}
+		if i == 0 {
+			content += " rarity"
+		}
+		createdAt := start.Add(time.Duration(i) * time.Minute)
+		if _, err := stmt.ExecContext(ctx, session, "tester", "learning", content, 1+i%5, "", createdAt, session, session); err != nil {
+			tb.Fatal(err)
+		}
+	}
+	if err := tx.Commit(); err != nil {
+		tb.Fatal(err)
+	}
+}
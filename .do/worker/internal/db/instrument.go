@@ -0,0 +1,301 @@
+package db
+
+import (
+	"context"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// QueryObserver receives the duration and result of each Adapter call.
+type QueryObserver func(method string, elapsed time.Duration, err error)
+
+// Instrument wraps an adapter so every call is timed and reported to observe.
+// List methods are timed until the last row is visited, including the time
+// spent in the visitor.
+func Instrument(adapter Adapter, observe QueryObserver) Adapter {
+	return &instrumented{next: adapter, observe: observe}
+}
+
+// instrumented is the Adapter returned by Instrument.
+type instrumented struct {
+	next    Adapter
+	observe QueryObserver
+}
+
+func (i *instrumented) Health(ctx context.Context) error {
+	start := time.Now()
+	err := i.next.Health(ctx)
+	i.observe("Health", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) Close() error {
+	return i.next.Close()
+}
+
+func (i *instrumented) CreateSession(ctx context.Context, session *models.Session) error {
+	start := time.Now()
+	err := i.next.CreateSession(ctx, session)
+	i.observe("CreateSession", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetSession(ctx context.Context, id string) (*models.Session, error) {
+	start := time.Now()
+	result, err := i.next.GetSession(ctx, id)
+	i.observe("GetSession", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) GetLatestSession(ctx context.Context, userName string) (*models.Session, error) {
+	start := time.Now()
+	result, err := i.next.GetLatestSession(ctx, userName)
+	i.observe("GetLatestSession", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) EndSession(ctx context.Context, id string, summary string) error {
+	start := time.Now()
+	err := i.next.EndSession(ctx, id, summary)
+	i.observe("EndSession", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) CreateObservation(ctx context.Context, obs *models.Observation) error {
+	start := time.Now()
+	err := i.next.CreateObservation(ctx, obs)
+	i.observe("CreateObservation", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) CreateObservationsBatch(ctx context.Context, observations []models.Observation) error {
+	start := time.Now()
+	err := i.next.CreateObservationsBatch(ctx, observations)
+	i.observe("CreateObservationsBatch", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetObservations(ctx context.Context, sessionID string) ([]models.Observation, error) {
+	start := time.Now()
+	result, err := i.next.GetObservations(ctx, sessionID)
+	i.observe("GetObservations", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) GetRecentObservations(ctx context.Context, userName string, limit int) ([]models.Observation, error) {
+	start := time.Now()
+	result, err := i.next.GetRecentObservations(ctx, userName, limit)
+	i.observe("GetRecentObservations", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) ListObservations(ctx context.Context, sessionID string, obsType string, page Page, fn func(*models.Observation) error) error {
+	start := time.Now()
+	err := i.next.ListObservations(ctx, sessionID, obsType, page, fn)
+	i.observe("ListObservations", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) SearchObservations(ctx context.Context, query string, limit int) ([]models.Observation, error) {
+	start := time.Now()
+	result, err := i.next.SearchObservations(ctx, query, limit)
+	i.observe("SearchObservations", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) CreateSummary(ctx context.Context, summary *models.Summary) error {
+	start := time.Now()
+	err := i.next.CreateSummary(ctx, summary)
+	i.observe("CreateSummary", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetSummaries(ctx context.Context, summaryType string, limit int) ([]models.Summary, error) {
+	start := time.Now()
+	result, err := i.next.GetSummaries(ctx, summaryType, limit)
+	i.observe("GetSummaries", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) ListSummaries(ctx context.Context, days int, page Page, fn func(*models.Summary) error) error {
+	start := time.Now()
+	err := i.next.ListSummaries(ctx, days, page, fn)
+	i.observe("ListSummaries", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetSummary(ctx context.Context, id int64) (*models.Summary, error) {
+	start := time.Now()
+	result, err := i.next.GetSummary(ctx, id)
+	i.observe("GetSummary", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) GetLatestSummary(ctx context.Context, userName string) (*models.Summary, error) {
+	start := time.Now()
+	result, err := i.next.GetLatestSummary(ctx, userName)
+	i.observe("GetLatestSummary", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) CreatePlan(ctx context.Context, plan *models.Plan) error {
+	start := time.Now()
+	err := i.next.CreatePlan(ctx, plan)
+	i.observe("CreatePlan", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetActivePlan(ctx context.Context, userName string) (*models.Plan, error) {
+	start := time.Now()
+	result, err := i.next.GetActivePlan(ctx, userName)
+	i.observe("GetActivePlan", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) ListPlans(ctx context.Context, sessionID string, page Page, fn func(*models.Plan) error) error {
+	start := time.Now()
+	err := i.next.ListPlans(ctx, sessionID, page, fn)
+	i.observe("ListPlans", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) UpdatePlanStatus(ctx context.Context, id int64, status string) error {
+	start := time.Now()
+	err := i.next.UpdatePlanStatus(ctx, id, status)
+	i.observe("UpdatePlanStatus", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) ListSessions(ctx context.Context, page Page, fn func(*models.Session) error) error {
+	start := time.Now()
+	err := i.next.ListSessions(ctx, page, fn)
+	i.observe("ListSessions", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) GetTeamContext(ctx context.Context, excludeUser string) ([]models.TeamContext, error) {
+	start := time.Now()
+	result, err := i.next.GetTeamContext(ctx, excludeUser)
+	i.observe("GetTeamContext", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) GetProjects(ctx context.Context) ([]models.Project, error) {
+	start := time.Now()
+	result, err := i.next.GetProjects(ctx)
+	i.observe("GetProjects", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) CreateUserPrompt(ctx context.Context, prompt *models.UserPrompt) error {
+	start := time.Now()
+	err := i.next.CreateUserPrompt(ctx, prompt)
+	i.observe("CreateUserPrompt", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) ListUserPrompts(ctx context.Context, sessionID string, page Page, fn func(*models.UserPrompt) error) error {
+	start := time.Now()
+	err := i.next.ListUserPrompts(ctx, sessionID, page, fn)
+	i.observe("ListUserPrompts", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) UpdateLatestPromptResponse(ctx context.Context, sessionID string, response string) error {
+	start := time.Now()
+	err := i.next.UpdateLatestPromptResponse(ctx, sessionID, response)
+	i.observe("UpdateLatestPromptResponse", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) SearchFTS(ctx context.Context, query string, types []string, limit int) ([]models.SearchResult, error) {
+	start := time.Now()
+	result, err := i.next.SearchFTS(ctx, query, types, limit)
+	i.observe("SearchFTS", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) PruneTable(ctx context.Context, policy RetentionPolicy) (int64, error) {
+	start := time.Now()
+	result, err := i.next.PruneTable(ctx, policy)
+	i.observe("PruneTable", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) ArchiveTranscripts(ctx context.Context, before time.Time, limit int) (int, error) {
+	start := time.Now()
+	result, err := i.next.ArchiveTranscripts(ctx, before, limit)
+	i.observe("ArchiveTranscripts", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) StorageSize(ctx context.Context) (int64, error) {
+	start := time.Now()
+	result, err := i.next.StorageSize(ctx)
+	i.observe("StorageSize", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) Compact(ctx context.Context, full bool) error {
+	start := time.Now()
+	err := i.next.Compact(ctx, full)
+	i.observe("Compact", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) EnqueueSummaryJob(ctx context.Context, sessionID string, payload string) (*models.SummaryJob, error) {
+	start := time.Now()
+	result, err := i.next.EnqueueSummaryJob(ctx, sessionID, payload)
+	i.observe("EnqueueSummaryJob", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) ClaimSummaryJob(ctx context.Context, now time.Time) (*models.SummaryJob, error) {
+	start := time.Now()
+	result, err := i.next.ClaimSummaryJob(ctx, now)
+	i.observe("ClaimSummaryJob", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) CompleteSummaryJob(ctx context.Context, id int64, summaryID int64) error {
+	start := time.Now()
+	err := i.next.CompleteSummaryJob(ctx, id, summaryID)
+	i.observe("CompleteSummaryJob", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) RetrySummaryJob(ctx context.Context, id int64, errMsg string, runAfter time.Time) error {
+	start := time.Now()
+	err := i.next.RetrySummaryJob(ctx, id, errMsg, runAfter)
+	i.observe("RetrySummaryJob", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) FailSummaryJob(ctx context.Context, id int64, errMsg string) error {
+	start := time.Now()
+	err := i.next.FailSummaryJob(ctx, id, errMsg)
+	i.observe("FailSummaryJob", time.Since(start), err)
+	return err
+}
+
+func (i *instrumented) RequeueRunningSummaryJobs(ctx context.Context) (int64, error) {
+	start := time.Now()
+	result, err := i.next.RequeueRunningSummaryJobs(ctx)
+	i.observe("RequeueRunningSummaryJobs", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) PruneSummaryJobs(ctx context.Context, before time.Time) (int64, error) {
+	start := time.Now()
+	result, err := i.next.PruneSummaryJobs(ctx, before)
+	i.observe("PruneSummaryJobs", time.Since(start), err)
+	return result, err
+}
+
+func (i *instrumented) GetSummaryJob(ctx context.Context, id int64) (*models.SummaryJob, error) {
+	start := time.Now()
+	result, err := i.next.GetSummaryJob(ctx, id)
+	i.observe("GetSummaryJob", time.Since(start), err)
+	return result, err
+}
@@ -0,0 +1,91 @@
+package db
+
+import (
+	"context"
+	"fmt"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// BenchmarkAdapter measures the Adapter methods on the hook path (context
+// inject reads and the per-prompt writes), both on the bare SQLite adapter
+// and through Instrument as the server wires it, so the cost of the /metrics
+// timing wrapper shows up next to the query itself.
+func BenchmarkAdapter(b *testing.B) {
+	s := newTestSQLite(b)
+	seedObservations(b, s, []string{"alice", "bob", "carol", "dave"}, 10_000)
+	ctx := context.Background()
+	if err := s.CreatePlan(ctx, &models.Plan{SessionID: "seed-0", Title: "plan", Content: "steps", Status: "active"}); err != nil {
+		b.Fatal(err)
+	}
+	if err := s.CreateSummary(ctx, &models.Summary{SessionID: "seed-0", Type: "session", Content: testContent(0, 40)}); err != nil {
+		b.Fatal(err)
+	}
+	if err := s.CreateUserPrompt(ctx, &models.UserPrompt{SessionID: "seed-0", PromptNumber: 1, PromptText: testContent(1, 20)}); err != nil {
+		b.Fatal(err)
+	}
+
+	adapters := []struct {
+		name    string
+		adapter Adapter
+	}{
+		{"direct", s},
+		{"instrumented", Instrument(s, func(string, time.Duration, error) {})},
+	}
+	for _, a := range adapters {
+		adapter := a.adapter
+		benchmarks := []struct {
+			name string
+			run  func(i int) error
+		}{
+			{"GetLatestSession", func(int) error {
+				_, err := adapter.GetLatestSession(ctx, "alice")
+				return err
+			}},
+			{"GetRecentObservations", func(int) error {
+				_, err := adapter.GetRecentObservations(ctx, "alice", 20)
+				return err
+			}},
+			{"GetActivePlan", func(int) error {
+				_, err := adapter.GetActivePlan(ctx, "alice")
+				return err
+			}},
+			{"GetLatestSummary", func(int) error {
+				_, err := adapter.GetLatestSummary(ctx, "alice")
+				return err
+			}},
+			{"ListObservations", func(int) error {
+				var page []models.Observation
+				return adapter.ListObservations(ctx, "seed-0", "", Page{Limit: 50}, Collect(&page))
+			}},
+			{"CreateObservation", func(i int) error {
+				return adapter.CreateObservation(ctx, &models.Observation{SessionID: "seed-1", Type: "learning", Content: testContent(i, 12), Importance: 4})
+			}},
+			{"CreateObservationsBatch", func(i int) error {
+				batch := make([]models.Observation, 50)
+				for j := range batch {
+					batch[j] = models.Observation{SessionID: "seed-2", Type: "learning", Content: testContent(i+j, 12), Importance: 2}
+				}
+				return adapter.CreateObservationsBatch(ctx, batch)
+			}},
+			{"CreateUserPrompt", func(i int) error {
+				return adapter.CreateUserPrompt(ctx, &models.UserPrompt{SessionID: "seed-3", PromptNumber: i + 2, PromptText: testContent(i, 20)})
+			}},
+			{"UpdateLatestPromptResponse", func(i int) error {
+				return adapter.UpdateLatestPromptResponse(ctx, "seed-0", fmt.Sprintf("response %d", i))
+			}},
+		}
+		for _, bm := range benchmarks {
+			b.Run(a.name+"/"+bm.name, func(b *testing.B) {
+				b.ReportAllocs()
+				for i := 0; i < b.N; i++ {
+					if err := bm.run(i); err != nil {
+						b.Fatal(err)
+					}
+				}
+			})
+		}
+	}
+}
@@ -0,0 +1,27 @@
+package db
+
+import (
+	"database/sql"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// finishedSummaryJobs matches jobs that will not run again.
+const finishedSummaryJobs = `status IN ('` + models.JobDone + `', '` + models.JobFailed + `')`
+
+// summaryJobColumns is the summary_jobs column list read by scanSummaryJob.
+const summaryJobColumns = `id, session_id, status, attempts, summary_id, COALESCE(error, ''), COALESCE(payload, ''), run_after, created_at, updated_at`
+
+// scanSummaryJob scans a row selected with summaryJobColumns. A missing row yields nil.
+func scanSummaryJob(row interface{ Scan(...interface{}) error }) (*models.SummaryJob, error) {
+	job := &models.SummaryJob{}
+	err := row.Scan(&job.ID, &job.SessionID, &job.Status, &job.Attempts, &job.SummaryID,
+		&job.Error, &job.Payload, &job.RunAfter, &job.CreatedAt, &job.UpdatedAt)
+	if err == sql.ErrNoRows {
+		return nil, nil
+	}
+	if err != nil {
+		return nil, err
+	}
+	return job, nil
+}
@@ -0,0 +1,142 @@
+package db
+
+import (
+	"context"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+func TestEnqueueSummaryJobDedupesPerSession(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+
+	first, err := s.EnqueueSummaryJob(ctx, "s1", `{"n":1}`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	second, err := s.EnqueueSummaryJob(ctx, "s1", `{"n":2}`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if second.ID != first.ID {
+		t.Fatalf("second enqueue created job %d, want queued job %d replaced", second.ID, first.ID)
+	}
+	if second.Payload != `{"n":2}` {
+		t.Errorf("payload = %s, want the latest request", second.Payload)
+	}
+	other, err := s.EnqueueSummaryJob(ctx, "s2", `{}`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if other.ID == first.ID {
+		t.Error("another session shared the job")
+	}
+
+	// Once running, a new request queues a separate job that waits for it
+	claimed, err := s.ClaimSummaryJob(ctx, time.Now())
+	if err != nil || claimed == nil || claimed.ID != first.ID {
+		t.Fatalf("claim = %+v, %v; want job %d", claimed, err, first.ID)
+	}
+	next, err := s.EnqueueSummaryJob(ctx, "s1", `{"n":3}`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if next.ID == first.ID || next.Status != models.JobQueued {
+		t.Fatalf("enqueue while running = job %d (%s), want a new queued job", next.ID, next.Status)
+	}
+	claimed, err = s.ClaimSummaryJob(ctx, time.Now())
+	if err != nil {
+		t.Fatal(err)
+	}
+	if claimed == nil || claimed.ID != other.ID {
+		t.Fatalf("claim = %+v, want s2's job while s1 is running", claimed)
+	}
+	if claimed, _ := s.ClaimSummaryJob(ctx, time.Now()); claimed != nil {
+		t.Errorf("claimed job %d for a session that already has one running", claimed.ID)
+	}
+}
+
+func TestRequeueRunningSummaryJobs(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+
+	job, err := s.EnqueueSummaryJob(ctx, "s1", `{}`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if _, err := s.ClaimSummaryJob(ctx, time.Now()); err != nil {
+		t.Fatal(err)
+	}
+
+	// A restart finds the job still marked running
+	n, err := s.RequeueRunningSummaryJobs(ctx)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if n != 1 {
+		t.Fatalf("requeued %d jobs, want 1", n)
+	}
+	requeued, err := s.GetSummaryJob(ctx, job.ID)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if requeued.Status != models.JobQueued {
+		t.Fatalf("status after requeue = %s, want queued", requeued.Status)
+	}
+
+	claimed, err := s.ClaimSummaryJob(ctx, time.Now())
+	if err != nil || claimed == nil || claimed.ID != job.ID {
+		t.Fatalf("claim after requeue = %+v, %v", claimed, err)
+	}
+	if claimed.Attempts != 2 {
+		t.Errorf("attempts = %d, want 2 (the interrupted attempt counts)", claimed.Attempts)
+	}
+}
+
+func TestPruneSummaryJobs(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	old := time.Now().Add(-48 * time.Hour)
+
+	jobs := map[string]struct {
+		status  string
+		updated time.Time
+		kept    bool
+	}{
+		"old-done":    {models.JobDone, old, false},
+		"old-failed":  {models.JobFailed, old, false},
+		"old-queued":  {models.JobQueued, old, true},
+		"old-running": {models.JobRunning, old, true},
+		"new-done":    {models.JobDone, time.Now(), true},
+	}
+	ids := make(map[string]int64)
+	for session, j := range jobs {
+		job, err := s.EnqueueSummaryJob(ctx, session, `{}`)
+		if err != nil {
+			t.Fatal(err)
+		}
+		ids[session] = job.ID
+		if _, err := s.db.Exec(`UPDATE summary_jobs SET status = ?, updated_at = ? WHERE id = ?`, j.status, j.updated, job.ID); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	n, err := s.PruneSummaryJobs(ctx, time.Now().Add(-24*time.Hour))
+	if err != nil {
+		t.Fatal(err)
+	}
+	if n != 2 {
+		t.Errorf("pruned %d jobs, want 2", n)
+	}
+	for session, j := range jobs {
+		job, err := s.GetSummaryJob(ctx, ids[session])
+		if err != nil {
+			t.Fatal(err)
+		}
+		if (job != nil) != j.kept {
+			t.Errorf("%s: kept = %v, want %v", session, job != nil, j.kept)
+		}
+	}
+}
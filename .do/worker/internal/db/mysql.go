@@ -4,7 +4,10 @@ import (
 	"context"
 	"database/sql"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"log"
+	"strings"
 	"time"
 
 	"github.com/do-focus/worker/pkg/models"
@@ -13,7 +16,10 @@ import (
 
 // MySQL implements the Adapter interface for MySQL.
 type MySQL struct {
-	db *sql.DB
+	db             *sql.DB
+	fulltext       bool // FULLTEXT indexes available
+	ftMinTokenSize int  // shortest word InnoDB puts in a FULLTEXT index
+	consecutiveIDs bool // multi-row INSERTs get consecutive AUTO_INCREMENT ids
 }
 
 // NewMySQL creates a new MySQL adapter.
@@ -31,7 +37,7 @@ func NewMySQL(cfg Config) (*MySQL, error) {
 	db.SetMaxIdleConns(5)
 	db.SetConnMaxLifetime(5 * time.Minute)
 
-	m := &MySQL{db: db}
+	m := &MySQL{db: db, ftMinTokenSize: mysqlDefaultMinTokenSize}
 
 	// Initialize schema
 	if err := m.initSchema(); err != nil {
@@ -39,6 +45,18 @@ func NewMySQL(cfg Config) (*MySQL, error) {
 		return nil, fmt.Errorf("failed to initialize schema: %w", err)
 	}
 
+	// Only lock modes 0 and 1 guarantee consecutive ids within one INSERT;
+	// MySQL 8 defaults to 2 (interleaved)
+	var lockMode int
+	if err := db.QueryRow(`SELECT @@innodb_autoinc_lock_mode`).Scan(&lockMode); err == nil {
+		m.consecutiveIDs = lockMode < 2
+	}
+	// Shorter search terms are not indexed and are left out of MATCH queries
+	var minTokenSize int
+	if err := db.QueryRow(`SELECT @@innodb_ft_min_token_size`).Scan(&minTokenSize); err == nil {
+		m.ftMinTokenSize = minTokenSize
+	}
+
 	return m, nil
 }
 
@@ -63,11 +81,6 @@ func (m *MySQL) initSchema() error {
 		return err
 	}
 
-	// Run migrations for existing tables
-	if err := m.runMigrations(); err != nil {
-		return err
-	}
-
 	schema = `
 	CREATE TABLE IF NOT EXISTS observations (
 		id BIGINT AUTO_INCREMENT PRIMARY KEY,
@@ -117,8 +130,12 @@ func (m *MySQL) initSchema() error {
 		FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE SET NULL
 	) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 	`
-	_, err := m.db.Exec(schema)
-	return err
+	if _, err := m.db.Exec(schema); err != nil {
+		return err
+	}
+
+	// Run migrations once all base tables exist
+	return m.runMigrations()
 }
 
 // Health checks database connectivity.
@@ -133,12 +150,49 @@ func (m *MySQL) Close() error {
 
 // CreateSession creates a new session.
 func (m *MySQL) CreateSession(ctx context.Context, session *models.Session) error {
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
 	query := `
 		INSERT INTO sessions (id, user_name, project_id, started_at, created_at, updated_at)
 		VALUES (?, ?, ?, ?, NOW(), NOW())
 	`
-	_, err := m.db.ExecContext(ctx, query, session.ID, session.UserName, session.ProjectID, session.StartedAt)
-	return err
+	if _, err := tx.ExecContext(ctx, query, session.ID, session.UserName, session.ProjectID, session.StartedAt); err != nil {
+		return err
+	}
+
+	// Attach observations recorded before the session row existed
+	if _, err := tx.ExecContext(ctx, `
+		UPDATE observations SET user_name = ?, project_id = COALESCE(project_id, ?)
+		WHERE session_id = ? AND user_name IS NULL
+	`, session.UserName, session.ProjectID, session.ID); err != nil {
+		return err
+	}
+
+	// Maintain activity rollups
+	if _, err := tx.ExecContext(ctx, `
+		INSERT INTO user_activity (user_name, session_count, last_activity) VALUES (?, 1, ?)
+		ON DUPLICATE KEY UPDATE
+			session_count = session_count + 1,
+			last_activity = GREATEST(COALESCE(last_activity, VALUES(last_activity)), VALUES(last_activity))
+	`, session.UserName, session.StartedAt); err != nil {
+		return err
+	}
+	if session.ProjectID != "" {
+		if _, err := tx.ExecContext(ctx, `
+			INSERT INTO project_activity (project_id, session_count, last_activity) VALUES (?, 1, ?)
+			ON DUPLICATE KEY UPDATE
+				session_count = session_count + 1,
+				last_activity = GREATEST(COALESCE(last_activity, VALUES(last_activity)), VALUES(last_activity))
+		`, session.ProjectID, session.StartedAt); err != nil {
+			return err
+		}
+	}
+
+	return tx.Commit()
 }
 
 // GetSession retrieves a session by ID.
@@ -177,18 +231,41 @@ func (m *MySQL) GetLatestSession(ctx context.Context, userName string) (*models.
 
 // EndSession ends a session with an optional summary.
 func (m *MySQL) EndSession(ctx context.Context, id string, summary string) error {
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
 	query := `UPDATE sessions SET ended_at = NOW(), summary = ? WHERE id = ?`
-	_, err := m.db.ExecContext(ctx, query, summary, id)
-	return err
+	if _, err := tx.ExecContext(ctx, query, summary, id); err != nil {
+		return err
+	}
+
+	// Track the user's most recent ended session for team context
+	if _, err := tx.ExecContext(ctx, `
+		UPDATE user_activity u
+		JOIN sessions s ON s.id = ? AND s.user_name = u.user_name
+		SET u.last_ended_session_id = s.id, u.last_ended_started_at = s.started_at
+		WHERE u.last_ended_started_at IS NULL OR u.last_ended_started_at <= s.started_at
+	`, id); err != nil {
+		return err
+	}
+
+	return tx.Commit()
 }
 
 // CreateObservation creates a new observation.
 func (m *MySQL) CreateObservation(ctx context.Context, obs *models.Observation) error {
+	// Copies the owning session's user_name and project_id so per-user queries avoid a join
 	query := `
-		INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at)
-		VALUES (?, ?, ?, ?, ?, ?, NOW())
+		INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at, user_name, project_id)
+		VALUES (?, ?, ?, ?, ?, ?, NOW(),
+			(SELECT user_name FROM sessions WHERE id = ?),
+			(SELECT project_id FROM sessions WHERE id = ?))
 	`
-	result, err := m.db.ExecContext(ctx, query, obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, obs.Tags)
+	result, err := m.db.ExecContext(ctx, query,
+		obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, obs.Tags, obs.SessionID, obs.SessionID)
 	if err != nil {
 		return err
 	}
@@ -199,6 +276,102 @@ func (m *MySQL) CreateObservation(ctx context.Context, obs *models.Observation)
 	return nil
 }
 
+// mysqlBatchRows caps rows per multi-row INSERT to stay well below the placeholder limit.
+const mysqlBatchRows = 500
+
+// mysqlInsertObservation inserts one observation with its queued created_at.
+const mysqlInsertObservation = `
+	INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at, user_name, project_id)
+	VALUES (?, ?, ?, ?, ?, ?, ?,
+		(SELECT user_name FROM sessions WHERE id = ?),
+		(SELECT project_id FROM sessions WHERE id = ?))
+`
+
+// CreateObservationsBatch inserts observations in one transaction and sets
+// their IDs. Either all rows are written or none are. When
+// innodb_autoinc_lock_mode guarantees consecutive ids it uses multi-row
+// INSERT statements; under interleaved mode (MySQL 8's default) a multi-row
+// INSERT has no usable id range, so rows go through one prepared statement.
+func (m *MySQL) CreateObservationsBatch(ctx context.Context, observations []models.Observation) error {
+	if len(observations) == 0 {
+		return nil
+	}
+
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	now := time.Now()
+	if !m.consecutiveIDs {
+		stmt, err := tx.PrepareContext(ctx, mysqlInsertObservation)
+		if err != nil {
+			return err
+		}
+		defer stmt.Close()
+		for i := range observations {
+			obs := &observations[i]
+			if obs.CreatedAt.IsZero() {
+				obs.CreatedAt = now
+			}
+			var tags interface{}
+			if obs.Tags != "" {
+				tags = obs.Tags
+			}
+			result, err := stmt.ExecContext(ctx, obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, tags, obs.CreatedAt,
+				obs.SessionID, obs.SessionID)
+			if err != nil {
+				return fmt.Errorf("failed to insert observation %d of batch: %w", i, err)
+			}
+			if id, err := result.LastInsertId(); err == nil {
+				obs.ID = id
+			}
+		}
+		return tx.Commit()
+	}
+
+	for start := 0; start < len(observations); start += mysqlBatchRows {
+		end := start + mysqlBatchRows
+		if end > len(observations) {
+			end = len(observations)
+		}
+		chunk := observations[start:end]
+
+		placeholders := make([]string, 0, len(chunk))
+		args := make([]interface{}, 0, len(chunk)*9)
+		for i := range chunk {
+			obs := &chunk[i]
+			if obs.CreatedAt.IsZero() {
+				obs.CreatedAt = now
+			}
+			var tags interface{}
+			if obs.Tags != "" {
+				tags = obs.Tags
+			}
+			placeholders = append(placeholders, `(?, ?, ?, ?, ?, ?, ?,
+				(SELECT user_name FROM sessions WHERE id = ?), (SELECT project_id FROM sessions WHERE id = ?))`)
+			args = append(args, obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, tags, obs.CreatedAt,
+				obs.SessionID, obs.SessionID)
+		}
+
+		query := `INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at, user_name, project_id) VALUES ` +
+			strings.Join(placeholders, ", ")
+		result, err := tx.ExecContext(ctx, query, args...)
+		if err != nil {
+			return fmt.Errorf("failed to insert observations %d-%d of batch: %w", start, end-1, err)
+		}
+
+		if firstID, err := result.LastInsertId(); err == nil {
+			for i := range chunk {
+				chunk[i].ID = firstID + int64(i)
+			}
+		}
+	}
+
+	return tx.Commit()
+}
+
 // GetObservations retrieves observations for a session.
 func (m *MySQL) GetObservations(ctx context.Context, sessionID string) ([]models.Observation, error) {
 	query := `
@@ -226,12 +399,12 @@ func (m *MySQL) GetObservations(ctx context.Context, sessionID string) ([]models
 
 // GetRecentObservations retrieves recent observations across sessions for a user.
 func (m *MySQL) GetRecentObservations(ctx context.Context, userName string, limit int) ([]models.Observation, error) {
+	// Served by idx_observations_user_rank on the denormalized user_name
 	query := `
-		SELECT o.id, o.session_id, o.agent_name, o.type, o.content, o.importance, o.tags, o.created_at
-		FROM observations o
-		JOIN sessions s ON o.session_id = s.id
-		WHERE s.user_name = ?
-		ORDER BY o.importance DESC, o.created_at DESC
+		SELECT id, session_id, agent_name, type, content, importance, tags, created_at
+		FROM observations
+		WHERE user_name = ?
+		ORDER BY importance DESC, created_at DESC
 		LIMIT ?
 	`
 	rows, err := m.db.QueryContext(ctx, query, userName, limit)
@@ -251,52 +424,67 @@ func (m *MySQL) GetRecentObservations(ctx context.Context, userName string, limi
 	return observations, rows.Err()
 }
 
-// GetObservationsFiltered retrieves observations with optional filters and pagination.
-func (m *MySQL) GetObservationsFiltered(ctx context.Context, sessionID string, obsType string, limit int, offset int) ([]models.Observation, error) {
+// ListObservations visits observations with optional filters, newest first,
+// keyset-paginated on (created_at, id).
+func (m *MySQL) ListObservations(ctx context.Context, sessionID string, obsType string, page Page, fn func(*models.Observation) error) error {
+	var f filter
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
+	}
+	if obsType != "" {
+		f.add("type = ?", obsType)
+	}
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
 		FROM observations
-		WHERE (? = '' OR session_id = ?) AND (? = '' OR type = ?)
-		ORDER BY created_at DESC
-		LIMIT ? OFFSET ?
+		` + f.where() + `
+		ORDER BY created_at DESC, id DESC
+		LIMIT ?
 	`
-	if limit <= 0 {
-		limit = 50
-	}
-	if offset < 0 {
-		offset = 0
-	}
-	rows, err := m.db.QueryContext(ctx, query, sessionID, sessionID, obsType, obsType, limit, offset)
+	rows, err := m.db.QueryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var observations []models.Observation
 	for rows.Next() {
 		var obs models.Observation
 		if err := rows.Scan(&obs.ID, &obs.SessionID, &obs.AgentName, &obs.Type, &obs.Content, &obs.Importance, &obs.Tags, &obs.CreatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&obs); err != nil {
+			return err
 		}
-		observations = append(observations, obs)
 	}
-	return observations, rows.Err()
+	return rows.Err()
 }
 
-// SearchObservations searches observations by content.
+// SearchObservations searches observations by content, ranked by FULLTEXT relevance when available.
 func (m *MySQL) SearchObservations(ctx context.Context, query string, limit int) ([]models.Observation, error) {
-	sqlQuery := `
-		SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
-		FROM observations
-		WHERE content LIKE ?
-		ORDER BY importance DESC, created_at DESC
-		LIMIT ?
-	`
 	if limit <= 0 {
 		limit = 50
 	}
-	searchPattern := "%" + query + "%"
-	rows, err := m.db.QueryContext(ctx, sqlQuery, searchPattern, limit)
+
+	var rows *sql.Rows
+	var err error
+	if match := mysqlBooleanQuery(query, m.ftMinTokenSize); m.fulltext && match != "" {
+		rows, err = m.db.QueryContext(ctx, `
+			SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
+			FROM observations
+			WHERE MATCH(title, content, narrative) AGAINST (? IN BOOLEAN MODE)
+			ORDER BY MATCH(title, content, narrative) AGAINST (? IN BOOLEAN MODE) DESC, importance DESC
+			LIMIT ?
+		`, match, match, limit)
+	} else {
+		rows, err = m.db.QueryContext(ctx, `
+			SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
+			FROM observations
+			WHERE content LIKE ?
+			ORDER BY importance DESC, created_at DESC
+			LIMIT ?
+		`, "%"+query+"%", limit)
+	}
 	if err != nil {
 		return nil, err
 	}
@@ -372,37 +560,38 @@ func (m *MySQL) GetSummaries(ctx context.Context, summaryType string, limit int)
 	return summaries, rows.Err()
 }
 
-// GetAllSummaries retrieves all summaries within a date range.
-func (m *MySQL) GetAllSummaries(ctx context.Context, days int, limit int) ([]models.Summary, error) {
+// ListSummaries visits summaries from the last days, newest first,
+// keyset-paginated on (created_at, id).
+func (m *MySQL) ListSummaries(ctx context.Context, days int, page Page, fn func(*models.Summary) error) error {
 	if days <= 0 {
 		days = 7
 	}
-	if limit <= 0 {
-		limit = 100
-	}
+	f := filter{}
+	f.add("created_at >= DATE_SUB(NOW(), INTERVAL ? DAY)", days)
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, COALESCE(session_id, ''), type, content, created_at,
 			COALESCE(request, ''), COALESCE(investigated, ''), COALESCE(learned, ''),
 			COALESCE(completed, ''), COALESCE(next_steps, ''), COALESCE(source_message, ''),
-			COALESCE(full_transcript, '')
+			COALESCE(full_transcript, ''),
+			EXISTS(SELECT 1 FROM summary_archives a WHERE a.summary_id = summaries.id)
 		FROM summaries
-		WHERE created_at >= DATE_SUB(NOW(), INTERVAL ? DAY)
-		ORDER BY created_at DESC
+		` + f.where() + `
+		ORDER BY created_at DESC, id DESC
 		LIMIT ?
 	`
-	rows, err := m.db.QueryContext(ctx, query, days, limit)
+	rows, err := m.db.QueryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var summaries []models.Summary
 	for rows.Next() {
 		var sum models.Summary
 		var request, investigated, learned, completed, nextSteps, sourceMessage, fullTranscript string
 		if err := rows.Scan(&sum.ID, &sum.SessionID, &sum.Type, &sum.Content, &sum.CreatedAt,
-			&request, &investigated, &learned, &completed, &nextSteps, &sourceMessage, &fullTranscript); err != nil {
-			return nil, err
+			&request, &investigated, &learned, &completed, &nextSteps, &sourceMessage, &fullTranscript, &sum.Archived); err != nil {
+			return err
 		}
 		if request != "" {
 			sum.Request = &request
@@ -425,9 +614,68 @@ func (m *MySQL) GetAllSummaries(ctx context.Context, days int, limit int) ([]mod
 		if fullTranscript != "" {
 			sum.FullTranscript = fullTranscript
 		}
-		summaries = append(summaries, sum)
+		if err := fn(&sum); err != nil {
+			return err
+		}
 	}
-	return summaries, rows.Err()
+	return rows.Err()
+}
+
+// GetSummary retrieves a single summary with all fields.
+// Archived transcripts are decompressed from summary_archives on demand.
+func (m *MySQL) GetSummary(ctx context.Context, id int64) (*models.Summary, error) {
+	query := `
+		SELECT su.id, COALESCE(su.session_id, ''), su.type, su.content, su.created_at,
+			COALESCE(su.request, ''), COALESCE(su.investigated, ''), COALESCE(su.learned, ''),
+			COALESCE(su.completed, ''), COALESCE(su.next_steps, ''),
+			COALESCE(su.files_read, ''), COALESCE(su.files_edited, ''), COALESCE(su.discovery_tokens, 0),
+			COALESCE(su.source_message, ''), COALESCE(su.full_transcript, ''),
+			a.encoding, a.source_message, a.full_transcript
+		FROM summaries su
+		LEFT JOIN summary_archives a ON a.summary_id = su.id
+		WHERE su.id = ?
+	`
+	sum := &models.Summary{}
+	var request, investigated, learned, completed, nextSteps string
+	var encoding sql.NullString
+	var archivedSource, archivedTranscript []byte
+	err := m.db.QueryRowContext(ctx, query, id).Scan(&sum.ID, &sum.SessionID, &sum.Type, &sum.Content, &sum.CreatedAt,
+		&request, &investigated, &learned, &completed, &nextSteps,
+		&sum.FilesRead, &sum.FilesEdited, &sum.DiscoveryTokens,
+		&sum.SourceMessage, &sum.FullTranscript,
+		&encoding, &archivedSource, &archivedTranscript)
+	if err == sql.ErrNoRows {
+		return nil, nil
+	}
+	if err != nil {
+		return nil, err
+	}
+	if request != "" {
+		sum.Request = &request
+	}
+	if investigated != "" {
+		sum.Investigated = &investigated
+	}
+	if learned != "" {
+		sum.Learned = &learned
+	}
+	if completed != "" {
+		sum.Completed = &completed
+	}
+	if nextSteps != "" {
+		sum.NextSteps = &nextSteps
+	}
+
+	if encoding.Valid {
+		sum.Archived = true
+		if sum.SourceMessage, err = decompressText(encoding.String, archivedSource); err != nil {
+			return nil, fmt.Errorf("failed to read archived source message: %w", err)
+		}
+		if sum.FullTranscript, err = decompressText(encoding.String, archivedTranscript); err != nil {
+			return nil, fmt.Errorf("failed to read archived transcript: %w", err)
+		}
+	}
+	return sum, nil
 }
 
 // GetLatestSummary retrieves the latest session summary for a user.
@@ -491,33 +739,37 @@ func (m *MySQL) GetActivePlan(ctx context.Context, userName string) (*models.Pla
 	return plan, err
 }
 
-// GetAllPlans retrieves all plans with optional session filter.
-func (m *MySQL) GetAllPlans(ctx context.Context, sessionID string, limit int) ([]models.Plan, error) {
-	if limit <= 0 {
-		limit = 50
+// ListPlans visits plans with an optional session filter, newest first,
+// keyset-paginated on (created_at, id).
+func (m *MySQL) ListPlans(ctx context.Context, sessionID string, page Page, fn func(*models.Plan) error) error {
+	var f filter
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
 	}
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, COALESCE(session_id, ''), title, content, status, COALESCE(file_path, ''), COALESCE(request_prompt, ''), created_at, updated_at
 		FROM plans
-		WHERE ? = '' OR session_id = ?
-		ORDER BY updated_at DESC
+		` + f.where() + `
+		ORDER BY created_at DESC, id DESC
 		LIMIT ?
 	`
-	rows, err := m.db.QueryContext(ctx, query, sessionID, sessionID, limit)
+	rows, err := m.db.QueryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var plans []models.Plan
 	for rows.Next() {
 		var plan models.Plan
 		if err := rows.Scan(&plan.ID, &plan.SessionID, &plan.Title, &plan.Content, &plan.Status, &plan.FilePath, &plan.RequestPrompt, &plan.CreatedAt, &plan.UpdatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&plan); err != nil {
+			return err
 		}
-		plans = append(plans, plan)
 	}
-	return plans, rows.Err()
+	return rows.Err()
 }
 
 // UpdatePlanStatus updates a plan's status.
@@ -527,47 +779,53 @@ func (m *MySQL) UpdatePlanStatus(ctx context.Context, id int64, status string) e
 	return err
 }
 
-// GetRecentSessions retrieves recent sessions.
-func (m *MySQL) GetRecentSessions(ctx context.Context, limit int) ([]models.Session, error) {
-	if limit <= 0 {
-		limit = 20
-	}
+// ListSessions visits sessions newest first, keyset-paginated on (created_at, id).
+func (m *MySQL) ListSessions(ctx context.Context, page Page, fn func(*models.Session) error) error {
+	var f filter
+	f.addPage(page, true, false)
 	query := `
 		SELECT id, user_name, started_at, ended_at, COALESCE(summary, ''), created_at, updated_at
 		FROM sessions
-		ORDER BY started_at DESC
+		` + f.where() + `
+		ORDER BY created_at DESC, id DESC
 		LIMIT ?
 	`
-	rows, err := m.db.QueryContext(ctx, query, limit)
+	rows, err := m.db.QueryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var sessions []models.Session
 	for rows.Next() {
 		var session models.Session
 		if err := rows.Scan(&session.ID, &session.UserName, &session.StartedAt, &session.EndedAt, &session.Summary, &session.CreatedAt, &session.UpdatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&session); err != nil {
+			return err
 		}
-		sessions = append(sessions, session)
 	}
-	return sessions, rows.Err()
+	return rows.Err()
 }
 
 // GetTeamContext retrieves context from other team members.
 func (m *MySQL) GetTeamContext(ctx context.Context, excludeUser string) ([]models.TeamContext, error) {
+	// Reads the user_activity rollup instead of grouping all ended sessions
 	query := `
 		SELECT
-			s.user_name,
-			MAX(s.started_at) as last_activity,
+			u.user_name,
+			s.started_at as last_activity,
 			COALESCE(s.summary, '') as summary,
-			COALESCE(p.title, '') as active_plan
-		FROM sessions s
-		LEFT JOIN plans p ON p.session_id = s.id AND p.status = 'active'
-		WHERE s.user_name != ? AND s.ended_at IS NOT NULL
-		GROUP BY s.user_name
-		ORDER BY last_activity DESC
+			COALESCE((
+				SELECT p.title FROM plans p
+				WHERE p.session_id = s.id AND p.status = 'active'
+				ORDER BY p.updated_at DESC
+				LIMIT 1
+			), '') as active_plan
+		FROM user_activity u
+		JOIN sessions s ON s.id = u.last_ended_session_id
+		WHERE u.user_name != ?
+		ORDER BY u.last_ended_started_at DESC
 		LIMIT 10
 	`
 	rows, err := m.db.QueryContext(ctx, query, excludeUser)
@@ -703,20 +961,272 @@ func (m *MySQL) runMigrations() error {
 		m.db.Exec(`ALTER TABLE user_prompts ADD COLUMN response LONGTEXT`)
 	}
 
+	// Migration 012: FULLTEXT indexes for SearchFTS (InnoDB builds them from existing rows)
+	m.fulltext = true
+	for _, idx := range mysqlFullTextIndexes {
+		var indexExists int
+		m.db.QueryRow(`
+			SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+			WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? AND INDEX_NAME = ?
+		`, idx.table, idx.name).Scan(&indexExists)
+		if indexExists == 0 {
+			if _, err := m.db.Exec(fmt.Sprintf(`ALTER TABLE %s ADD FULLTEXT INDEX %s (%s)`, idx.table, idx.name, idx.columns)); err != nil {
+				// Fall back to LIKE search
+				m.fulltext = false
+			}
+		}
+	}
+
+	// Migration 013: Denormalized observation owner, query indexes and activity rollups
+	ownerColumns := []struct {
+		name string
+		def  string
+	}{
+		{"user_name", "VARCHAR(255)"},
+		{"project_id", "VARCHAR(500)"},
+	}
+	for _, col := range ownerColumns {
+		var exists int
+		m.db.QueryRow(`
+			SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+			WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'observations' AND COLUMN_NAME = ?
+		`, col.name).Scan(&exists)
+		if exists == 0 {
+			m.db.Exec(fmt.Sprintf(`ALTER TABLE observations ADD COLUMN %s %s`, col.name, col.def))
+		}
+	}
+	m.db.Exec(`
+		UPDATE observations o
+		JOIN sessions s ON s.id = o.session_id
+		SET o.user_name = s.user_name, o.project_id = COALESCE(o.project_id, s.project_id)
+		WHERE o.user_name IS NULL
+	`)
+
+	if err := m.ensureIndexes(mysqlQueryIndexes); err != nil {
+		return err
+	}
+
+	_, err = m.db.Exec(`
+		CREATE TABLE IF NOT EXISTS user_activity (
+			user_name VARCHAR(255) PRIMARY KEY,
+			session_count INT NOT NULL DEFAULT 0,
+			last_activity DATETIME,
+			last_ended_session_id VARCHAR(255),
+			last_ended_started_at DATETIME,
+			INDEX idx_user_activity_last_ended (last_ended_started_at)
+		) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create user_activity: %w", err)
+	}
+	_, err = m.db.Exec(`
+		CREATE TABLE IF NOT EXISTS project_activity (
+			project_id VARCHAR(500) PRIMARY KEY,
+			session_count INT NOT NULL DEFAULT 0,
+			last_activity DATETIME,
+			INDEX idx_project_activity_last (last_activity)
+		) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create project_activity: %w", err)
+	}
+	// Tables created before the index was added
+	if err := m.ensureIndexes([]mysqlIndex{{"project_activity", "idx_project_activity_last", "last_activity"}}); err != nil {
+		return err
+	}
+
+	_, err = m.db.Exec(`
+		CREATE TABLE IF NOT EXISTS schema_versions (
+			name VARCHAR(64) PRIMARY KEY,
+			version INT NOT NULL
+		) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create schema_versions: %w", err)
+	}
+
+	// A failed rebuild (e.g. a lock wait timeout on a busy shared server)
+	// records no version and is retried on the next start
+	if err := m.migrateActivityRollups(); err != nil {
+		log.Printf("Failed to rebuild activity rollups: %v", err)
+	}
+
+	// Migration 014: Compressed cold storage for old summary transcripts
+	_, err = m.db.Exec(`
+		CREATE TABLE IF NOT EXISTS summary_archives (
+			summary_id BIGINT PRIMARY KEY,
+			encoding VARCHAR(16) NOT NULL,
+			source_message LONGBLOB,
+			full_transcript LONGBLOB,
+			original_bytes BIGINT NOT NULL DEFAULT 0,
+			archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+			FOREIGN KEY (summary_id) REFERENCES summaries(id) ON DELETE CASCADE
+		) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create summary_archives: %w", err)
+	}
+
+	// Migration 015: (created_at, id) indexes for keyset-paginated lists
+	if err := m.ensureIndexes(mysqlKeysetIndexes); err != nil {
+		return err
+	}
+
+	// Migration 016: Durable queue for background summary generation
+	_, err = m.db.Exec(`
+		CREATE TABLE IF NOT EXISTS summary_jobs (
+			id BIGINT AUTO_INCREMENT PRIMARY KEY,
+			session_id VARCHAR(255) NOT NULL,
+			status VARCHAR(16) NOT NULL DEFAULT 'queued',
+			attempts INT NOT NULL DEFAULT 0,
+			summary_id BIGINT,
+			error TEXT,
+			payload LONGTEXT,
+			run_after DATETIME(6) NOT NULL,
+			created_at DATETIME(6) NOT NULL,
+			updated_at DATETIME(6) NOT NULL,
+			INDEX idx_summary_jobs_status_run_after (status, run_after),
+			INDEX idx_summary_jobs_session_status (session_id, status)
+		) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create summary_jobs: %w", err)
+	}
+
+	return nil
+}
+
+// mysqlKeysetIndexes back the (created_at, id) ordering of the list endpoints.
+// InnoDB appends the primary key to every secondary index, so id is implicit.
+var mysqlKeysetIndexes = []mysqlIndex{
+	{"observations", "idx_observations_created", "created_at"},
+	{"observations", "idx_observations_type_created", "type, created_at"},
+	{"sessions", "idx_sessions_created", "created_at"},
+	{"summaries", "idx_summaries_created", "created_at"},
+	{"plans", "idx_plans_created", "created_at"},
+	{"plans", "idx_plans_session_created", "session_id, created_at"},
+	{"user_prompts", "idx_user_prompts_session_created", "session_id, created_at"},
+}
+
+// mysqlIndex describes a secondary index created by a migration.
+type mysqlIndex struct {
+	table   string
+	name    string
+	columns string
+}
+
+// ensureIndexes creates the indexes that do not exist yet.
+func (m *MySQL) ensureIndexes(indexes []mysqlIndex) error {
+	for _, idx := range indexes {
+		var indexExists int
+		m.db.QueryRow(`
+			SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+			WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = ? AND INDEX_NAME = ?
+		`, idx.table, idx.name).Scan(&indexExists)
+		if indexExists == 0 {
+			if _, err := m.db.Exec(fmt.Sprintf(`CREATE INDEX %s ON %s (%s)`, idx.name, idx.table, idx.columns)); err != nil {
+				return fmt.Errorf("failed to create index %s: %w", idx.name, err)
+			}
+		}
+	}
 	return nil
 }
 
+// mysqlQueryIndexes lists the composite indexes backing the hot read paths.
+var mysqlQueryIndexes = []mysqlIndex{
+	// GetRecentObservations: top-K per user without sorting all of the user's rows
+	{"observations", "idx_observations_user_rank", "user_name, importance DESC, created_at DESC"},
+	{"observations", "idx_observations_session_created", "session_id, created_at"},
+	{"sessions", "idx_sessions_user_started", "user_name, started_at"},
+	{"plans", "idx_plans_session_status", "session_id, status, updated_at"},
+	{"summaries", "idx_summaries_session_type", "session_id, type, created_at"},
+	{"user_prompts", "idx_user_prompts_created_at", "created_at"},
+}
+
+// migrateActivityRollups rebuilds the rollups unless they were already built
+// for activityRollupsVersion, so startup does not rescan sessions every time.
+func (m *MySQL) migrateActivityRollups() error {
+	var version int
+	err := m.db.QueryRow(`SELECT version FROM schema_versions WHERE name = 'activity_rollups'`).Scan(&version)
+	if err == nil && version == activityRollupsVersion {
+		return nil
+	}
+	if err != nil && !errors.Is(err, sql.ErrNoRows) {
+		return err
+	}
+	return m.rebuildActivityRollups()
+}
+
+// rebuildActivityRollups recomputes user_activity and project_activity from
+// sessions and records activityRollupsVersion in the same transaction. The
+// version row is locked first, so workers starting together on a shared
+// server rebuild one at a time and the later ones find the work done.
+func (m *MySQL) rebuildActivityRollups() error {
+	tx, err := m.db.Begin()
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	if _, err := tx.Exec(`INSERT INTO schema_versions (name, version) VALUES ('activity_rollups', 0)
+		ON DUPLICATE KEY UPDATE version = version`); err != nil {
+		return err
+	}
+	var version int
+	if err := tx.QueryRow(`SELECT version FROM schema_versions WHERE name = 'activity_rollups' FOR UPDATE`).Scan(&version); err != nil {
+		return err
+	}
+	if version == activityRollupsVersion {
+		return tx.Commit()
+	}
+
+	statements := []string{
+		`DELETE FROM user_activity`,
+		`INSERT INTO user_activity (user_name, session_count, last_activity)
+			SELECT user_name, COUNT(*), MAX(started_at) FROM sessions GROUP BY user_name`,
+		`UPDATE user_activity u SET last_ended_session_id = (
+			SELECT s.id FROM sessions s
+			WHERE s.user_name = u.user_name AND s.ended_at IS NOT NULL
+			ORDER BY s.started_at DESC
+			LIMIT 1
+		)`,
+		`UPDATE user_activity u
+			JOIN sessions s ON s.id = u.last_ended_session_id
+			SET u.last_ended_started_at = s.started_at`,
+		`DELETE FROM project_activity`,
+		`INSERT INTO project_activity (project_id, session_count, last_activity)
+			SELECT project_id, COUNT(*), MAX(started_at) FROM sessions
+			WHERE project_id IS NOT NULL AND project_id != ''
+			GROUP BY project_id`,
+	}
+	for _, stmt := range statements {
+		if _, err := tx.Exec(stmt); err != nil {
+			return fmt.Errorf("failed to rebuild activity rollups: %w", err)
+		}
+	}
+	if _, err := tx.Exec(`UPDATE schema_versions SET version = ? WHERE name = 'activity_rollups'`, activityRollupsVersion); err != nil {
+		return err
+	}
+	return tx.Commit()
+}
+
+// mysqlFullTextIndexes lists the FULLTEXT indexes backing SearchFTS.
+var mysqlFullTextIndexes = []mysqlIndex{
+	{"observations", "ft_observations", "title, content, narrative"},
+	{"user_prompts", "ft_user_prompts", "prompt_text"},
+	{"summaries", "ft_summaries", "content, request, investigated, learned, completed, next_steps"},
+}
+
 // GetProjects retrieves all registered projects with session statistics.
 func (m *MySQL) GetProjects(ctx context.Context) ([]models.Project, error) {
+	// Reads the project_activity rollup instead of grouping all sessions
 	query := `
 		SELECT
 			project_id,
 			project_id as path,
-			COUNT(*) as session_count,
-			MAX(started_at) as last_activity
-		FROM sessions
-		WHERE project_id IS NOT NULL AND project_id != ''
-		GROUP BY project_id
+			session_count,
+			last_activity
+		FROM project_activity
 		ORDER BY last_activity DESC
 	`
 	rows, err := m.db.QueryContext(ctx, query)
@@ -762,50 +1272,41 @@ func (m *MySQL) CreateUserPrompt(ctx context.Context, prompt *models.UserPrompt)
 	return nil
 }
 
-// GetUserPrompts retrieves user prompts for a session (or all if sessionID is empty).
-func (m *MySQL) GetUserPrompts(ctx context.Context, sessionID string, limit int) ([]models.UserPrompt, error) {
-	if limit <= 0 {
-		limit = 100
-	}
-
-	var query string
-	var rows *sql.Rows
-	var err error
-
-	if sessionID == "" {
-		// Return all prompts (most recent first)
-		query = `
-			SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
-			FROM user_prompts
-			ORDER BY created_at DESC
-			LIMIT ?
-		`
-		rows, err = m.db.QueryContext(ctx, query, limit)
-	} else {
-		// Return prompts for specific session
-		query = `
-			SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
-			FROM user_prompts
-			WHERE session_id = ?
-			ORDER BY prompt_number ASC
-			LIMIT ?
-		`
-		rows, err = m.db.QueryContext(ctx, query, sessionID, limit)
+// ListUserPrompts visits user prompts keyset-paginated on (created_at, id).
+// All prompts are listed newest first; a single session's prompts are listed in
+// conversation order.
+func (m *MySQL) ListUserPrompts(ctx context.Context, sessionID string, page Page, fn func(*models.UserPrompt) error) error {
+	// All prompts are listed most recent first; a session's prompts in conversation order
+	var f filter
+	order := "DESC"
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
+		order = "ASC"
 	}
+	f.addPage(page, order == "DESC", true)
+	query := `
+		SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
+		FROM user_prompts
+		` + f.where() + `
+		ORDER BY created_at ` + order + `, id ` + order + `
+		LIMIT ?
+	`
+	rows, err := m.db.QueryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var prompts []models.UserPrompt
 	for rows.Next() {
 		var p models.UserPrompt
 		if err := rows.Scan(&p.ID, &p.SessionID, &p.PromptNumber, &p.PromptText, &p.Response, &p.CreatedAt, &p.CreatedAtEpoch); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&p); err != nil {
+			return err
 		}
-		prompts = append(prompts, p)
 	}
-	return prompts, rows.Err()
+	return rows.Err()
 }
 
 // UpdateLatestPromptResponse updates the response for the latest prompt in a session.
@@ -826,86 +1327,395 @@ func (m *MySQL) UpdateLatestPromptResponse(ctx context.Context, sessionID string
 	return err
 }
 
-// SearchFTS performs full-text search across observations and user_prompts.
-// Note: MySQL uses FULLTEXT indexes instead of FTS5.
+// SearchFTS performs full-text search across observations, user_prompts and summaries.
+// Note: MySQL uses FULLTEXT indexes instead of FTS5; results are ranked by MATCH relevance.
 func (m *MySQL) SearchFTS(ctx context.Context, query string, types []string, limit int) ([]models.SearchResult, error) {
 	if limit <= 0 {
 		limit = 50
 	}
 
-	var results []models.SearchResult
-
-	// Determine which types to search
-	searchObservations := len(types) == 0
-	searchPrompts := len(types) == 0
-	for _, t := range types {
-		if t == "observation" {
-			searchObservations = true
-		}
-		if t == "prompt" {
-			searchPrompts = true
-		}
-	}
+	match := mysqlBooleanQuery(query, m.ftMinTokenSize)
+	useFullText := m.fulltext && match != ""
+	likeQuery := "%" + query + "%"
 
-	// Search observations using LIKE (MySQL FULLTEXT requires separate setup)
-	if searchObservations {
-		searchPattern := "%" + query + "%"
-		obsQuery := `
-			SELECT id, session_id, content, created_at
+	searches := []struct {
+		resultType string
+		fullText   string
+		like       string
+		likeArgs   int // number of LIKE placeholders
+	}{
+		{"observation", `
+			SELECT id, session_id, content, created_at,
+				MATCH(title, content, narrative) AGAINST (? IN BOOLEAN MODE) AS score
+			FROM observations
+			WHERE MATCH(title, content, narrative) AGAINST (? IN BOOLEAN MODE)
+			ORDER BY score DESC
+			LIMIT ?
+		`, `
+			SELECT id, session_id, content, created_at, 0 AS score
 			FROM observations
 			WHERE content LIKE ? OR COALESCE(title, '') LIKE ? OR COALESCE(narrative, '') LIKE ?
 			ORDER BY created_at DESC
 			LIMIT ?
-		`
-		rows, err := m.db.QueryContext(ctx, obsQuery, searchPattern, searchPattern, searchPattern, limit)
-		if err == nil {
-			defer rows.Close()
-			for rows.Next() {
-				var r models.SearchResult
-				r.Type = "observation"
-				if err := rows.Scan(&r.ID, &r.SessionID, &r.Content, &r.CreatedAt); err != nil {
-					continue
-				}
-				// Create snippet from content
-				if len(r.Content) > 100 {
-					r.Snippet = r.Content[:100] + "..."
-				} else {
-					r.Snippet = r.Content
-				}
-				results = append(results, r)
-			}
-		}
-	}
-
-	// Search user_prompts using LIKE
-	if searchPrompts {
-		searchPattern := "%" + query + "%"
-		promptQuery := `
-			SELECT id, session_id, prompt_text, created_at
+		`, 3},
+		{"prompt", `
+			SELECT id, session_id, prompt_text, created_at,
+				MATCH(prompt_text) AGAINST (? IN BOOLEAN MODE) AS score
+			FROM user_prompts
+			WHERE MATCH(prompt_text) AGAINST (? IN BOOLEAN MODE)
+			ORDER BY score DESC
+			LIMIT ?
+		`, `
+			SELECT id, session_id, prompt_text, created_at, 0 AS score
 			FROM user_prompts
 			WHERE prompt_text LIKE ?
 			ORDER BY created_at DESC
 			LIMIT ?
-		`
-		rows, err := m.db.QueryContext(ctx, promptQuery, searchPattern, limit)
-		if err == nil {
-			defer rows.Close()
-			for rows.Next() {
-				var r models.SearchResult
-				r.Type = "prompt"
-				if err := rows.Scan(&r.ID, &r.SessionID, &r.Content, &r.CreatedAt); err != nil {
-					continue
-				}
-				// Create snippet from content
-				if len(r.Content) > 100 {
-					r.Snippet = r.Content[:100] + "..."
-				} else {
-					r.Snippet = r.Content
-				}
-				results = append(results, r)
+		`, 1},
+		{"summary", `
+			SELECT id, COALESCE(session_id, ''), content, created_at,
+				MATCH(content, request, investigated, learned, completed, next_steps) AGAINST (? IN BOOLEAN MODE) AS score
+			FROM summaries
+			WHERE MATCH(content, request, investigated, learned, completed, next_steps) AGAINST (? IN BOOLEAN MODE)
+			ORDER BY score DESC
+			LIMIT ?
+		`, `
+			SELECT id, COALESCE(session_id, ''), content, created_at, 0 AS score
+			FROM summaries
+			WHERE content LIKE ?
+			ORDER BY created_at DESC
+			LIMIT ?
+		`, 1},
+	}
+
+	terms := searchTerms(query)
+	var results []models.SearchResult
+	for _, search := range searches {
+		if !searchTypeEnabled(types, search.resultType) {
+			continue
+		}
+
+		var rows *sql.Rows
+		var err error
+		if useFullText {
+			rows, err = m.db.QueryContext(ctx, search.fullText, match, match, limit)
+		} else {
+			args := make([]interface{}, 0, search.likeArgs+1)
+			for i := 0; i < search.likeArgs; i++ {
+				args = append(args, likeQuery)
+			}
+			rows, err = m.db.QueryContext(ctx, search.like, append(args, limit)...)
+		}
+		if err != nil {
+			return nil, err
+		}
+		for rows.Next() {
+			var r models.SearchResult
+			r.Type = search.resultType
+			if err := rows.Scan(&r.ID, &r.SessionID, &r.Content, &r.CreatedAt, &r.Rank); err != nil {
+				rows.Close()
+				return nil, err
 			}
+			r.Snippet = makeSnippet(r.Content, terms, snippetLength)
+			results = append(results, r)
+		}
+		err = rows.Err()
+		rows.Close()
+		if err != nil {
+			return nil, err
 		}
 	}
 
-	return results, nil
+	return rankResults(results, limit), nil
+}
+
+// PruneTable deletes rows outside a retention policy, in small batches.
+func (m *MySQL) PruneTable(ctx context.Context, policy RetentionPolicy) (int64, error) {
+	if err := checkRetentionPolicy(policy); err != nil {
+		return 0, err
+	}
+
+	var deleted int64
+	if policy.MaxAge > 0 {
+		cutoff := time.Now().Add(-policy.MaxAge)
+		query := fmt.Sprintf(`DELETE FROM %s WHERE created_at < ? LIMIT ?`, policy.Table)
+		n, err := m.deleteBatches(ctx, query, cutoff)
+		deleted += n
+		if err != nil {
+			return deleted, err
+		}
+	}
+
+	if policy.MaxRows > 0 {
+		// Newest MaxRows rows are kept; everything at or below the next id goes
+		var cutoffID int64
+		err := m.db.QueryRowContext(ctx,
+			fmt.Sprintf(`SELECT id FROM %s ORDER BY id DESC LIMIT 1 OFFSET ?`, policy.Table), policy.MaxRows,
+		).Scan(&cutoffID)
+		if err == sql.ErrNoRows {
+			return deleted, nil
+		}
+		if err != nil {
+			return deleted, err
+		}
+		query := fmt.Sprintf(`DELETE FROM %s WHERE id <= ? LIMIT ?`, policy.Table)
+		n, err := m.deleteBatches(ctx, query, cutoffID)
+		deleted += n
+		if err != nil {
+			return deleted, err
+		}
+	}
+
+	return deleted, nil
+}
+
+// deleteBatches runs a batched DELETE (taking the cutoff and batch size) until no rows remain.
+func (m *MySQL) deleteBatches(ctx context.Context, query string, cutoff interface{}) (int64, error) {
+	var deleted int64
+	for {
+		result, err := m.db.ExecContext(ctx, query, cutoff, retentionBatchRows)
+		if err != nil {
+			return deleted, err
+		}
+		n, err := result.RowsAffected()
+		if err != nil {
+			return deleted, err
+		}
+		deleted += n
+		if n < retentionBatchRows {
+			return deleted, nil
+		}
+	}
+}
+
+// ArchiveTranscripts moves the source message and full transcript of up to limit
+// summaries created before the cutoff into gzip-compressed summary_archives rows.
+func (m *MySQL) ArchiveTranscripts(ctx context.Context, before time.Time, limit int) (int, error) {
+	rows, err := m.db.QueryContext(ctx, `
+		SELECT id, COALESCE(source_message, ''), COALESCE(full_transcript, '')
+		FROM summaries
+		WHERE created_at < ? AND (COALESCE(source_message, '') != '' OR COALESCE(full_transcript, '') != '')
+		ORDER BY id
+		LIMIT ?
+	`, before, limit)
+	if err != nil {
+		return 0, err
+	}
+	var archives []*transcriptArchive
+	for rows.Next() {
+		var id int64
+		var sourceMessage, fullTranscript string
+		if err := rows.Scan(&id, &sourceMessage, &fullTranscript); err != nil {
+			rows.Close()
+			return 0, err
+		}
+		archive, err := newTranscriptArchive(id, sourceMessage, fullTranscript)
+		if err != nil {
+			rows.Close()
+			return 0, err
+		}
+		archives = append(archives, archive)
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return 0, err
+	}
+	if len(archives) == 0 {
+		return 0, nil
+	}
+
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return 0, err
+	}
+	defer tx.Rollback()
+
+	for _, a := range archives {
+		if _, err := tx.ExecContext(ctx, `
+			REPLACE INTO summary_archives (summary_id, encoding, source_message, full_transcript, original_bytes, archived_at)
+			VALUES (?, ?, ?, ?, ?, NOW())
+		`, a.summaryID, archiveEncoding, a.sourceMessage, a.fullTranscript, a.originalBytes); err != nil {
+			return 0, err
+		}
+		if _, err := tx.ExecContext(ctx,
+			`UPDATE summaries SET source_message = NULL, full_transcript = NULL WHERE id = ?`, a.summaryID); err != nil {
+			return 0, err
+		}
+	}
+
+	if err := tx.Commit(); err != nil {
+		return 0, err
+	}
+	return len(archives), nil
+}
+
+// StorageSize returns the bytes allocated to the current schema's tables and indexes.
+// InnoDB caches these statistics, so the value is refreshed by Compact's ANALYZE.
+func (m *MySQL) StorageSize(ctx context.Context) (int64, error) {
+	var size int64
+	err := m.db.QueryRowContext(ctx, `
+		SELECT COALESCE(SUM(data_length + index_length + data_free), 0)
+		FROM INFORMATION_SCHEMA.TABLES
+		WHERE TABLE_SCHEMA = DATABASE()
+	`).Scan(&size)
+	return size, err
+}
+
+// mysqlCompactTables lists the tables rebuilt by Compact.
+const mysqlCompactTables = "observations, user_prompts, summaries, summary_archives"
+
+// Compact refreshes index statistics for the whole schema. With full set it
+// first rebuilds the tables that retention deletes from, which copies each table.
+func (m *MySQL) Compact(ctx context.Context, full bool) error {
+	statements := []string{
+		`ANALYZE TABLE sessions, plans, user_activity, project_activity, ` + mysqlCompactTables,
+	}
+	if full {
+		statements = append([]string{`OPTIMIZE TABLE ` + mysqlCompactTables}, statements...)
+	}
+	for _, stmt := range statements {
+		// Both statements return a status result set that must be drained
+		rows, err := m.db.QueryContext(ctx, stmt)
+		if err != nil {
+			return err
+		}
+		for rows.Next() {
+		}
+		rows.Close()
+		if err := rows.Err(); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
+// EnqueueSummaryJob queues summary generation for a session. A job still queued
+// for the session is updated with the new payload instead of adding another.
+func (m *MySQL) EnqueueSummaryJob(ctx context.Context, sessionID string, payload string) (*models.SummaryJob, error) {
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, err
+	}
+	defer tx.Rollback()
+
+	now := time.Now()
+	var id int64
+	err = tx.QueryRowContext(ctx,
+		`SELECT id FROM summary_jobs WHERE session_id = ? AND status = ? LIMIT 1 FOR UPDATE`, sessionID, models.JobQueued).Scan(&id)
+	switch {
+	case err == sql.ErrNoRows:
+		result, err := tx.ExecContext(ctx, `
+			INSERT INTO summary_jobs (session_id, status, attempts, payload, run_after, created_at, updated_at)
+			VALUES (?, ?, 0, ?, ?, ?, ?)
+		`, sessionID, models.JobQueued, payload, now, now, now)
+		if err != nil {
+			return nil, err
+		}
+		if id, err = result.LastInsertId(); err != nil {
+			return nil, err
+		}
+	case err != nil:
+		return nil, err
+	default:
+		if _, err := tx.ExecContext(ctx, `
+			UPDATE summary_jobs SET payload = ?, attempts = 0, error = NULL, run_after = ?, updated_at = ?
+			WHERE id = ?
+		`, payload, now, now, id); err != nil {
+			return nil, err
+		}
+	}
+
+	job, err := scanSummaryJob(tx.QueryRowContext(ctx,
+		`SELECT `+summaryJobColumns+` FROM summary_jobs WHERE id = ?`, id))
+	if err != nil {
+		return nil, err
+	}
+	return job, tx.Commit()
+}
+
+// ClaimSummaryJob marks the oldest due job as running and returns it, or nil if
+// none is due. Jobs of a session that already has a running job are skipped.
+func (m *MySQL) ClaimSummaryJob(ctx context.Context, now time.Time) (*models.SummaryJob, error) {
+	tx, err := m.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, err
+	}
+	defer tx.Rollback()
+
+	job, err := scanSummaryJob(tx.QueryRowContext(ctx, `
+		SELECT `+summaryJobColumns+` FROM summary_jobs
+		WHERE status = ? AND run_after <= ?
+			AND session_id NOT IN (SELECT session_id FROM (
+				SELECT session_id FROM summary_jobs WHERE status = ?
+			) AS running)
+		ORDER BY run_after, id
+		LIMIT 1
+		FOR UPDATE SKIP LOCKED
+	`, models.JobQueued, now, models.JobRunning))
+	if err != nil || job == nil {
+		return nil, err
+	}
+
+	if _, err := tx.ExecContext(ctx,
+		`UPDATE summary_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?`,
+		models.JobRunning, now, job.ID); err != nil {
+		return nil, err
+	}
+	if err := tx.Commit(); err != nil {
+		return nil, err
+	}
+	job.Status = models.JobRunning
+	job.Attempts++
+	job.UpdatedAt = now
+	return job, nil
+}
+
+// CompleteSummaryJob marks a job done and drops its payload.
+func (m *MySQL) CompleteSummaryJob(ctx context.Context, id int64, summaryID int64) error {
+	_, err := m.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, summary_id = ?, error = NULL, payload = NULL, updated_at = ?
+		WHERE id = ?
+	`, models.JobDone, summaryID, time.Now(), id)
+	return err
+}
+
+// RetrySummaryJob puts a failed attempt back in the queue until runAfter.
+func (m *MySQL) RetrySummaryJob(ctx context.Context, id int64, errMsg string, runAfter time.Time) error {
+	_, err := m.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, error = ?, run_after = ?, updated_at = ?
+		WHERE id = ? AND status = ?
+	`, models.JobQueued, errMsg, runAfter, time.Now(), id, models.JobRunning)
+	return err
+}
+
+// FailSummaryJob marks a job permanently failed and drops its payload.
+func (m *MySQL) FailSummaryJob(ctx context.Context, id int64, errMsg string) error {
+	_, err := m.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, error = ?, payload = NULL, updated_at = ?
+		WHERE id = ?
+	`, models.JobFailed, errMsg, time.Now(), id)
+	return err
+}
+
+// RequeueRunningSummaryJobs returns jobs interrupted by a shutdown to the queue.
+func (m *MySQL) RequeueRunningSummaryJobs(ctx context.Context) (int64, error) {
+	result, err := m.db.ExecContext(ctx,
+		`UPDATE summary_jobs SET status = ?, updated_at = ? WHERE status = ?`,
+		models.JobQueued, time.Now(), models.JobRunning)
+	if err != nil {
+		return 0, err
+	}
+	return result.RowsAffected()
+}
+
+// PruneSummaryJobs deletes done and failed jobs last updated before the cutoff.
+func (m *MySQL) PruneSummaryJobs(ctx context.Context, before time.Time) (int64, error) {
+	return m.deleteBatches(ctx,
+		`DELETE FROM summary_jobs WHERE `+finishedSummaryJobs+` AND updated_at < ? LIMIT ?`, before)
+}
+
+// GetSummaryJob retrieves a summary job by ID.
+func (m *MySQL) GetSummaryJob(ctx context.Context, id int64) (*models.SummaryJob, error) {
+	return scanSummaryJob(m.db.QueryRowContext(ctx,
+		`SELECT `+summaryJobColumns+` FROM summary_jobs WHERE id = ?`, id))
 }
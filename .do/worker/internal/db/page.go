@@ -0,0 +1,112 @@
+package db
+
+import (
+	"encoding/base64"
+	"fmt"
+	"math"
+	"strconv"
+	"strings"
+	"time"
+)
+
+// Cursor is a keyset position in a list ordered by (created_at, id).
+type Cursor struct {
+	CreatedAt time.Time
+	ID        string // integer ids are stored in decimal
+}
+
+// Page selects one window of a keyset-paginated list.
+type Page struct {
+	After *Cursor // continue after this row; nil starts at the beginning of the list
+	Limit int     // 0 returns every remaining row
+}
+
+// Encode returns the opaque token for a cursor.
+func (c Cursor) Encode() string {
+	raw := c.CreatedAt.Format(time.RFC3339Nano) + "|" + c.ID
+	return base64.RawURLEncoding.EncodeToString([]byte(raw))
+}
+
+// DecodeCursor parses a token produced by Cursor.Encode. An empty token yields nil.
+func DecodeCursor(token string) (*Cursor, error) {
+	if token == "" {
+		return nil, nil
+	}
+	raw, err := base64.RawURLEncoding.DecodeString(token)
+	if err != nil {
+		return nil, fmt.Errorf("invalid cursor: %w", err)
+	}
+	createdAt, id, ok := strings.Cut(string(raw), "|")
+	if !ok {
+		return nil, fmt.Errorf("invalid cursor")
+	}
+	t, err := time.Parse(time.RFC3339Nano, createdAt)
+	if err != nil {
+		return nil, fmt.Errorf("invalid cursor: %w", err)
+	}
+	return &Cursor{CreatedAt: t, ID: id}, nil
+}
+
+// Collect returns a list visitor that appends every row to dst.
+func Collect[T any](dst *[]T) func(*T) error {
+	return func(row *T) error {
+		*dst = append(*dst, *row)
+		return nil
+	}
+}
+
+// filter accumulates the WHERE conditions of a list query and their arguments.
+type filter struct {
+	conds []string
+	args  []interface{}
+	// timeFunc, if set, is applied to created_at and the cursor time before
+	// they are compared, for columns whose stored text does not sort by time.
+	timeFunc string
+}
+
+// add appends a condition with its arguments.
+func (f *filter) add(cond string, args ...interface{}) {
+	f.conds = append(f.conds, cond)
+	f.args = append(f.args, args...)
+}
+
+// addPage restricts the query to rows after the page cursor. desc selects
+// newest-first order. The leading created_at bound lets the planner seek the
+// (created_at, id) index instead of scanning past earlier pages; with a
+// timeFunc the list must order by, and be indexed on, the same expression.
+func (f *filter) addPage(p Page, desc bool, numericID bool) {
+	if p.After == nil {
+		return
+	}
+	var id interface{} = p.After.ID
+	if numericID {
+		if n, err := strconv.ParseInt(p.After.ID, 10, 64); err == nil {
+			id = n
+		}
+	}
+	key, bound := "created_at", "?"
+	if f.timeFunc != "" {
+		key, bound = f.timeFunc+"(created_at)", f.timeFunc+"(?)"
+	}
+	if desc {
+		f.add(fmt.Sprintf("%[1]s <= %[2]s AND (%[1]s < %[2]s OR id < ?)", key, bound), p.After.CreatedAt, p.After.CreatedAt, id)
+	} else {
+		f.add(fmt.Sprintf("%[1]s >= %[2]s AND (%[1]s > %[2]s OR id > ?)", key, bound), p.After.CreatedAt, p.After.CreatedAt, id)
+	}
+}
+
+// where returns the WHERE clause, or an empty string when there are no conditions.
+func (f *filter) where() string {
+	if len(f.conds) == 0 {
+		return ""
+	}
+	return "WHERE " + strings.Join(f.conds, " AND ")
+}
+
+// limitArg returns the LIMIT argument for the page; no limit selects every row.
+func (p Page) limitArg() int64 {
+	if p.Limit <= 0 {
+		return math.MaxInt64
+	}
+	return int64(p.Limit)
+}
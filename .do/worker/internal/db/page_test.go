@@ -0,0 +1,264 @@
+package db
+
+import (
+	"context"
+	"fmt"
+	"sort"
+	"strconv"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+func TestCursorEncodeDecode(t *testing.T) {
+	want := Cursor{CreatedAt: time.Date(2025, 3, 1, 12, 30, 0, 123456789, time.FixedZone("KST", 9*3600)), ID: "session|with|pipes"}
+	got, err := DecodeCursor(want.Encode())
+	if err != nil {
+		t.Fatal(err)
+	}
+	if !got.CreatedAt.Equal(want.CreatedAt) || got.ID != want.ID {
+		t.Errorf("round trip = %+v, want %+v", got, want)
+	}
+
+	if c, err := DecodeCursor(""); c != nil || err != nil {
+		t.Errorf("empty token = %v, %v; want nil, nil", c, err)
+	}
+	for _, token := range []string{"!!!", "bm8tc2VwYXJhdG9y", "bm90LWEtdGltZXwx"} {
+		if _, err := DecodeCursor(token); err == nil {
+			t.Errorf("DecodeCursor(%q) succeeded", token)
+		}
+	}
+}
+
+// walkPages lists every page of size limit, passing each next cursor through
+// its token as the HTTP handlers do, and returns the ids in visiting order.
+func walkPages[T any](t *testing.T, limit int, list func(Page, func(*T) error) error, cursorOf func(*T) Cursor, idOf func(*T) string) []string {
+	t.Helper()
+	var ids []string
+	page := Page{Limit: limit}
+	for pages := 0; ; pages++ {
+		if pages > 100 {
+			t.Fatal("pagination does not terminate")
+		}
+		var items []T
+		if err := list(page, Collect(&items)); err != nil {
+			t.Fatal(err)
+		}
+		for i := range items {
+			ids = append(ids, idOf(&items[i]))
+		}
+		if len(items) < limit {
+			return ids
+		}
+		after, err := DecodeCursor(cursorOf(&items[len(items)-1]).Encode())
+		if err != nil {
+			t.Fatal(err)
+		}
+		page.After = after
+	}
+}
+
+// checkWalk verifies a walk visited every id exactly once, in order.
+func checkWalk(t *testing.T, got, want []string) {
+	t.Helper()
+	seen := make(map[string]bool)
+	for _, id := range got {
+		if seen[id] {
+			t.Errorf("id %s returned twice", id)
+		}
+		seen[id] = true
+	}
+	if len(got) != len(want) {
+		t.Fatalf("walked %d rows, want %d: %v", len(got), len(want), got)
+	}
+	for i := range want {
+		if got[i] != want[i] {
+			t.Fatalf("walk order = %v, want %v", got, want)
+		}
+	}
+}
+
+func TestListPagesAcrossSharedTimestamps(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+
+	// 3 rows before, 17 at and 3 after one instant, so page boundaries of
+	// 4 rows fall inside the run of identical timestamps.
+	shared := time.Date(2025, 3, 1, 12, 0, 0, 500, time.UTC)
+	var times []time.Time
+	for i := 0; i < 3; i++ {
+		times = append(times, shared.Add(-time.Duration(3-i)*time.Second))
+	}
+	for i := 0; i < 17; i++ {
+		times = append(times, shared)
+	}
+	for i := 0; i < 3; i++ {
+		times = append(times, shared.Add(time.Duration(i+1)*time.Second))
+	}
+
+	var obsIDs, promptIDs []string
+	for i, createdAt := range times {
+		result, err := s.db.Exec(sqliteInsertObservation, "s1", "tester", "learning", fmt.Sprintf("row %d", i), 1, "", createdAt, "s1", "s1")
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ := result.LastInsertId()
+		obsIDs = append(obsIDs, strconv.FormatInt(id, 10))
+
+		result, err = s.db.Exec(`INSERT INTO user_prompts (session_id, prompt_number, prompt_text, created_at, created_at_epoch) VALUES (?, ?, ?, ?, ?)`,
+			"s1", i+1, fmt.Sprintf("prompt %d", i), createdAt, createdAt.UnixMilli())
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ = result.LastInsertId()
+		promptIDs = append(promptIDs, strconv.FormatInt(id, 10))
+
+		// Session ids sort differently from insertion order
+		if _, err := s.db.Exec(`INSERT INTO sessions (id, user_name, started_at, created_at, updated_at) VALUES (?, 'bob', ?, ?, ?)`,
+			fmt.Sprintf("page-%c", 'z'-i), createdAt, createdAt, createdAt); err != nil {
+			t.Fatal(err)
+		}
+	}
+	reversed := func(ids []string) []string {
+		out := make([]string, len(ids))
+		for i, id := range ids {
+			out[len(ids)-1-i] = id
+		}
+		return out
+	}
+
+	t.Run("observations newest first", func(t *testing.T) {
+		got := walkPages(t, 4, func(p Page, fn func(*models.Observation) error) error {
+			return s.ListObservations(ctx, "", "", p, fn)
+		}, func(o *models.Observation) Cursor {
+			return Cursor{CreatedAt: o.CreatedAt, ID: strconv.FormatInt(o.ID, 10)}
+		}, func(o *models.Observation) string { return strconv.FormatInt(o.ID, 10) })
+		checkWalk(t, got, reversed(obsIDs))
+	})
+
+	t.Run("prompts in conversation order", func(t *testing.T) {
+		got := walkPages(t, 4, func(p Page, fn func(*models.UserPrompt) error) error {
+			return s.ListUserPrompts(ctx, "s1", p, fn)
+		}, func(u *models.UserPrompt) Cursor {
+			return Cursor{CreatedAt: u.CreatedAt, ID: strconv.FormatInt(u.ID, 10)}
+		}, func(u *models.UserPrompt) string { return strconv.FormatInt(u.ID, 10) })
+		checkWalk(t, got, promptIDs)
+	})
+
+	t.Run("sessions with text ids", func(t *testing.T) {
+		got := walkPages(t, 4, func(p Page, fn func(*models.Session) error) error {
+			return s.ListSessions(ctx, p, fn)
+		}, func(session *models.Session) Cursor {
+			return Cursor{CreatedAt: session.CreatedAt, ID: session.ID}
+		}, func(session *models.Session) string { return session.ID })
+
+		// Newest first (s1 was created now); ties on created_at go to the larger id
+		want := []string{"s1"}
+		for i := len(times) - 1; i >= 20; i-- {
+			want = append(want, fmt.Sprintf("page-%c", 'z'-i))
+		}
+		for i := 3; i < 20; i++ {
+			want = append(want, fmt.Sprintf("page-%c", 'z'-i))
+		}
+		for i := 2; i >= 0; i-- {
+			want = append(want, fmt.Sprintf("page-%c", 'z'-i))
+		}
+		checkWalk(t, got, want)
+	})
+}
+
+func TestListPagesAcrossTimestampFormats(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+
+	// Rows that take the CURRENT_TIMESTAMP default store whole UTC seconds
+	// without an offset; the driver writes fractions and a zone offset.
+	type row struct {
+		id        int64
+		createdAt time.Time
+	}
+	var obs, prompts []row
+	for i := 0; i < 5; i++ {
+		result, err := s.db.Exec(`INSERT INTO observations (session_id, type, content, importance, user_name) VALUES ('s1', 'learning', ?, 1, 'alice')`, fmt.Sprintf("default %d", i))
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ := result.LastInsertId()
+		obs = append(obs, row{id: id})
+
+		result, err = s.db.Exec(`INSERT INTO user_prompts (session_id, prompt_number, prompt_text, created_at_epoch) VALUES ('s1', ?, ?, 0)`, i+1, fmt.Sprintf("default %d", i))
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ = result.LastInsertId()
+		prompts = append(prompts, row{id: id})
+	}
+	for i := range obs {
+		if err := s.db.QueryRow(`SELECT created_at FROM observations WHERE id = ?`, obs[i].id).Scan(&obs[i].createdAt); err != nil {
+			t.Fatal(err)
+		}
+		if err := s.db.QueryRow(`SELECT created_at FROM user_prompts WHERE id = ?`, prompts[i].id).Scan(&prompts[i].createdAt); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	base := obs[0].createdAt
+	kst := time.FixedZone("KST", 9*3600)
+	for i, createdAt := range []time.Time{base.Add(-500 * time.Millisecond), base, base.In(kst), base.Add(500 * time.Millisecond).In(kst)} {
+		result, err := s.db.Exec(sqliteInsertObservation, "s1", "tester", "learning", fmt.Sprintf("driver %d", i), 1, "", createdAt, "s1", "s1")
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ := result.LastInsertId()
+		obs = append(obs, row{id, createdAt})
+
+		result, err = s.db.Exec(`INSERT INTO user_prompts (session_id, prompt_number, prompt_text, created_at, created_at_epoch) VALUES (?, ?, ?, ?, ?)`,
+			"s1", len(prompts)+1, fmt.Sprintf("driver %d", i), createdAt, createdAt.UnixMilli())
+		if err != nil {
+			t.Fatal(err)
+		}
+		id, _ = result.LastInsertId()
+		prompts = append(prompts, row{id, createdAt})
+	}
+
+	// Expected order by instant, then id
+	sorted := func(rows []row, desc bool) []string {
+		rows = append([]row(nil), rows...)
+		sort.Slice(rows, func(i, j int) bool {
+			a, b := rows[i], rows[j]
+			if desc {
+				a, b = b, a
+			}
+			if !a.createdAt.Equal(b.createdAt) {
+				return a.createdAt.Before(b.createdAt)
+			}
+			return a.id < b.id
+		})
+		ids := make([]string, len(rows))
+		for i, r := range rows {
+			ids[i] = strconv.FormatInt(r.id, 10)
+		}
+		return ids
+	}
+
+	t.Run("observations newest first", func(t *testing.T) {
+		got := walkPages(t, 3, func(p Page, fn func(*models.Observation) error) error {
+			return s.ListObservations(ctx, "", "", p, fn)
+		}, func(o *models.Observation) Cursor {
+			return Cursor{CreatedAt: o.CreatedAt, ID: strconv.FormatInt(o.ID, 10)}
+		}, func(o *models.Observation) string { return strconv.FormatInt(o.ID, 10) })
+		checkWalk(t, got, sorted(obs, true))
+	})
+
+	t.Run("prompts in conversation order", func(t *testing.T) {
+		got := walkPages(t, 3, func(p Page, fn func(*models.UserPrompt) error) error {
+			return s.ListUserPrompts(ctx, "s1", p, fn)
+		}, func(u *models.UserPrompt) Cursor {
+			return Cursor{CreatedAt: u.CreatedAt, ID: strconv.FormatInt(u.ID, 10)}
+		}, func(u *models.UserPrompt) string { return strconv.FormatInt(u.ID, 10) })
+		checkWalk(t, got, sorted(prompts, false))
+	})
+}
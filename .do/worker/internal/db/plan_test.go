@@ -0,0 +1,265 @@
+package db
+
+import (
+	"context"
+	"database/sql"
+	"fmt"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// queryPlan returns the EXPLAIN QUERY PLAN detail lines for a query.
+func queryPlan(t *testing.T, s *SQLite, query string, args ...interface{}) []string {
+	t.Helper()
+	rows, err := s.db.Query(`EXPLAIN QUERY PLAN `+query, args...)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer rows.Close()
+
+	var details []string
+	for rows.Next() {
+		var id, parent, notused int
+		var detail string
+		if err := rows.Scan(&id, &parent, &notused, &detail); err != nil {
+			t.Fatal(err)
+		}
+		details = append(details, detail)
+	}
+	if err := rows.Err(); err != nil {
+		t.Fatal(err)
+	}
+	return details
+}
+
+// seedTeam creates ended sessions with active plans for several users and
+// projects and runs ANALYZE so the planner sees realistic statistics.
+func seedTeam(tb testing.TB, s *SQLite, users, sessionsPerUser int) {
+	tb.Helper()
+	ctx := context.Background()
+	start := time.Now().Add(-time.Duration(users*sessionsPerUser) * time.Hour)
+	for u := 0; u < users; u++ {
+		for i := 0; i < sessionsPerUser; i++ {
+			id := fmt.Sprintf("team-%d-%d", u, i)
+			user := fmt.Sprintf("user-%d", u)
+			createTestSession(tb, s, id, user, fmt.Sprintf("project-%d", (u+i)%5), start.Add(time.Duration(u*sessionsPerUser+i)*time.Hour))
+			if err := s.CreatePlan(ctx, &models.Plan{SessionID: id, Title: "plan " + id, Content: "steps", Status: "active"}); err != nil {
+				tb.Fatal(err)
+			}
+			if err := s.EndSession(ctx, id, "summary of "+id); err != nil {
+				tb.Fatal(err)
+			}
+		}
+	}
+	if _, err := s.db.Exec(`ANALYZE`); err != nil {
+		tb.Fatal(err)
+	}
+}
+
+func TestHotQueriesUseIndexes(t *testing.T) {
+	s := newTestSQLite(t)
+	seedObservations(t, s, []string{"alice", "bob"}, 2_000)
+	seedTeam(t, s, 10, 20)
+
+	tests := []struct {
+		name  string
+		query string
+		args  []interface{}
+		want  []string
+	}{
+		{"GetRecentObservations", sqliteRecentObservations, []interface{}{"alice", 20},
+			[]string{"USING INDEX idx_observations_user_rank"}},
+		{"GetTeamContext", sqliteTeamContext, []interface{}{"alice"},
+			[]string{"USING INDEX idx_user_activity_last_ended", "idx_plans_session_status"}},
+		{"GetProjects", sqliteProjects, nil,
+			[]string{"USING INDEX idx_project_activity_last"}},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			plan := queryPlan(t, s, tt.query, tt.args...)
+			all := strings.Join(plan, "\n")
+			for _, line := range plan {
+				fields := strings.Fields(line)
+				// sessions is aliased as s in GetTeamContext
+				if fields[0] == "SCAN" && (fields[1] == "observations" || fields[1] == "sessions" || fields[1] == "s") {
+					t.Errorf("plan scans %s:\n%s", fields[1], all)
+				}
+				if strings.HasPrefix(line, "USE TEMP B-TREE") {
+					t.Errorf("plan sorts in a temp b-tree:\n%s", all)
+				}
+			}
+			for _, want := range tt.want {
+				if !strings.Contains(all, want) {
+					t.Errorf("plan does not use %q:\n%s", want, all)
+				}
+			}
+		})
+	}
+}
+
+// activitySnapshot renders the rollup tables as sorted rows for comparison.
+func activitySnapshot(t *testing.T, s *SQLite) []string {
+	t.Helper()
+	format := func(v sql.NullTime) string {
+		if !v.Valid {
+			return "null"
+		}
+		return v.Time.UTC().Format(time.RFC3339Nano)
+	}
+
+	var snapshot []string
+	rows, err := s.db.Query(`SELECT user_name, session_count, last_activity, COALESCE(last_ended_session_id, ''), last_ended_started_at FROM user_activity ORDER BY user_name`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	for rows.Next() {
+		var user, ended string
+		var count int
+		var last, endedAt sql.NullTime
+		if err := rows.Scan(&user, &count, &last, &ended, &endedAt); err != nil {
+			t.Fatal(err)
+		}
+		snapshot = append(snapshot, fmt.Sprintf("user %s count=%d last=%s ended=%s at %s", user, count, format(last), ended, format(endedAt)))
+	}
+	rows.Close()
+
+	rows, err = s.db.Query(`SELECT project_id, session_count, last_activity FROM project_activity ORDER BY project_id`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	for rows.Next() {
+		var project string
+		var count int
+		var last sql.NullTime
+		if err := rows.Scan(&project, &count, &last); err != nil {
+			t.Fatal(err)
+		}
+		snapshot = append(snapshot, fmt.Sprintf("project %s count=%d last=%s", project, count, format(last)))
+	}
+	rows.Close()
+	return snapshot
+}
+
+func TestActivityRollupsMatchRebuild(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	base := time.Now().Add(-24 * time.Hour).Truncate(time.Second)
+
+	// Sessions arrive out of start order, some without a project, and are
+	// ended out of order, including an older session ended after a newer one.
+	sessions := []struct {
+		id, user, project string
+		startedAt         time.Time
+	}{
+		{"a1", "alice", "p1", base.Add(1 * time.Hour)},
+		{"a3", "alice", "p2", base.Add(3 * time.Hour)},
+		{"a2", "alice", "p1", base.Add(2 * time.Hour)},
+		{"b1", "bob", "", base.Add(4 * time.Hour)},
+		{"b2", "bob", "p2", base.Add(5 * time.Hour)},
+		{"c1", "carol", "p3", base.Add(6 * time.Hour)},
+	}
+	for _, sess := range sessions {
+		createTestSession(t, s, sess.id, sess.user, sess.project, sess.startedAt)
+	}
+	for _, id := range []string{"a3", "a1", "b1", "a2"} {
+		if err := s.EndSession(ctx, id, "done "+id); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	incremental := activitySnapshot(t, s)
+	if err := s.rebuildActivityRollups(); err != nil {
+		t.Fatal(err)
+	}
+	rebuilt := activitySnapshot(t, s)
+
+	if strings.Join(incremental, "\n") != strings.Join(rebuilt, "\n") {
+		t.Errorf("incremental rollups differ from rebuild\nincremental:\n%s\nrebuilt:\n%s",
+			strings.Join(incremental, "\n"), strings.Join(rebuilt, "\n"))
+	}
+	if len(rebuilt) != 3+3 {
+		t.Errorf("rollups have %d rows, want 3 users and 3 projects:\n%s", len(rebuilt), strings.Join(rebuilt, "\n"))
+	}
+}
+
+func TestActivityRollupsRebuiltOncePerVersion(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "memory.db")
+	open := func() *SQLite {
+		t.Helper()
+		s, err := NewSQLite(Config{Path: path})
+		if err != nil {
+			t.Fatal(err)
+		}
+		return s
+	}
+	sessionCount := func(s *SQLite) int {
+		t.Helper()
+		var n int
+		if err := s.db.QueryRow(`SELECT session_count FROM user_activity WHERE user_name = 'alice'`).Scan(&n); err != nil {
+			t.Fatal(err)
+		}
+		return n
+	}
+
+	s := open()
+	createTestSession(t, s, "a1", "alice", "p1", time.Now())
+	// Drift the rollup so a rebuild is visible
+	if _, err := s.db.Exec(`UPDATE user_activity SET session_count = 99`); err != nil {
+		t.Fatal(err)
+	}
+	s.Close()
+
+	s = open()
+	if n := sessionCount(s); n != 99 {
+		t.Errorf("session_count = %d after restart, want 99 (no rebuild at the current version)", n)
+	}
+	if _, err := s.db.Exec(`UPDATE schema_versions SET version = version - 1 WHERE name = 'activity_rollups'`); err != nil {
+		t.Fatal(err)
+	}
+	s.Close()
+
+	s = open()
+	defer s.Close()
+	if n := sessionCount(s); n != 1 {
+		t.Errorf("session_count = %d after a version change, want 1 (rebuilt)", n)
+	}
+	var version int
+	if err := s.db.QueryRow(`SELECT version FROM schema_versions WHERE name = 'activity_rollups'`).Scan(&version); err != nil || version != activityRollupsVersion {
+		t.Errorf("recorded version = %d (%v), want %d", version, err, activityRollupsVersion)
+	}
+}
+
+// BenchmarkHotQueries measures the context-inject reads served by
+// idx_observations_user_rank and the activity rollups.
+func BenchmarkHotQueries(b *testing.B) {
+	s := newTestSQLite(b)
+	seedObservations(b, s, []string{"alice", "bob", "carol", "dave"}, 100_000)
+	seedTeam(b, s, 20, 25)
+	ctx := context.Background()
+
+	b.Run("GetRecentObservations", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			if _, err := s.GetRecentObservations(ctx, "alice", 20); err != nil {
+				b.Fatal(err)
+			}
+		}
+	})
+	b.Run("GetTeamContext", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			if _, err := s.GetTeamContext(ctx, "alice"); err != nil {
+				b.Fatal(err)
+			}
+		}
+	})
+	b.Run("GetProjects", func(b *testing.B) {
+		for i := 0; i < b.N; i++ {
+			if _, err := s.GetProjects(ctx); err != nil {
+				b.Fatal(err)
+			}
+		}
+	})
+}
@@ -0,0 +1,101 @@
+package db
+
+import (
+	"bytes"
+	"compress/gzip"
+	"fmt"
+	"io"
+	"time"
+)
+
+// RetentionPolicy limits how long and how many rows of a table are kept.
+type RetentionPolicy struct {
+	Table   string        // observations, user_prompts or summaries
+	MaxAge  time.Duration // delete rows older than this; 0 keeps rows forever
+	MaxRows int           // keep at most this many newest rows; 0 is unlimited
+}
+
+// RetentionTables lists the tables that accept a RetentionPolicy.
+var RetentionTables = []string{"observations", "user_prompts", "summaries"}
+
+// retentionBatchRows caps rows deleted per statement so pruning never holds
+// the write lock for long.
+const retentionBatchRows = 1000
+
+// archiveEncoding names the compression used for archived transcripts.
+const archiveEncoding = "gzip"
+
+// checkRetentionPolicy validates a policy before its table name is used in SQL.
+func checkRetentionPolicy(policy RetentionPolicy) error {
+	for _, table := range RetentionTables {
+		if policy.Table == table {
+			return nil
+		}
+	}
+	return fmt.Errorf("retention not supported for table %q", policy.Table)
+}
+
+// transcriptArchive holds the compressed large text fields of one summary.
+type transcriptArchive struct {
+	summaryID      int64
+	sourceMessage  []byte
+	fullTranscript []byte
+	originalBytes  int
+}
+
+// newTranscriptArchive compresses a summary's source message and transcript.
+func newTranscriptArchive(summaryID int64, sourceMessage string, fullTranscript string) (*transcriptArchive, error) {
+	source, err := compressText(sourceMessage)
+	if err != nil {
+		return nil, err
+	}
+	transcript, err := compressText(fullTranscript)
+	if err != nil {
+		return nil, err
+	}
+	return &transcriptArchive{
+		summaryID:      summaryID,
+		sourceMessage:  source,
+		fullTranscript: transcript,
+		originalBytes:  len(sourceMessage) + len(fullTranscript),
+	}, nil
+}
+
+// compressText gzips text. Empty text is stored as nil.
+func compressText(text string) ([]byte, error) {
+	if text == "" {
+		return nil, nil
+	}
+	var buf bytes.Buffer
+	zw, err := gzip.NewWriterLevel(&buf, gzip.BestCompression)
+	if err != nil {
+		return nil, err
+	}
+	if _, err := zw.Write([]byte(text)); err != nil {
+		return nil, err
+	}
+	if err := zw.Close(); err != nil {
+		return nil, err
+	}
+	return buf.Bytes(), nil
+}
+
+// decompressText reverses compressText for the given encoding.
+func decompressText(encoding string, data []byte) (string, error) {
+	if len(data) == 0 {
+		return "", nil
+	}
+	if encoding != archiveEncoding {
+		return "", fmt.Errorf("unknown archive encoding %q", encoding)
+	}
+	zr, err := gzip.NewReader(bytes.NewReader(data))
+	if err != nil {
+		return "", err
+	}
+	defer zr.Close()
+	text, err := io.ReadAll(zr)
+	if err != nil {
+		return "", err
+	}
+	return string(text), nil
+}
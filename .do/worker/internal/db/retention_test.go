@@ -0,0 +1,179 @@
+package db
+
+import (
+	"context"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// observationIDs returns all observation ids in ascending order.
+func observationIDs(t *testing.T, s *SQLite) []int64 {
+	t.Helper()
+	rows, err := s.db.Query(`SELECT id FROM observations ORDER BY id`)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer rows.Close()
+	var ids []int64
+	for rows.Next() {
+		var id int64
+		if err := rows.Scan(&id); err != nil {
+			t.Fatal(err)
+		}
+		ids = append(ids, id)
+	}
+	return ids
+}
+
+func TestPruneTable(t *testing.T) {
+	// seedObservations spaces rows one minute apart, newest last, so both
+	// limits below delete more than one batch of retentionBatchRows.
+	const seeded = 2_500
+	tests := []struct {
+		name   string
+		policy RetentionPolicy
+		want   int64
+	}{
+		// Exactly two full batches, so the loop must stop on an empty third
+		{"max age", RetentionPolicy{Table: "observations", MaxAge: 500*time.Minute + 30*time.Second}, 2_000},
+		{"max rows", RetentionPolicy{Table: "observations", MaxRows: 300}, 2_200},
+		{"both", RetentionPolicy{Table: "observations", MaxAge: 1000*time.Minute + 30*time.Second, MaxRows: 300}, 2_200},
+		{"within limits", RetentionPolicy{Table: "observations", MaxAge: 100 * time.Hour, MaxRows: seeded}, 0},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			s := newTestSQLite(t)
+			seedObservations(t, s, []string{"alice"}, seeded)
+			before := observationIDs(t, s)
+
+			deleted, err := s.PruneTable(context.Background(), tt.policy)
+			if err != nil {
+				t.Fatal(err)
+			}
+			if deleted != tt.want {
+				t.Errorf("deleted %d rows, want %d", deleted, tt.want)
+			}
+
+			// The newest rows survive
+			after := observationIDs(t, s)
+			if int64(len(after)) != seeded-tt.want {
+				t.Fatalf("%d rows left, want %d", len(after), seeded-tt.want)
+			}
+			kept := before[len(before)-len(after):]
+			for i := range after {
+				if after[i] != kept[i] {
+					t.Fatalf("kept ids %d..%d, want the newest %d..%d", after[0], after[len(after)-1], kept[0], kept[len(kept)-1])
+				}
+			}
+		})
+	}
+}
+
+func TestPruneTableRejectsUnknownTable(t *testing.T) {
+	s := newTestSQLite(t)
+	for _, table := range []string{"sessions", "observations; DROP TABLE sessions", ""} {
+		if _, err := s.PruneTable(context.Background(), RetentionPolicy{Table: table, MaxRows: 1}); err == nil {
+			t.Errorf("PruneTable(%q) succeeded", table)
+		}
+	}
+}
+
+func TestArchiveTranscriptsRoundTrip(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+
+	transcript := strings.Repeat(`{"role":"assistant","content":"압축 대상 트랜스크립트"}`+"\n", 200)
+	full := &models.Summary{SessionID: "s1", Type: "session", Content: "summary", SourceMessage: "final message", FullTranscript: transcript}
+	transcriptOnly := &models.Summary{SessionID: "s1", Type: "session", Content: "summary", FullTranscript: "short transcript"}
+	empty := &models.Summary{SessionID: "s1", Type: "session", Content: "nothing to archive"}
+	for _, sum := range []*models.Summary{full, transcriptOnly, empty} {
+		if err := s.CreateSummary(ctx, sum); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	archived, err := s.ArchiveTranscripts(ctx, time.Now().Add(time.Second), 10)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if archived != 2 {
+		t.Fatalf("archived %d summaries, want 2", archived)
+	}
+	if again, err := s.ArchiveTranscripts(ctx, time.Now().Add(time.Second), 10); err != nil || again != 0 {
+		t.Errorf("second run archived %d (err %v), want 0", again, err)
+	}
+
+	// The summaries rows no longer carry the text, and the archive is smaller
+	var stored int
+	if err := s.db.QueryRow(`SELECT COUNT(*) FROM summaries WHERE COALESCE(source_message, '') != '' OR COALESCE(full_transcript, '') != ''`).Scan(&stored); err != nil {
+		t.Fatal(err)
+	}
+	if stored != 0 {
+		t.Errorf("%d summaries still store transcripts inline", stored)
+	}
+	var originalBytes, compressedBytes int
+	if err := s.db.QueryRow(`SELECT original_bytes, LENGTH(full_transcript) FROM summary_archives WHERE summary_id = ?`, full.ID).Scan(&originalBytes, &compressedBytes); err != nil {
+		t.Fatal(err)
+	}
+	if originalBytes != len(full.SourceMessage)+len(transcript) || compressedBytes >= len(transcript) {
+		t.Errorf("archive original_bytes %d, compressed transcript %d bytes of %d", originalBytes, compressedBytes, len(transcript))
+	}
+
+	for _, want := range []*models.Summary{full, transcriptOnly} {
+		got, err := s.GetSummary(ctx, want.ID)
+		if err != nil {
+			t.Fatal(err)
+		}
+		if !got.Archived {
+			t.Errorf("summary %d not marked archived", want.ID)
+		}
+		if got.SourceMessage != want.SourceMessage || got.FullTranscript != want.FullTranscript {
+			t.Errorf("summary %d round trip: source %q, transcript %d bytes; want %q, %d bytes",
+				want.ID, got.SourceMessage, len(got.FullTranscript), want.SourceMessage, len(want.FullTranscript))
+		}
+	}
+	if got, err := s.GetSummary(ctx, empty.ID); err != nil || got.Archived {
+		t.Errorf("summary without transcript: archived %v, err %v", got != nil && got.Archived, err)
+	}
+}
+
+func TestCompactSwitchesAutoVacuumOnlyWhenFull(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	autoVacuum := func() int {
+		var mode int
+		if err := s.db.QueryRow(`PRAGMA auto_vacuum`).Scan(&mode); err != nil {
+			t.Fatal(err)
+		}
+		return mode
+	}
+
+	// Simulate a database created before incremental auto-vacuum was enabled
+	if _, err := s.db.Exec(`PRAGMA auto_vacuum = NONE; VACUUM`); err != nil {
+		t.Fatal(err)
+	}
+	if mode := autoVacuum(); mode != 0 {
+		t.Fatalf("auto_vacuum = %d, want 0", mode)
+	}
+
+	if err := s.Compact(ctx, false); err != nil {
+		t.Fatal(err)
+	}
+	if mode := autoVacuum(); mode != 0 {
+		t.Errorf("background compaction switched auto_vacuum to %d", mode)
+	}
+
+	if err := s.Compact(ctx, true); err != nil {
+		t.Fatal(err)
+	}
+	if mode := autoVacuum(); mode != 2 {
+		t.Errorf("full compaction left auto_vacuum = %d, want 2 (incremental)", mode)
+	}
+	if err := s.Compact(ctx, false); err != nil {
+		t.Errorf("incremental compaction: %v", err)
+	}
+}
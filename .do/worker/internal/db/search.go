@@ -0,0 +1,124 @@
+package db
+
+import (
+	"sort"
+	"strings"
+	"unicode"
+	"unicode/utf8"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// snippetLength is the maximum snippet length in runes for search results.
+const snippetLength = 100
+
+// searchTerms splits a free-text query into search terms.
+func searchTerms(query string) []string {
+	return strings.Fields(query)
+}
+
+// searchTypeEnabled reports whether a result type should be searched.
+// An empty type list searches observations and prompts (the default of /api/search).
+func searchTypeEnabled(types []string, want string) bool {
+	if len(types) == 0 {
+		return want == "observation" || want == "prompt"
+	}
+	for _, t := range types {
+		if t == want {
+			return true
+		}
+	}
+	return false
+}
+
+// ftsMatchQuery converts user input into a safe FTS5 MATCH expression.
+// Every term is quoted (so operators in user input are treated literally) and
+// prefix-matched, which keeps Korean words with attached particles searchable.
+func ftsMatchQuery(query string) string {
+	var parts []string
+	for _, term := range searchTerms(query) {
+		term = strings.ReplaceAll(term, `"`, `""`)
+		parts = append(parts, `"`+term+`"*`)
+	}
+	return strings.Join(parts, " ")
+}
+
+// mysqlDefaultMinTokenSize is InnoDB's default innodb_ft_min_token_size.
+const mysqlDefaultMinTokenSize = 3
+
+// mysqlStopwords is InnoDB's default FULLTEXT stopword list
+// (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD).
+var mysqlStopwords = map[string]bool{
+	"a": true, "about": true, "an": true, "are": true, "as": true, "at": true,
+	"be": true, "by": true, "com": true, "de": true, "en": true, "for": true,
+	"from": true, "how": true, "i": true, "in": true, "is": true, "it": true,
+	"la": true, "of": true, "on": true, "or": true, "that": true, "the": true,
+	"this": true, "to": true, "was": true, "what": true, "when": true, "where": true,
+	"who": true, "will": true, "with": true, "und": true, "www": true,
+}
+
+// mysqlBooleanQuery converts user input into a MySQL BOOLEAN MODE expression
+// requiring every term (with prefix matching). Input is split into words the
+// way InnoDB tokenizes text, which also drops operator characters. Words
+// InnoDB does not index (shorter than minTokenSize or stopwords) would make a
+// required term match nothing, so they are left out; an empty result means no
+// term is indexable and the caller should fall back to LIKE.
+func mysqlBooleanQuery(query string, minTokenSize int) string {
+	words := strings.FieldsFunc(query, func(r rune) bool {
+		return !unicode.IsLetter(r) && !unicode.IsDigit(r) && r != '_'
+	})
+	var parts []string
+	for _, word := range words {
+		if utf8.RuneCountInString(word) < minTokenSize || mysqlStopwords[strings.ToLower(word)] {
+			continue
+		}
+		parts = append(parts, "+"+word+"*")
+	}
+	return strings.Join(parts, " ")
+}
+
+// makeSnippet returns a short excerpt of text centered on the first matching term.
+func makeSnippet(text string, terms []string, maxRunes int) string {
+	runes := []rune(text)
+	if len(runes) <= maxRunes {
+		return text
+	}
+
+	start := 0
+	lower := strings.ToLower(text)
+	for _, term := range terms {
+		if i := strings.Index(lower, strings.ToLower(term)); i >= 0 {
+			start = utf8.RuneCountInString(lower[:i]) - maxRunes/4
+			break
+		}
+	}
+	if start < 0 {
+		start = 0
+	}
+	end := start + maxRunes
+	if end > len(runes) {
+		end = len(runes)
+		start = end - maxRunes
+	}
+
+	snippet := string(runes[start:end])
+	if start > 0 {
+		snippet = "..." + snippet
+	}
+	if end < len(runes) {
+		snippet += "..."
+	}
+	return snippet
+}
+
+// rankResults orders merged search results by relevance (higher rank first)
+// and trims them to limit.
+func rankResults(results []models.SearchResult, limit int) []models.SearchResult {
+	sort.SliceStable(results, func(i, j int) bool {
+		return results[i].Rank > results[j].Rank
+	})
+	if len(results) > limit {
+		results = results[:limit]
+	}
+	return results
+}
@@ -0,0 +1,332 @@
+package db
+
+import (
+	"context"
+	"fmt"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+	"unicode/utf8"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// requireFTS skips tests that need the FTS5 index.
+func requireFTS(tb testing.TB, s *SQLite) {
+	tb.Helper()
+	if !s.fts {
+		tb.Skip("FTS5 unavailable; build with -tags sqlite_fts5")
+	}
+}
+
+// searchIDs returns the ids of results of the given type.
+func searchIDs(t *testing.T, s *SQLite, query, resultType string) []int64 {
+	t.Helper()
+	results, err := s.SearchFTS(context.Background(), query, []string{resultType}, 50)
+	if err != nil {
+		t.Fatalf("SearchFTS(%q): %v", query, err)
+	}
+	var ids []int64
+	for _, r := range results {
+		ids = append(ids, r.ID)
+	}
+	return ids
+}
+
+func TestFTSTriggersKeepIndexInSync(t *testing.T) {
+	s := newTestSQLite(t)
+	requireFTS(t, s)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "p1", time.Now())
+
+	obs := &models.Observation{SessionID: "s1", Type: "learning", Content: "the cache uses a heliotrope eviction policy", Importance: 3}
+	if err := s.CreateObservation(ctx, obs); err != nil {
+		t.Fatal(err)
+	}
+	prompt := &models.UserPrompt{SessionID: "s1", PromptNumber: 1, PromptText: "explain the marmalade parser"}
+	if err := s.CreateUserPrompt(ctx, prompt); err != nil {
+		t.Fatal(err)
+	}
+	summary := &models.Summary{SessionID: "s1", Type: "session", Content: "refactored the quasar module"}
+	if err := s.CreateSummary(ctx, summary); err != nil {
+		t.Fatal(err)
+	}
+
+	// Insert
+	if ids := searchIDs(t, s, "heliotrope", "observation"); len(ids) != 1 || ids[0] != obs.ID {
+		t.Fatalf("after insert: observation ids = %v, want [%d]", ids, obs.ID)
+	}
+	if ids := searchIDs(t, s, "marmalade", "prompt"); len(ids) != 1 || ids[0] != prompt.ID {
+		t.Fatalf("after insert: prompt ids = %v, want [%d]", ids, prompt.ID)
+	}
+	if ids := searchIDs(t, s, "quasar", "summary"); len(ids) != 1 || ids[0] != summary.ID {
+		t.Fatalf("after insert: summary ids = %v, want [%d]", ids, summary.ID)
+	}
+
+	// Update
+	updates := []string{
+		`UPDATE observations SET content = 'the cache uses a tangerine eviction policy' WHERE id = ?`,
+		`UPDATE user_prompts SET prompt_text = 'explain the tangerine parser' WHERE id = ?`,
+		`UPDATE summaries SET content = 'refactored the tangerine module' WHERE id = ?`,
+	}
+	for i, id := range []int64{obs.ID, prompt.ID, summary.ID} {
+		if _, err := s.db.Exec(updates[i], id); err != nil {
+			t.Fatal(err)
+		}
+	}
+	for _, tc := range []struct{ old, resultType string }{
+		{"heliotrope", "observation"}, {"marmalade", "prompt"}, {"quasar", "summary"},
+	} {
+		if ids := searchIDs(t, s, tc.old, tc.resultType); len(ids) != 0 {
+			t.Errorf("after update: %s still matches old term %q: %v", tc.resultType, tc.old, ids)
+		}
+		if ids := searchIDs(t, s, "tangerine", tc.resultType); len(ids) != 1 {
+			t.Errorf("after update: %s ids for new term = %v, want one", tc.resultType, ids)
+		}
+	}
+
+	// Delete
+	for _, table := range []string{"observations", "user_prompts", "summaries"} {
+		if _, err := s.db.Exec(`DELETE FROM ` + table); err != nil {
+			t.Fatal(err)
+		}
+	}
+	for _, resultType := range []string{"observation", "prompt", "summary"} {
+		if ids := searchIDs(t, s, "tangerine", resultType); len(ids) != 0 {
+			t.Errorf("after delete: %s ids = %v, want none", resultType, ids)
+		}
+	}
+	var indexed int
+	if err := s.db.QueryRow(`SELECT COUNT(*) FROM observations_fts WHERE observations_fts MATCH 'tangerine'`).Scan(&indexed); err != nil {
+		t.Fatal(err)
+	}
+	if indexed != 0 {
+		t.Errorf("observations_fts still has %d rows for deleted observations", indexed)
+	}
+}
+
+func TestFTSBackfillsExistingRows(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "memory.db")
+	s, err := NewSQLite(Config{Path: path})
+	if err != nil {
+		t.Fatal(err)
+	}
+	requireFTS(t, s)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+	if err := s.CreateObservation(ctx, &models.Observation{SessionID: "s1", Type: "pattern", Content: "legacy row about zeppelins", Importance: 2}); err != nil {
+		t.Fatal(err)
+	}
+	if err := s.CreateUserPrompt(ctx, &models.UserPrompt{SessionID: "s1", PromptNumber: 1, PromptText: "legacy prompt about zeppelins"}); err != nil {
+		t.Fatal(err)
+	}
+
+	// Simulate a database created before the FTS index existed
+	for _, idx := range ftsIndexes {
+		for _, stmt := range []string{
+			`DROP TRIGGER IF EXISTS ` + idx.table + `_ai`,
+			`DROP TRIGGER IF EXISTS ` + idx.table + `_ad`,
+			`DROP TRIGGER IF EXISTS ` + idx.table + `_au`,
+			`DROP TABLE IF EXISTS ` + idx.table,
+		} {
+			if _, err := s.db.Exec(stmt); err != nil {
+				t.Fatal(err)
+			}
+		}
+	}
+	s.Close()
+
+	s, err = NewSQLite(Config{Path: path})
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer s.Close()
+
+	results, err := s.SearchFTS(ctx, "zeppelins", nil, 10)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(results) != 2 {
+		t.Fatalf("got %d results after reopening, want the observation and prompt backfilled: %+v", len(results), results)
+	}
+}
+
+func TestFTSRebuildsAfterTriggersDropped(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "memory.db")
+	s, err := NewSQLite(Config{Path: path})
+	if err != nil {
+		t.Fatal(err)
+	}
+	requireFTS(t, s)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+	if err := s.CreateObservation(ctx, &models.Observation{SessionID: "s1", Type: "pattern", Content: "indexed row about zeppelins", Importance: 2}); err != nil {
+		t.Fatal(err)
+	}
+
+	// A build without FTS5 drops the triggers and keeps writing
+	s.dropFTSTriggers()
+	var triggers int
+	if err := s.db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_a_'`).Scan(&triggers); err != nil {
+		t.Fatal(err)
+	}
+	if triggers != 0 {
+		t.Fatalf("%d FTS triggers left after dropFTSTriggers", triggers)
+	}
+	if err := s.CreateObservation(ctx, &models.Observation{SessionID: "s1", Type: "pattern", Content: "unindexed row about zeppelins", Importance: 2}); err != nil {
+		t.Fatal(err)
+	}
+	s.Close()
+
+	s, err = NewSQLite(Config{Path: path})
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer s.Close()
+	if ids := searchIDs(t, s, "zeppelins", "observation"); len(ids) != 2 {
+		t.Errorf("search after reopening found %v, want both observations", ids)
+	}
+	if err := s.db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_fts_a_'`).Scan(&triggers); err != nil {
+		t.Fatal(err)
+	}
+	if triggers != 3*len(ftsIndexes) {
+		t.Errorf("%d FTS triggers after reopening, want %d", triggers, 3*len(ftsIndexes))
+	}
+}
+
+func TestFTSMatchQueryQuotesOperators(t *testing.T) {
+	tests := []struct {
+		query string
+		want  string
+	}{
+		{"cache", `"cache"*`},
+		{"cache  eviction", `"cache"* "eviction"*`},
+		{`say "hi"`, `"say"* """hi"""*`},
+		{"prefix*", `"prefix*"*`},
+		{"a NEAR b", `"a"* "NEAR"* "b"*`},
+		{"NEAR(a b)", `"NEAR(a"* "b)"*`},
+		{"-excluded", `"-excluded"*`},
+		{"a OR b AND NOT c", `"a"* "OR"* "b"* "AND"* "NOT"* "c"*`},
+		{"col:value", `"col:value"*`},
+		{"캐시를 정리", `"캐시를"* "정리"*`},
+		{"   ", ""},
+	}
+	for _, tt := range tests {
+		if got := ftsMatchQuery(tt.query); got != tt.want {
+			t.Errorf("ftsMatchQuery(%q) = %s, want %s", tt.query, got, tt.want)
+		}
+	}
+}
+
+func TestMySQLBooleanQueryDropsUnindexedTerms(t *testing.T) {
+	tests := []struct {
+		query        string
+		minTokenSize int
+		want         string
+	}{
+		{"cache eviction", 3, "+cache* +eviction*"},
+		{"go cache", 3, "+cache*"},
+		{"db", 3, ""},
+		{"the cache of it", 3, "+cache*"},
+		{"The Cache", 3, "+Cache*"},
+		{"what is that", 3, ""},
+		{`+cache -"evict" (x)`, 3, "+cache* +evict*"},
+		{"x-ray", 3, "+ray*"},
+		{"user_name", 3, "+user_name*"},
+		{"캐시를 정리", 3, "+캐시를*"},
+		{"go cache", 1, "+go* +cache*"},
+		{"   ", 3, ""},
+	}
+	for _, tt := range tests {
+		if got := mysqlBooleanQuery(tt.query, tt.minTokenSize); got != tt.want {
+			t.Errorf("mysqlBooleanQuery(%q, %d) = %q, want %q", tt.query, tt.minTokenSize, got, tt.want)
+		}
+	}
+}
+
+func TestSearchFTSAcceptsOperatorInput(t *testing.T) {
+	s := newTestSQLite(t)
+	requireFTS(t, s)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+	if err := s.CreateObservation(ctx, &models.Observation{SessionID: "s1", Type: "learning", Content: `use "NEAR" carefully - it is an operator`, Importance: 1}); err != nil {
+		t.Fatal(err)
+	}
+
+	for _, query := range []string{`"`, `*`, `NEAR(`, `-`, `a"b`, `NEAR`, `(x OR`, `^start`} {
+		if _, err := s.SearchFTS(ctx, query, nil, 10); err != nil {
+			t.Errorf("SearchFTS(%q): %v", query, err)
+		}
+	}
+	if ids := searchIDs(t, s, "NEAR", "observation"); len(ids) != 1 {
+		t.Errorf("literal NEAR matched %v, want the observation", ids)
+	}
+}
+
+func TestMakeSnippetMultibyte(t *testing.T) {
+	filler := strings.Repeat("관찰 기록을 저장하고 ", 20)
+	text := filler + "캐시 무효화 전략을 결정했다 " + filler
+
+	snippet := makeSnippet(text, []string{"무효화"}, 40)
+	if !utf8.ValidString(snippet) {
+		t.Fatalf("snippet is not valid UTF-8: %q", snippet)
+	}
+	if !strings.Contains(snippet, "무효화") {
+		t.Errorf("snippet %q does not contain the term", snippet)
+	}
+	if !strings.HasPrefix(snippet, "...") || !strings.HasSuffix(snippet, "...") {
+		t.Errorf("snippet %q should be elided on both sides", snippet)
+	}
+	if n := utf8.RuneCountInString(strings.Trim(snippet, ".")); n > 40 {
+		t.Errorf("snippet has %d runes, want at most 40", n)
+	}
+
+	// A term near the end still yields a full-length window
+	snippet = makeSnippet(filler+"끝", []string{"끝"}, 30)
+	if !strings.HasSuffix(snippet, "끝") || utf8.RuneCountInString(strings.TrimPrefix(snippet, "...")) != 30 {
+		t.Errorf("snippet near end = %q", snippet)
+	}
+
+	// Short text is returned unchanged
+	if got := makeSnippet("짧은 글", []string{"글"}, 30); got != "짧은 글" {
+		t.Errorf("short text = %q", got)
+	}
+}
+
+// BenchmarkSearchObservations compares the FTS5 index with the LIKE fallback
+// as the observations table grows, for a term in 1% of rows and a term in a
+// single old row. The 1M row case is skipped with -short.
+func BenchmarkSearchObservations(b *testing.B) {
+	for _, size := range []int{10_000, 100_000, 1_000_000} {
+		if size >= 1_000_000 && testing.Short() {
+			continue
+		}
+		s := newTestSQLite(b)
+		requireFTS(b, s)
+		seedObservations(b, s, []string{"alice", "bob"}, size)
+		ctx := context.Background()
+
+		for _, term := range []string{"needle", "rarity"} {
+			for _, mode := range []struct {
+				name string
+				fts  bool
+			}{{"fts5", true}, {"like", false}} {
+				b.Run(fmt.Sprintf("%s/%s/rows=%d", mode.name, term, size), func(b *testing.B) {
+					s.fts = mode.fts
+					defer func() { s.fts = true }()
+					b.ResetTimer()
+					for i := 0; i < b.N; i++ {
+						results, err := s.SearchFTS(ctx, term, []string{"observation"}, 20)
+						if err != nil {
+							b.Fatal(err)
+						}
+						if len(results) == 0 {
+							b.Fatal("no results")
+						}
+					}
+				})
+			}
+		}
+	}
+}
@@ -4,7 +4,13 @@ import (
 	"context"
 	"database/sql"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"log"
+	"os"
+	"runtime"
+	"strings"
+	"sync"
 	"time"
 
 	"github.com/do-focus/worker/pkg/models"
@@ -12,8 +18,16 @@ import (
 )
 
 // SQLite implements the Adapter interface for SQLite.
+// Writes go through a single writer connection; reads use a separate
+// read-only pool so they are not serialized behind writes in WAL mode.
 type SQLite struct {
-	db *sql.DB
+	db   *sql.DB // single writer connection
+	read *sql.DB // read-only pool
+	path string
+	fts  bool // FTS5 index available (requires the sqlite_fts5 build tag)
+
+	stmtMu sync.RWMutex
+	stmts  map[string]*sql.Stmt // prepared read statements, keyed by query
 }
 
 // NewSQLite creates a new SQLite adapter.
@@ -23,7 +37,8 @@ func NewSQLite(cfg Config) (*SQLite, error) {
 		path = ".do/memory.db"
 	}
 
-	db, err := sql.Open("sqlite3", path+"?_journal_mode=WAL&_busy_timeout=5000")
+	// New databases use incremental auto-vacuum so Compact can return free pages cheaply
+	db, err := sql.Open("sqlite3", path+"?_journal_mode=WAL&_busy_timeout=5000&_auto_vacuum=incremental")
 	if err != nil {
 		return nil, fmt.Errorf("failed to open sqlite: %w", err)
 	}
@@ -33,7 +48,7 @@ func NewSQLite(cfg Config) (*SQLite, error) {
 	db.SetMaxIdleConns(1)
 	db.SetConnMaxLifetime(time.Hour)
 
-	s := &SQLite{db: db}
+	s := &SQLite{db: db, read: db, path: path, stmts: make(map[string]*sql.Stmt)}
 
 	// Initialize schema
 	if err := s.initSchema(); err != nil {
@@ -41,9 +56,67 @@ func NewSQLite(cfg Config) (*SQLite, error) {
 		return nil, fmt.Errorf("failed to initialize schema: %w", err)
 	}
 
+	// In-memory databases are private to a connection, so they share the writer
+	if path == ":memory:" || strings.Contains(path, "mode=memory") {
+		return s, nil
+	}
+
+	// Read-only pool (WAL allows concurrent readers alongside the writer)
+	read, err := sql.Open("sqlite3", path+"?_busy_timeout=5000&_query_only=1")
+	if err != nil {
+		db.Close()
+		return nil, fmt.Errorf("failed to open sqlite read pool: %w", err)
+	}
+	readConns := runtime.NumCPU()
+	read.SetMaxOpenConns(readConns)
+	read.SetMaxIdleConns(readConns)
+	read.SetConnMaxLifetime(time.Hour)
+	s.read = read
+
 	return s, nil
 }
 
+// readStmt returns a cached prepared statement for a read query on the read pool.
+func (s *SQLite) readStmt(ctx context.Context, query string) (*sql.Stmt, error) {
+	s.stmtMu.RLock()
+	stmt, ok := s.stmts[query]
+	s.stmtMu.RUnlock()
+	if ok {
+		return stmt, nil
+	}
+
+	s.stmtMu.Lock()
+	defer s.stmtMu.Unlock()
+	if stmt, ok := s.stmts[query]; ok {
+		return stmt, nil
+	}
+	stmt, err := s.read.PrepareContext(ctx, query)
+	if err != nil {
+		return nil, err
+	}
+	s.stmts[query] = stmt
+	return stmt, nil
+}
+
+// queryContext runs a read query through the prepared statement cache.
+func (s *SQLite) queryContext(ctx context.Context, query string, args ...interface{}) (*sql.Rows, error) {
+	stmt, err := s.readStmt(ctx, query)
+	if err != nil {
+		return nil, err
+	}
+	return stmt.QueryContext(ctx, args...)
+}
+
+// queryRowContext runs a single-row read query through the prepared statement cache.
+func (s *SQLite) queryRowContext(ctx context.Context, query string, args ...interface{}) *sql.Row {
+	stmt, err := s.readStmt(ctx, query)
+	if err != nil {
+		// Let the read pool report the prepare error through Row.Scan
+		return s.read.QueryRowContext(ctx, query, args...)
+	}
+	return stmt.QueryRowContext(ctx, args...)
+}
+
 // initSchema creates the database tables if they don't exist.
 func (s *SQLite) initSchema() error {
 	schema := `
@@ -217,35 +290,344 @@ func (s *SQLite) runMigrations() error {
 	// Migration 011: Add response column to user_prompts table (stores assistant response with tool_use)
 	_, _ = s.db.Exec(`ALTER TABLE user_prompts ADD COLUMN response TEXT`)
 
+	// Migration 012: FTS5 full-text index (falls back to LIKE search when FTS5 is not compiled in)
+	s.fts = s.initFTS()
+
+	// Migration 013: Denormalized observation owner, query indexes and activity rollups
+	_, _ = s.db.Exec(`ALTER TABLE observations ADD COLUMN user_name TEXT`)
+	_, _ = s.db.Exec(`
+		UPDATE observations
+		SET user_name = (SELECT user_name FROM sessions WHERE sessions.id = observations.session_id),
+			project_id = COALESCE(project_id, (SELECT project_id FROM sessions WHERE sessions.id = observations.session_id))
+		WHERE user_name IS NULL
+	`)
+
+	queryIndexes := []string{
+		// GetRecentObservations: top-K per user without sorting all of the user's rows
+		`CREATE INDEX IF NOT EXISTS idx_observations_user_rank ON observations(user_name, importance DESC, created_at DESC)`,
+		`CREATE INDEX IF NOT EXISTS idx_observations_session_created ON observations(session_id, created_at)`,
+		`CREATE INDEX IF NOT EXISTS idx_sessions_user_started ON sessions(user_name, started_at)`,
+		`CREATE INDEX IF NOT EXISTS idx_plans_session_status ON plans(session_id, status, updated_at)`,
+		`CREATE INDEX IF NOT EXISTS idx_summaries_session_type ON summaries(session_id, type, created_at)`,
+		`CREATE INDEX IF NOT EXISTS idx_user_prompts_created_at ON user_prompts(created_at)`,
+	}
+	for _, idx := range queryIndexes {
+		if _, err := s.db.Exec(idx); err != nil {
+			return fmt.Errorf("failed to create index: %w", err)
+		}
+	}
+
+	_, err = s.db.Exec(`
+		CREATE TABLE IF NOT EXISTS user_activity (
+			user_name TEXT PRIMARY KEY,
+			session_count INTEGER NOT NULL DEFAULT 0,
+			last_activity DATETIME,
+			last_ended_session_id TEXT,
+			last_ended_started_at DATETIME
+		);
+
+		CREATE INDEX IF NOT EXISTS idx_user_activity_last_ended ON user_activity(last_ended_started_at);
+
+		CREATE TABLE IF NOT EXISTS project_activity (
+			project_id TEXT PRIMARY KEY,
+			session_count INTEGER NOT NULL DEFAULT 0,
+			last_activity DATETIME
+		);
+
+		CREATE INDEX IF NOT EXISTS idx_project_activity_last ON project_activity(last_activity);
+
+		CREATE TABLE IF NOT EXISTS schema_versions (
+			name TEXT PRIMARY KEY,
+			version INTEGER NOT NULL
+		);
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create activity rollup tables: %w", err)
+	}
+
+	// A failed rebuild records no version and is retried on the next start
+	if err := s.migrateActivityRollups(); err != nil {
+		log.Printf("Failed to rebuild activity rollups: %v", err)
+	}
+
+	// Migration 014: Compressed cold storage for old summary transcripts
+	_, err = s.db.Exec(`
+		CREATE TABLE IF NOT EXISTS summary_archives (
+			summary_id INTEGER PRIMARY KEY,
+			encoding TEXT NOT NULL,
+			source_message BLOB,
+			full_transcript BLOB,
+			original_bytes INTEGER NOT NULL DEFAULT 0,
+			archived_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+		);
+
+		CREATE TRIGGER IF NOT EXISTS summary_archives_ad AFTER DELETE ON summaries BEGIN
+			DELETE FROM summary_archives WHERE summary_id = old.id;
+		END;
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create summary_archives: %w", err)
+	}
+
+	// Migration 015: (julianday(created_at), id) indexes for keyset-paginated lists.
+	// Every index ends in the rowid, so id is implicit for INTEGER PRIMARY KEY tables.
+	keysetIndexes := []string{
+		`CREATE INDEX IF NOT EXISTS idx_observations_keyset ON observations(julianday(created_at))`,
+		`CREATE INDEX IF NOT EXISTS idx_observations_type_keyset ON observations(type, julianday(created_at))`,
+		`CREATE INDEX IF NOT EXISTS idx_sessions_keyset ON sessions(julianday(created_at), id)`,
+		`CREATE INDEX IF NOT EXISTS idx_summaries_keyset ON summaries(julianday(created_at))`,
+		`CREATE INDEX IF NOT EXISTS idx_plans_keyset ON plans(julianday(created_at))`,
+		`CREATE INDEX IF NOT EXISTS idx_plans_session_keyset ON plans(session_id, julianday(created_at))`,
+		`CREATE INDEX IF NOT EXISTS idx_user_prompts_session_keyset ON user_prompts(session_id, julianday(created_at))`,
+	}
+	for _, idx := range keysetIndexes {
+		if _, err := s.db.Exec(idx); err != nil {
+			return fmt.Errorf("failed to create index: %w", err)
+		}
+	}
+
+	// Migration 016: Durable queue for background summary generation
+	_, err = s.db.Exec(`
+		CREATE TABLE IF NOT EXISTS summary_jobs (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			session_id TEXT NOT NULL,
+			status TEXT NOT NULL DEFAULT 'queued',
+			attempts INTEGER NOT NULL DEFAULT 0,
+			summary_id INTEGER,
+			error TEXT,
+			payload TEXT,
+			run_after DATETIME NOT NULL,
+			created_at DATETIME NOT NULL,
+			updated_at DATETIME NOT NULL
+		);
+
+		CREATE INDEX IF NOT EXISTS idx_summary_jobs_status_run_after ON summary_jobs(status, run_after);
+		CREATE INDEX IF NOT EXISTS idx_summary_jobs_session_status ON summary_jobs(session_id, status);
+	`)
+	if err != nil {
+		return fmt.Errorf("failed to create summary_jobs: %w", err)
+	}
+
 	return nil
 }
 
+// migrateActivityRollups rebuilds the rollups unless they were already built
+// for activityRollupsVersion, so startup does not rescan sessions every time.
+func (s *SQLite) migrateActivityRollups() error {
+	var version int
+	err := s.db.QueryRow(`SELECT version FROM schema_versions WHERE name = 'activity_rollups'`).Scan(&version)
+	if err == nil && version == activityRollupsVersion {
+		return nil
+	}
+	if err != nil && !errors.Is(err, sql.ErrNoRows) {
+		return err
+	}
+	return s.rebuildActivityRollups()
+}
+
+// rebuildActivityRollups recomputes user_activity and project_activity from
+// sessions and records activityRollupsVersion in the same transaction.
+func (s *SQLite) rebuildActivityRollups() error {
+	tx, err := s.db.Begin()
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	statements := []string{
+		`DELETE FROM user_activity`,
+		`INSERT INTO user_activity (user_name, session_count, last_activity)
+			SELECT user_name, COUNT(*), MAX(started_at) FROM sessions GROUP BY user_name`,
+		`UPDATE user_activity SET last_ended_session_id = (
+			SELECT id FROM sessions
+			WHERE sessions.user_name = user_activity.user_name AND sessions.ended_at IS NOT NULL
+			ORDER BY sessions.started_at DESC
+			LIMIT 1
+		)`,
+		`UPDATE user_activity SET last_ended_started_at = (
+			SELECT started_at FROM sessions WHERE sessions.id = user_activity.last_ended_session_id
+		)`,
+		`DELETE FROM project_activity`,
+		`INSERT INTO project_activity (project_id, session_count, last_activity)
+			SELECT project_id, COUNT(*), MAX(started_at) FROM sessions
+			WHERE project_id IS NOT NULL AND project_id != ''
+			GROUP BY project_id`,
+	}
+	for _, stmt := range statements {
+		if _, err := tx.Exec(stmt); err != nil {
+			return fmt.Errorf("failed to rebuild activity rollups: %w", err)
+		}
+	}
+	if _, err := tx.Exec(`INSERT INTO schema_versions (name, version) VALUES ('activity_rollups', ?)
+		ON CONFLICT(name) DO UPDATE SET version = excluded.version`, activityRollupsVersion); err != nil {
+		return err
+	}
+	return tx.Commit()
+}
+
+// ftsIndex describes an external-content FTS5 table mirroring a source table.
+type ftsIndex struct {
+	table   string   // FTS5 table name
+	source  string   // source table name
+	columns []string // indexed source columns
+}
+
+// ftsIndexes lists the full-text indexes kept in sync with their source tables.
+var ftsIndexes = []ftsIndex{
+	{table: "observations_fts", source: "observations", columns: []string{"title", "content", "narrative"}},
+	{table: "user_prompts_fts", source: "user_prompts", columns: []string{"prompt_text"}},
+	{table: "summaries_fts", source: "summaries", columns: []string{"content", "request", "investigated", "learned", "completed", "next_steps"}},
+}
+
+// initFTS creates the FTS5 tables and sync triggers, backfilling newly created indexes.
+// Returns false if FTS5 is unavailable in the linked SQLite build; the sync
+// triggers are then dropped so writes keep working (see dropFTSTriggers).
+func (s *SQLite) initFTS() bool {
+	if !s.fts5Available() {
+		s.dropFTSTriggers()
+		return false
+	}
+	for _, idx := range ftsIndexes {
+		var tableExists, triggerExists int
+		_ = s.db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?`, idx.table).Scan(&tableExists)
+		_ = s.db.QueryRow(`SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name = ?`, idx.table+"_ai").Scan(&triggerExists)
+
+		cols := strings.Join(idx.columns, ", ")
+		newCols := "new." + strings.Join(idx.columns, ", new.")
+		oldCols := "old." + strings.Join(idx.columns, ", old.")
+
+		statements := []string{
+			fmt.Sprintf(`CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(%s, content='%s', content_rowid='id', tokenize='unicode61')`,
+				idx.table, cols, idx.source),
+			fmt.Sprintf(`CREATE TRIGGER IF NOT EXISTS %s_ai AFTER INSERT ON %s BEGIN
+				INSERT INTO %s(rowid, %s) VALUES (new.id, %s);
+			END`, idx.table, idx.source, idx.table, cols, newCols),
+			fmt.Sprintf(`CREATE TRIGGER IF NOT EXISTS %s_ad AFTER DELETE ON %s BEGIN
+				INSERT INTO %s(%s, rowid, %s) VALUES ('delete', old.id, %s);
+			END`, idx.table, idx.source, idx.table, idx.table, cols, oldCols),
+			fmt.Sprintf(`CREATE TRIGGER IF NOT EXISTS %s_au AFTER UPDATE OF %s ON %s BEGIN
+				INSERT INTO %s(%s, rowid, %s) VALUES ('delete', old.id, %s);
+				INSERT INTO %s(rowid, %s) VALUES (new.id, %s);
+			END`, idx.table, cols, idx.source, idx.table, idx.table, cols, oldCols, idx.table, cols, newCols),
+		}
+		for _, stmt := range statements {
+			if _, err := s.db.Exec(stmt); err != nil {
+				s.dropFTSTriggers()
+				return false
+			}
+		}
+
+		// Backfill rows written before the index existed, or while its
+		// triggers were dropped by a build without FTS5
+		if tableExists == 0 || triggerExists == 0 {
+			if _, err := s.db.Exec(fmt.Sprintf(`INSERT INTO %s(%s) VALUES ('rebuild')`, idx.table, idx.table)); err != nil {
+				s.dropFTSTriggers()
+				return false
+			}
+		}
+	}
+	return true
+}
+
+// fts5Available reports whether the linked SQLite has the FTS5 module. The
+// statements above succeed without it once the tables exist, so it is probed
+// with a throwaway table in the connection's temp schema.
+func (s *SQLite) fts5Available() bool {
+	if _, err := s.db.Exec(`CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)`); err != nil {
+		return false
+	}
+	_, _ = s.db.Exec(`DROP TABLE temp.fts5_probe`)
+	return true
+}
+
+// dropFTSTriggers removes the FTS sync triggers. They are stored in the
+// database file, and a binary built without the sqlite_fts5 tag fails every
+// write that fires them with "no such module: fts5". An FTS5 build recreates
+// them on its next start and rebuilds the indexes it missed.
+func (s *SQLite) dropFTSTriggers() {
+	for _, idx := range ftsIndexes {
+		for _, suffix := range []string{"_ai", "_ad", "_au"} {
+			_, _ = s.db.Exec(`DROP TRIGGER IF EXISTS ` + idx.table + suffix)
+		}
+	}
+}
+
 // Health checks database connectivity.
 func (s *SQLite) Health(ctx context.Context) error {
-	return s.db.PingContext(ctx)
+	if err := s.db.PingContext(ctx); err != nil {
+		return err
+	}
+	return s.read.PingContext(ctx)
 }
 
-// Close closes the database connection.
+// Close closes the database connections and cached statements.
 func (s *SQLite) Close() error {
+	s.stmtMu.Lock()
+	for query, stmt := range s.stmts {
+		stmt.Close()
+		delete(s.stmts, query)
+	}
+	s.stmtMu.Unlock()
+
+	if s.read != s.db {
+		s.read.Close()
+	}
 	return s.db.Close()
 }
 
 // CreateSession creates a new session.
 func (s *SQLite) CreateSession(ctx context.Context, session *models.Session) error {
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
 	query := `
 		INSERT INTO sessions (id, user_name, project_id, started_at, created_at, updated_at)
 		VALUES (?, ?, ?, ?, ?, ?)
 	`
 	now := time.Now()
-	_, err := s.db.ExecContext(ctx, query, session.ID, session.UserName, session.ProjectID, session.StartedAt, now, now)
-	return err
+	if _, err := tx.ExecContext(ctx, query, session.ID, session.UserName, session.ProjectID, session.StartedAt, now, now); err != nil {
+		return err
+	}
+
+	// Attach observations recorded before the session row existed
+	if _, err := tx.ExecContext(ctx, `
+		UPDATE observations SET user_name = ?, project_id = COALESCE(project_id, ?)
+		WHERE session_id = ? AND user_name IS NULL
+	`, session.UserName, session.ProjectID, session.ID); err != nil {
+		return err
+	}
+
+	// Maintain activity rollups
+	if _, err := tx.ExecContext(ctx, `
+		INSERT INTO user_activity (user_name, session_count, last_activity) VALUES (?, 1, ?)
+		ON CONFLICT(user_name) DO UPDATE SET
+			session_count = session_count + 1,
+			last_activity = MAX(COALESCE(last_activity, excluded.last_activity), excluded.last_activity)
+	`, session.UserName, session.StartedAt); err != nil {
+		return err
+	}
+	if session.ProjectID != "" {
+		if _, err := tx.ExecContext(ctx, `
+			INSERT INTO project_activity (project_id, session_count, last_activity) VALUES (?, 1, ?)
+			ON CONFLICT(project_id) DO UPDATE SET
+				session_count = session_count + 1,
+				last_activity = MAX(COALESCE(last_activity, excluded.last_activity), excluded.last_activity)
+		`, session.ProjectID, session.StartedAt); err != nil {
+			return err
+		}
+	}
+
+	return tx.Commit()
 }
 
 // GetSession retrieves a session by ID.
 func (s *SQLite) GetSession(ctx context.Context, id string) (*models.Session, error) {
 	query := `SELECT id, user_name, COALESCE(project_id, ''), started_at, ended_at, COALESCE(summary, ''), created_at, updated_at FROM sessions WHERE id = ?`
 	session := &models.Session{}
-	err := s.db.QueryRowContext(ctx, query, id).Scan(
+	err := s.queryRowContext(ctx, query, id).Scan(
 		&session.ID, &session.UserName, &session.ProjectID, &session.StartedAt, &session.EndedAt,
 		&session.Summary, &session.CreatedAt, &session.UpdatedAt,
 	)
@@ -265,7 +647,7 @@ func (s *SQLite) GetLatestSession(ctx context.Context, userName string) (*models
 		LIMIT 1
 	`
 	session := &models.Session{}
-	err := s.db.QueryRowContext(ctx, query, userName).Scan(
+	err := s.queryRowContext(ctx, query, userName).Scan(
 		&session.ID, &session.UserName, &session.StartedAt, &session.EndedAt,
 		&session.Summary, &session.CreatedAt, &session.UpdatedAt,
 	)
@@ -277,19 +659,45 @@ func (s *SQLite) GetLatestSession(ctx context.Context, userName string) (*models
 
 // EndSession ends a session with an optional summary.
 func (s *SQLite) EndSession(ctx context.Context, id string, summary string) error {
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
 	query := `UPDATE sessions SET ended_at = ?, summary = ?, updated_at = ? WHERE id = ?`
 	now := time.Now()
-	_, err := s.db.ExecContext(ctx, query, now, summary, now, id)
-	return err
+	if _, err := tx.ExecContext(ctx, query, now, summary, now, id); err != nil {
+		return err
+	}
+
+	// Track the user's most recent ended session for team context
+	if _, err := tx.ExecContext(ctx, `
+		UPDATE user_activity
+		SET last_ended_session_id = ?1,
+			last_ended_started_at = (SELECT started_at FROM sessions WHERE id = ?1)
+		WHERE user_name = (SELECT user_name FROM sessions WHERE id = ?1)
+			AND (last_ended_started_at IS NULL OR last_ended_started_at <= (SELECT started_at FROM sessions WHERE id = ?1))
+	`, id); err != nil {
+		return err
+	}
+
+	return tx.Commit()
 }
 
+// sqliteInsertObservation inserts an observation, copying the owning session's
+// user_name and project_id onto the row so per-user queries avoid a join.
+const sqliteInsertObservation = `
+	INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at, user_name, project_id)
+	VALUES (?, ?, ?, ?, ?, ?, ?,
+		(SELECT user_name FROM sessions WHERE id = ?),
+		(SELECT project_id FROM sessions WHERE id = ?))
+`
+
 // CreateObservation creates a new observation.
 func (s *SQLite) CreateObservation(ctx context.Context, obs *models.Observation) error {
-	query := `
-		INSERT INTO observations (session_id, agent_name, type, content, importance, tags, created_at)
-		VALUES (?, ?, ?, ?, ?, ?, ?)
-	`
-	result, err := s.db.ExecContext(ctx, query, obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, obs.Tags, time.Now())
+	result, err := s.db.ExecContext(ctx, sqliteInsertObservation,
+		obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, obs.Tags, time.Now(), obs.SessionID, obs.SessionID)
 	if err != nil {
 		return err
 	}
@@ -300,6 +708,44 @@ func (s *SQLite) CreateObservation(ctx context.Context, obs *models.Observation)
 	return nil
 }
 
+// CreateObservationsBatch inserts observations in a single transaction with a prepared statement.
+// Either all rows are written or none are; IDs are set on the passed slice elements.
+func (s *SQLite) CreateObservationsBatch(ctx context.Context, observations []models.Observation) error {
+	if len(observations) == 0 {
+		return nil
+	}
+
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return err
+	}
+	defer tx.Rollback()
+
+	stmt, err := tx.PrepareContext(ctx, sqliteInsertObservation)
+	if err != nil {
+		return err
+	}
+	defer stmt.Close()
+
+	now := time.Now()
+	for i := range observations {
+		obs := &observations[i]
+		if obs.CreatedAt.IsZero() {
+			obs.CreatedAt = now
+		}
+		result, err := stmt.ExecContext(ctx,
+			obs.SessionID, obs.AgentName, obs.Type, obs.Content, obs.Importance, obs.Tags, obs.CreatedAt, obs.SessionID, obs.SessionID)
+		if err != nil {
+			return fmt.Errorf("failed to insert observation %d of batch: %w", i, err)
+		}
+		if id, err := result.LastInsertId(); err == nil {
+			obs.ID = id
+		}
+	}
+
+	return tx.Commit()
+}
+
 // GetObservations retrieves observations for a session.
 func (s *SQLite) GetObservations(ctx context.Context, sessionID string) ([]models.Observation, error) {
 	query := `
@@ -308,7 +754,7 @@ func (s *SQLite) GetObservations(ctx context.Context, sessionID string) ([]model
 		WHERE session_id = ?
 		ORDER BY created_at DESC
 	`
-	rows, err := s.db.QueryContext(ctx, query, sessionID)
+	rows, err := s.queryContext(ctx, query, sessionID)
 	if err != nil {
 		return nil, err
 	}
@@ -325,17 +771,19 @@ func (s *SQLite) GetObservations(ctx context.Context, sessionID string) ([]model
 	return observations, rows.Err()
 }
 
+// sqliteRecentObservations reads a user's top observations through
+// idx_observations_user_rank on the denormalized user_name.
+const sqliteRecentObservations = `
+	SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
+	FROM observations
+	WHERE user_name = ?
+	ORDER BY importance DESC, created_at DESC
+	LIMIT ?
+`
+
 // GetRecentObservations retrieves recent observations across sessions for a user.
 func (s *SQLite) GetRecentObservations(ctx context.Context, userName string, limit int) ([]models.Observation, error) {
-	query := `
-		SELECT o.id, o.session_id, COALESCE(o.agent_name, ''), o.type, o.content, o.importance, COALESCE(o.tags, ''), o.created_at
-		FROM observations o
-		JOIN sessions s ON o.session_id = s.id
-		WHERE s.user_name = ?
-		ORDER BY o.importance DESC, o.created_at DESC
-		LIMIT ?
-	`
-	rows, err := s.db.QueryContext(ctx, query, userName, limit)
+	rows, err := s.queryContext(ctx, sqliteRecentObservations, userName, limit)
 	if err != nil {
 		return nil, err
 	}
@@ -352,52 +800,74 @@ func (s *SQLite) GetRecentObservations(ctx context.Context, userName string, lim
 	return observations, rows.Err()
 }
 
-// GetObservationsFiltered retrieves observations with optional filters and pagination.
-func (s *SQLite) GetObservationsFiltered(ctx context.Context, sessionID string, obsType string, limit int, offset int) ([]models.Observation, error) {
+// sqliteTimeFunc normalizes created_at for keyset pagination. The column holds
+// both driver-written times ("2006-01-02 15:04:05.999999999-07:00") and
+// CURRENT_TIMESTAMP defaults ("2006-01-02 15:04:05" in UTC), which do not
+// compare correctly as text; julianday maps both to the same millisecond.
+const sqliteTimeFunc = "julianday"
+
+// ListObservations visits observations with optional filters, newest first,
+// keyset-paginated on (created_at, id).
+func (s *SQLite) ListObservations(ctx context.Context, sessionID string, obsType string, page Page, fn func(*models.Observation) error) error {
+	f := filter{timeFunc: sqliteTimeFunc}
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
+	}
+	if obsType != "" {
+		f.add("type = ?", obsType)
+	}
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
 		FROM observations
-		WHERE (? = '' OR session_id = ?) AND (? = '' OR type = ?)
-		ORDER BY created_at DESC
-		LIMIT ? OFFSET ?
+		` + f.where() + `
+		ORDER BY julianday(created_at) DESC, id DESC
+		LIMIT ?
 	`
-	if limit <= 0 {
-		limit = 50
-	}
-	if offset < 0 {
-		offset = 0
-	}
-	rows, err := s.db.QueryContext(ctx, query, sessionID, sessionID, obsType, obsType, limit, offset)
+	rows, err := s.queryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var observations []models.Observation
 	for rows.Next() {
 		var obs models.Observation
 		if err := rows.Scan(&obs.ID, &obs.SessionID, &obs.AgentName, &obs.Type, &obs.Content, &obs.Importance, &obs.Tags, &obs.CreatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&obs); err != nil {
+			return err
 		}
-		observations = append(observations, obs)
 	}
-	return observations, rows.Err()
+	return rows.Err()
 }
 
-// SearchObservations searches observations by content.
+// SearchObservations searches observations by content, ranked by FTS5 relevance when available.
 func (s *SQLite) SearchObservations(ctx context.Context, query string, limit int) ([]models.Observation, error) {
-	sqlQuery := `
-		SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
-		FROM observations
-		WHERE content LIKE ?
-		ORDER BY importance DESC, created_at DESC
-		LIMIT ?
-	`
 	if limit <= 0 {
 		limit = 50
 	}
-	searchPattern := "%" + query + "%"
-	rows, err := s.db.QueryContext(ctx, sqlQuery, searchPattern, limit)
+
+	var rows *sql.Rows
+	var err error
+	if match := ftsMatchQuery(query); s.fts && match != "" {
+		rows, err = s.queryContext(ctx, `
+			SELECT o.id, o.session_id, COALESCE(o.agent_name, ''), o.type, o.content, o.importance, COALESCE(o.tags, ''), o.created_at
+			FROM observations_fts
+			JOIN observations o ON o.id = observations_fts.rowid
+			WHERE observations_fts MATCH ?
+			ORDER BY observations_fts.rank, o.importance DESC
+			LIMIT ?
+		`, match, limit)
+	} else {
+		rows, err = s.queryContext(ctx, `
+			SELECT id, session_id, COALESCE(agent_name, ''), type, content, importance, COALESCE(tags, ''), created_at
+			FROM observations
+			WHERE content LIKE ?
+			ORDER BY importance DESC, created_at DESC
+			LIMIT ?
+		`, "%"+query+"%", limit)
+	}
 	if err != nil {
 		return nil, err
 	}
@@ -457,7 +927,7 @@ func (s *SQLite) GetSummaries(ctx context.Context, summaryType string, limit int
 		ORDER BY created_at DESC
 		LIMIT ?
 	`
-	rows, err := s.db.QueryContext(ctx, query, summaryType, limit)
+	rows, err := s.queryContext(ctx, query, summaryType, limit)
 	if err != nil {
 		return nil, err
 	}
@@ -474,38 +944,38 @@ func (s *SQLite) GetSummaries(ctx context.Context, summaryType string, limit int
 	return summaries, rows.Err()
 }
 
-// GetAllSummaries retrieves all summaries within a date range.
-func (s *SQLite) GetAllSummaries(ctx context.Context, days int, limit int) ([]models.Summary, error) {
+// ListSummaries visits summaries from the last days, newest first,
+// keyset-paginated on (created_at, id).
+func (s *SQLite) ListSummaries(ctx context.Context, days int, page Page, fn func(*models.Summary) error) error {
 	if days <= 0 {
 		days = 7
 	}
-	if limit <= 0 {
-		limit = 100
-	}
+	f := filter{timeFunc: sqliteTimeFunc}
+	f.add("julianday(created_at) >= julianday('now', ? || ' days')", fmt.Sprintf("-%d", days))
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, COALESCE(session_id, ''), type, content, created_at,
 			COALESCE(request, ''), COALESCE(investigated, ''), COALESCE(learned, ''),
 			COALESCE(completed, ''), COALESCE(next_steps, ''), COALESCE(source_message, ''),
-			COALESCE(full_transcript, '')
+			COALESCE(full_transcript, ''),
+			EXISTS(SELECT 1 FROM summary_archives a WHERE a.summary_id = summaries.id)
 		FROM summaries
-		WHERE created_at >= datetime('now', ? || ' days')
-		ORDER BY created_at DESC
+		` + f.where() + `
+		ORDER BY julianday(created_at) DESC, id DESC
 		LIMIT ?
 	`
-	daysArg := fmt.Sprintf("-%d", days)
-	rows, err := s.db.QueryContext(ctx, query, daysArg, limit)
+	rows, err := s.queryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var summaries []models.Summary
 	for rows.Next() {
 		var sum models.Summary
 		var request, investigated, learned, completed, nextSteps, sourceMessage, fullTranscript string
 		if err := rows.Scan(&sum.ID, &sum.SessionID, &sum.Type, &sum.Content, &sum.CreatedAt,
-			&request, &investigated, &learned, &completed, &nextSteps, &sourceMessage, &fullTranscript); err != nil {
-			return nil, err
+			&request, &investigated, &learned, &completed, &nextSteps, &sourceMessage, &fullTranscript, &sum.Archived); err != nil {
+			return err
 		}
 		if request != "" {
 			sum.Request = &request
@@ -528,9 +998,68 @@ func (s *SQLite) GetAllSummaries(ctx context.Context, days int, limit int) ([]mo
 		if fullTranscript != "" {
 			sum.FullTranscript = fullTranscript
 		}
-		summaries = append(summaries, sum)
+		if err := fn(&sum); err != nil {
+			return err
+		}
 	}
-	return summaries, rows.Err()
+	return rows.Err()
+}
+
+// GetSummary retrieves a single summary with all fields.
+// Archived transcripts are decompressed from summary_archives on demand.
+func (s *SQLite) GetSummary(ctx context.Context, id int64) (*models.Summary, error) {
+	query := `
+		SELECT su.id, COALESCE(su.session_id, ''), su.type, su.content, su.created_at,
+			COALESCE(su.request, ''), COALESCE(su.investigated, ''), COALESCE(su.learned, ''),
+			COALESCE(su.completed, ''), COALESCE(su.next_steps, ''),
+			COALESCE(su.files_read, ''), COALESCE(su.files_edited, ''), COALESCE(su.discovery_tokens, 0),
+			COALESCE(su.source_message, ''), COALESCE(su.full_transcript, ''),
+			a.encoding, a.source_message, a.full_transcript
+		FROM summaries su
+		LEFT JOIN summary_archives a ON a.summary_id = su.id
+		WHERE su.id = ?
+	`
+	sum := &models.Summary{}
+	var request, investigated, learned, completed, nextSteps string
+	var encoding sql.NullString
+	var archivedSource, archivedTranscript []byte
+	err := s.queryRowContext(ctx, query, id).Scan(&sum.ID, &sum.SessionID, &sum.Type, &sum.Content, &sum.CreatedAt,
+		&request, &investigated, &learned, &completed, &nextSteps,
+		&sum.FilesRead, &sum.FilesEdited, &sum.DiscoveryTokens,
+		&sum.SourceMessage, &sum.FullTranscript,
+		&encoding, &archivedSource, &archivedTranscript)
+	if err == sql.ErrNoRows {
+		return nil, nil
+	}
+	if err != nil {
+		return nil, err
+	}
+	if request != "" {
+		sum.Request = &request
+	}
+	if investigated != "" {
+		sum.Investigated = &investigated
+	}
+	if learned != "" {
+		sum.Learned = &learned
+	}
+	if completed != "" {
+		sum.Completed = &completed
+	}
+	if nextSteps != "" {
+		sum.NextSteps = &nextSteps
+	}
+
+	if encoding.Valid {
+		sum.Archived = true
+		if sum.SourceMessage, err = decompressText(encoding.String, archivedSource); err != nil {
+			return nil, fmt.Errorf("failed to read archived source message: %w", err)
+		}
+		if sum.FullTranscript, err = decompressText(encoding.String, archivedTranscript); err != nil {
+			return nil, fmt.Errorf("failed to read archived transcript: %w", err)
+		}
+	}
+	return sum, nil
 }
 
 // GetLatestSummary retrieves the latest session summary for a user.
@@ -544,7 +1073,7 @@ func (s *SQLite) GetLatestSummary(ctx context.Context, userName string) (*models
 		LIMIT 1
 	`
 	summary := &models.Summary{}
-	err := s.db.QueryRowContext(ctx, query, userName).Scan(
+	err := s.queryRowContext(ctx, query, userName).Scan(
 		&summary.ID, &summary.SessionID, &summary.Type, &summary.Content, &summary.CreatedAt,
 	)
 	if err == sql.ErrNoRows {
@@ -585,7 +1114,7 @@ func (s *SQLite) GetActivePlan(ctx context.Context, userName string) (*models.Pl
 		LIMIT 1
 	`
 	plan := &models.Plan{}
-	err := s.db.QueryRowContext(ctx, query, userName).Scan(
+	err := s.queryRowContext(ctx, query, userName).Scan(
 		&plan.ID, &plan.SessionID, &plan.Title, &plan.Content,
 		&plan.Status, &plan.FilePath, &plan.RequestPrompt, &plan.CreatedAt, &plan.UpdatedAt,
 	)
@@ -595,33 +1124,37 @@ func (s *SQLite) GetActivePlan(ctx context.Context, userName string) (*models.Pl
 	return plan, err
 }
 
-// GetAllPlans retrieves all plans with optional session filter.
-func (s *SQLite) GetAllPlans(ctx context.Context, sessionID string, limit int) ([]models.Plan, error) {
-	if limit <= 0 {
-		limit = 50
+// ListPlans visits plans with an optional session filter, newest first,
+// keyset-paginated on (created_at, id).
+func (s *SQLite) ListPlans(ctx context.Context, sessionID string, page Page, fn func(*models.Plan) error) error {
+	f := filter{timeFunc: sqliteTimeFunc}
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
 	}
+	f.addPage(page, true, true)
 	query := `
 		SELECT id, COALESCE(session_id, ''), title, content, status, COALESCE(file_path, ''), COALESCE(request_prompt, ''), created_at, updated_at
 		FROM plans
-		WHERE ? = '' OR session_id = ?
-		ORDER BY updated_at DESC
+		` + f.where() + `
+		ORDER BY julianday(created_at) DESC, id DESC
 		LIMIT ?
 	`
-	rows, err := s.db.QueryContext(ctx, query, sessionID, sessionID, limit)
+	rows, err := s.queryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var plans []models.Plan
 	for rows.Next() {
 		var plan models.Plan
 		if err := rows.Scan(&plan.ID, &plan.SessionID, &plan.Title, &plan.Content, &plan.Status, &plan.FilePath, &plan.RequestPrompt, &plan.CreatedAt, &plan.UpdatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&plan); err != nil {
+			return err
 		}
-		plans = append(plans, plan)
 	}
-	return plans, rows.Err()
+	return rows.Err()
 }
 
 // UpdatePlanStatus updates a plan's status.
@@ -631,50 +1164,58 @@ func (s *SQLite) UpdatePlanStatus(ctx context.Context, id int64, status string)
 	return err
 }
 
-// GetRecentSessions retrieves recent sessions.
-func (s *SQLite) GetRecentSessions(ctx context.Context, limit int) ([]models.Session, error) {
-	if limit <= 0 {
-		limit = 20
-	}
+// ListSessions visits sessions newest first, keyset-paginated on (created_at, id).
+func (s *SQLite) ListSessions(ctx context.Context, page Page, fn func(*models.Session) error) error {
+	f := filter{timeFunc: sqliteTimeFunc}
+	f.addPage(page, true, false)
 	query := `
 		SELECT id, user_name, started_at, ended_at, COALESCE(summary, ''), created_at, updated_at
 		FROM sessions
-		ORDER BY started_at DESC
+		` + f.where() + `
+		ORDER BY julianday(created_at) DESC, id DESC
 		LIMIT ?
 	`
-	rows, err := s.db.QueryContext(ctx, query, limit)
+	rows, err := s.queryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var sessions []models.Session
 	for rows.Next() {
 		var session models.Session
 		if err := rows.Scan(&session.ID, &session.UserName, &session.StartedAt, &session.EndedAt, &session.Summary, &session.CreatedAt, &session.UpdatedAt); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&session); err != nil {
+			return err
 		}
-		sessions = append(sessions, session)
 	}
-	return sessions, rows.Err()
+	return rows.Err()
 }
 
+// sqliteTeamContext reads the user_activity rollup instead of grouping all
+// ended sessions.
+const sqliteTeamContext = `
+	SELECT
+		u.user_name,
+		s.started_at as last_activity,
+		COALESCE(s.summary, '') as summary,
+		COALESCE((
+			SELECT p.title FROM plans p
+			WHERE p.session_id = s.id AND p.status = 'active'
+			ORDER BY p.updated_at DESC
+			LIMIT 1
+		), '') as active_plan
+	FROM user_activity u
+	JOIN sessions s ON s.id = u.last_ended_session_id
+	WHERE u.user_name != ?
+	ORDER BY u.last_ended_started_at DESC
+	LIMIT 10
+`
+
 // GetTeamContext retrieves context from other team members.
 func (s *SQLite) GetTeamContext(ctx context.Context, excludeUser string) ([]models.TeamContext, error) {
-	query := `
-		SELECT
-			s.user_name,
-			MAX(s.started_at) as last_activity,
-			COALESCE(s.summary, '') as summary,
-			COALESCE(p.title, '') as active_plan
-		FROM sessions s
-		LEFT JOIN plans p ON p.session_id = s.id AND p.status = 'active'
-		WHERE s.user_name != ? AND s.ended_at IS NOT NULL
-		GROUP BY s.user_name
-		ORDER BY last_activity DESC
-		LIMIT 10
-	`
-	rows, err := s.db.QueryContext(ctx, query, excludeUser)
+	rows, err := s.queryContext(ctx, sqliteTeamContext, excludeUser)
 	if err != nil {
 		return nil, err
 	}
@@ -691,20 +1232,21 @@ func (s *SQLite) GetTeamContext(ctx context.Context, excludeUser string) ([]mode
 	return contexts, rows.Err()
 }
 
+// sqliteProjects reads the project_activity rollup instead of grouping all
+// sessions.
+const sqliteProjects = `
+	SELECT
+		project_id,
+		project_id as path,
+		session_count,
+		last_activity
+	FROM project_activity
+	ORDER BY last_activity DESC
+`
+
 // GetProjects retrieves all registered projects with session statistics.
 func (s *SQLite) GetProjects(ctx context.Context) ([]models.Project, error) {
-	query := `
-		SELECT
-			project_id,
-			project_id as path,
-			COUNT(*) as session_count,
-			MAX(started_at) as last_activity
-		FROM sessions
-		WHERE project_id IS NOT NULL AND project_id != ''
-		GROUP BY project_id
-		ORDER BY last_activity DESC
-	`
-	rows, err := s.db.QueryContext(ctx, query)
+	rows, err := s.queryContext(ctx, sqliteProjects)
 	if err != nil {
 		return nil, err
 	}
@@ -713,18 +1255,11 @@ func (s *SQLite) GetProjects(ctx context.Context) ([]models.Project, error) {
 	var projects []models.Project
 	for rows.Next() {
 		var p models.Project
-		var lastActivityStr string
-		if err := rows.Scan(&p.ID, &p.Path, &p.SessionCount, &lastActivityStr); err != nil {
+		var lastActivity sql.NullTime
+		if err := rows.Scan(&p.ID, &p.Path, &p.SessionCount, &lastActivity); err != nil {
 			return nil, err
 		}
-		// Parse SQLite datetime string (format: 2006-01-02 15:04:05.999999999+09:00)
-		if t, err := time.Parse("2006-01-02 15:04:05.999999999-07:00", lastActivityStr); err == nil {
-			p.LastActivity = t
-		} else if t, err := time.Parse("2006-01-02 15:04:05-07:00", lastActivityStr); err == nil {
-			p.LastActivity = t
-		} else if t, err := time.Parse("2006-01-02 15:04:05", lastActivityStr); err == nil {
-			p.LastActivity = t
-		}
+		p.LastActivity = lastActivity.Time
 		projects = append(projects, p)
 	}
 	return projects, rows.Err()
@@ -759,50 +1294,41 @@ func (s *SQLite) CreateUserPrompt(ctx context.Context, prompt *models.UserPrompt
 	return nil
 }
 
-// GetUserPrompts retrieves user prompts for a session (or all if sessionID is empty).
-func (s *SQLite) GetUserPrompts(ctx context.Context, sessionID string, limit int) ([]models.UserPrompt, error) {
-	if limit <= 0 {
-		limit = 100
-	}
-
-	var query string
-	var rows *sql.Rows
-	var err error
-
-	if sessionID == "" {
-		// Return all prompts (most recent first)
-		query = `
-			SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
-			FROM user_prompts
-			ORDER BY created_at DESC
-			LIMIT ?
-		`
-		rows, err = s.db.QueryContext(ctx, query, limit)
-	} else {
-		// Return prompts for specific session
-		query = `
-			SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
-			FROM user_prompts
-			WHERE session_id = ?
-			ORDER BY prompt_number ASC
-			LIMIT ?
-		`
-		rows, err = s.db.QueryContext(ctx, query, sessionID, limit)
+// ListUserPrompts visits user prompts keyset-paginated on (created_at, id).
+// All prompts are listed newest first; a single session's prompts are listed in
+// conversation order.
+func (s *SQLite) ListUserPrompts(ctx context.Context, sessionID string, page Page, fn func(*models.UserPrompt) error) error {
+	// All prompts are listed most recent first; a session's prompts in conversation order
+	f := filter{timeFunc: sqliteTimeFunc}
+	order := "DESC"
+	if sessionID != "" {
+		f.add("session_id = ?", sessionID)
+		order = "ASC"
 	}
+	f.addPage(page, order == "DESC", true)
+	query := `
+		SELECT id, session_id, prompt_number, prompt_text, COALESCE(response, ''), created_at, created_at_epoch
+		FROM user_prompts
+		` + f.where() + `
+		ORDER BY julianday(created_at) ` + order + `, id ` + order + `
+		LIMIT ?
+	`
+	rows, err := s.queryContext(ctx, query, append(f.args, page.limitArg())...)
 	if err != nil {
-		return nil, err
+		return err
 	}
 	defer rows.Close()
 
-	var prompts []models.UserPrompt
 	for rows.Next() {
 		var p models.UserPrompt
 		if err := rows.Scan(&p.ID, &p.SessionID, &p.PromptNumber, &p.PromptText, &p.Response, &p.CreatedAt, &p.CreatedAtEpoch); err != nil {
-			return nil, err
+			return err
+		}
+		if err := fn(&p); err != nil {
+			return err
 		}
-		prompts = append(prompts, p)
 	}
-	return prompts, rows.Err()
+	return rows.Err()
 }
 
 // UpdateLatestPromptResponse updates the response for the latest prompt in a session.
@@ -821,41 +1347,441 @@ func (s *SQLite) UpdateLatestPromptResponse(ctx context.Context, sessionID strin
 	return err
 }
 
-// SearchFTS performs full-text search across observations and user_prompts using FTS5.
+// SearchFTS performs full-text search across observations, user_prompts and summaries using FTS5.
+// Results are ranked by bm25 relevance. Without FTS5 support it falls back to LIKE scans.
 func (s *SQLite) SearchFTS(ctx context.Context, query string, types []string, limit int) ([]models.SearchResult, error) {
-	// FTS5 disabled - Go sqlite3 driver doesn't support FTS5 by default
-	// Use simple LIKE search instead
 	if limit <= 0 {
 		limit = 50
 	}
 
+	match := ftsMatchQuery(query)
+	if !s.fts || match == "" {
+		return s.searchLike(ctx, query, types, limit)
+	}
+
+	searches := []struct {
+		resultType string
+		query      string
+	}{
+		{"observation", `
+			SELECT o.id, o.session_id, o.content, o.created_at,
+				snippet(observations_fts, -1, '**', '**', '...', 16), observations_fts.rank
+			FROM observations_fts
+			JOIN observations o ON o.id = observations_fts.rowid
+			WHERE observations_fts MATCH ?
+			ORDER BY observations_fts.rank
+			LIMIT ?
+		`},
+		{"prompt", `
+			SELECT p.id, p.session_id, p.prompt_text, p.created_at,
+				snippet(user_prompts_fts, -1, '**', '**', '...', 16), user_prompts_fts.rank
+			FROM user_prompts_fts
+			JOIN user_prompts p ON p.id = user_prompts_fts.rowid
+			WHERE user_prompts_fts MATCH ?
+			ORDER BY user_prompts_fts.rank
+			LIMIT ?
+		`},
+		{"summary", `
+			SELECT su.id, COALESCE(su.session_id, ''), su.content, su.created_at,
+				snippet(summaries_fts, -1, '**', '**', '...', 16), summaries_fts.rank
+			FROM summaries_fts
+			JOIN summaries su ON su.id = summaries_fts.rowid
+			WHERE summaries_fts MATCH ?
+			ORDER BY summaries_fts.rank
+			LIMIT ?
+		`},
+	}
+
+	var results []models.SearchResult
+	for _, search := range searches {
+		if !searchTypeEnabled(types, search.resultType) {
+			continue
+		}
+		rows, err := s.queryContext(ctx, search.query, match, limit)
+		if err != nil {
+			return nil, err
+		}
+		for rows.Next() {
+			var r models.SearchResult
+			var bm25 float64
+			r.Type = search.resultType
+			if err := rows.Scan(&r.ID, &r.SessionID, &r.Content, &r.CreatedAt, &r.Snippet, &bm25); err != nil {
+				rows.Close()
+				return nil, err
+			}
+			// bm25 is negative with lower meaning more relevant; flip so higher ranks first
+			r.Rank = -bm25
+			results = append(results, r)
+		}
+		err = rows.Err()
+		rows.Close()
+		if err != nil {
+			return nil, err
+		}
+	}
+
+	return rankResults(results, limit), nil
+}
+
+// searchLike is the unindexed LIKE fallback for SearchFTS.
+func (s *SQLite) searchLike(ctx context.Context, query string, types []string, limit int) ([]models.SearchResult, error) {
 	var results []models.SearchResult
 	likeQuery := "%" + query + "%"
+	terms := searchTerms(query)
+
+	searches := []struct {
+		resultType string
+		query      string
+	}{
+		{"observation", `
+			SELECT id, session_id, content, created_at
+			FROM observations
+			WHERE content LIKE ?
+			ORDER BY created_at DESC
+			LIMIT ?
+		`},
+		{"prompt", `
+			SELECT id, session_id, prompt_text, created_at
+			FROM user_prompts
+			WHERE prompt_text LIKE ?
+			ORDER BY created_at DESC
+			LIMIT ?
+		`},
+		{"summary", `
+			SELECT id, COALESCE(session_id, ''), content, created_at
+			FROM summaries
+			WHERE content LIKE ?
+			ORDER BY created_at DESC
+			LIMIT ?
+		`},
+	}
 
-	// Search observations using LIKE
-	obsQuery := `
-		SELECT id, session_id, content, created_at
-		FROM observations
-		WHERE content LIKE ?
-		ORDER BY created_at DESC
-		LIMIT ?
-	`
-	rows, err := s.db.QueryContext(ctx, obsQuery, likeQuery, limit)
-	if err == nil {
-		defer rows.Close()
+	for _, search := range searches {
+		if !searchTypeEnabled(types, search.resultType) {
+			continue
+		}
+		rows, err := s.queryContext(ctx, search.query, likeQuery, limit)
+		if err != nil {
+			continue
+		}
 		for rows.Next() {
 			var r models.SearchResult
-			r.Type = "observation"
+			r.Type = search.resultType
 			if err := rows.Scan(&r.ID, &r.SessionID, &r.Content, &r.CreatedAt); err != nil {
 				continue
 			}
-			r.Snippet = r.Content
-			if len(r.Snippet) > 100 {
-				r.Snippet = r.Snippet[:100] + "..."
-			}
+			r.Snippet = makeSnippet(r.Content, terms, snippetLength)
 			results = append(results, r)
 		}
+		rows.Close()
 	}
 
-	return results, nil
+	return rankResults(results, limit), nil
+}
+
+// PruneTable deletes rows outside a retention policy, in small batches.
+func (s *SQLite) PruneTable(ctx context.Context, policy RetentionPolicy) (int64, error) {
+	if err := checkRetentionPolicy(policy); err != nil {
+		return 0, err
+	}
+
+	var deleted int64
+	if policy.MaxAge > 0 {
+		cutoff := time.Now().Add(-policy.MaxAge)
+		query := fmt.Sprintf(`DELETE FROM %[1]s WHERE id IN (SELECT id FROM %[1]s WHERE created_at < ? LIMIT ?)`, policy.Table)
+		n, err := s.deleteBatches(ctx, query, cutoff)
+		deleted += n
+		if err != nil {
+			return deleted, err
+		}
+	}
+
+	if policy.MaxRows > 0 {
+		// Newest MaxRows rows are kept; everything at or below the next id goes
+		var cutoffID int64
+		err := s.db.QueryRowContext(ctx,
+			fmt.Sprintf(`SELECT id FROM %s ORDER BY id DESC LIMIT 1 OFFSET ?`, policy.Table), policy.MaxRows,
+		).Scan(&cutoffID)
+		if err == sql.ErrNoRows {
+			return deleted, nil
+		}
+		if err != nil {
+			return deleted, err
+		}
+		query := fmt.Sprintf(`DELETE FROM %[1]s WHERE id IN (SELECT id FROM %[1]s WHERE id <= ? LIMIT ?)`, policy.Table)
+		n, err := s.deleteBatches(ctx, query, cutoffID)
+		deleted += n
+		if err != nil {
+			return deleted, err
+		}
+	}
+
+	return deleted, nil
+}
+
+// deleteBatches runs a batched DELETE (taking the cutoff and batch size) until no rows remain.
+func (s *SQLite) deleteBatches(ctx context.Context, query string, cutoff interface{}) (int64, error) {
+	var deleted int64
+	for {
+		result, err := s.db.ExecContext(ctx, query, cutoff, retentionBatchRows)
+		if err != nil {
+			return deleted, err
+		}
+		n, err := result.RowsAffected()
+		if err != nil {
+			return deleted, err
+		}
+		deleted += n
+		if n < retentionBatchRows {
+			return deleted, nil
+		}
+	}
+}
+
+// ArchiveTranscripts moves the source message and full transcript of up to limit
+// summaries created before the cutoff into gzip-compressed summary_archives rows.
+func (s *SQLite) ArchiveTranscripts(ctx context.Context, before time.Time, limit int) (int, error) {
+	rows, err := s.queryContext(ctx, `
+		SELECT id, COALESCE(source_message, ''), COALESCE(full_transcript, '')
+		FROM summaries
+		WHERE created_at < ? AND (COALESCE(source_message, '') != '' OR COALESCE(full_transcript, '') != '')
+		ORDER BY id
+		LIMIT ?
+	`, before, limit)
+	if err != nil {
+		return 0, err
+	}
+	var archives []*transcriptArchive
+	for rows.Next() {
+		var id int64
+		var sourceMessage, fullTranscript string
+		if err := rows.Scan(&id, &sourceMessage, &fullTranscript); err != nil {
+			rows.Close()
+			return 0, err
+		}
+		archive, err := newTranscriptArchive(id, sourceMessage, fullTranscript)
+		if err != nil {
+			rows.Close()
+			return 0, err
+		}
+		archives = append(archives, archive)
+	}
+	rows.Close()
+	if err := rows.Err(); err != nil {
+		return 0, err
+	}
+	if len(archives) == 0 {
+		return 0, nil
+	}
+
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return 0, err
+	}
+	defer tx.Rollback()
+
+	insert, err := tx.PrepareContext(ctx, `
+		INSERT OR REPLACE INTO summary_archives (summary_id, encoding, source_message, full_transcript, original_bytes, archived_at)
+		VALUES (?, ?, ?, ?, ?, ?)
+	`)
+	if err != nil {
+		return 0, err
+	}
+	defer insert.Close()
+
+	strip, err := tx.PrepareContext(ctx, `UPDATE summaries SET source_message = NULL, full_transcript = NULL WHERE id = ?`)
+	if err != nil {
+		return 0, err
+	}
+	defer strip.Close()
+
+	now := time.Now()
+	for _, a := range archives {
+		if _, err := insert.ExecContext(ctx, a.summaryID, archiveEncoding, a.sourceMessage, a.fullTranscript, a.originalBytes, now); err != nil {
+			return 0, err
+		}
+		if _, err := strip.ExecContext(ctx, a.summaryID); err != nil {
+			return 0, err
+		}
+	}
+
+	if err := tx.Commit(); err != nil {
+		return 0, err
+	}
+	return len(archives), nil
+}
+
+// StorageSize returns the bytes used by the database file and its WAL.
+func (s *SQLite) StorageSize(ctx context.Context) (int64, error) {
+	var pageCount, pageSize int64
+	if err := s.db.QueryRowContext(ctx, `PRAGMA page_count`).Scan(&pageCount); err != nil {
+		return 0, err
+	}
+	if err := s.db.QueryRowContext(ctx, `PRAGMA page_size`).Scan(&pageSize); err != nil {
+		return 0, err
+	}
+	size := pageCount * pageSize
+	if info, err := os.Stat(s.path + "-wal"); err == nil {
+		size += info.Size()
+	}
+	return size, nil
+}
+
+// Compact returns free pages to the filesystem, merges FTS segments,
+// refreshes planner statistics and truncates the WAL. Databases created
+// without incremental auto-vacuum are switched over with a full VACUUM, which
+// rewrites the whole file while holding the write lock, so that only happens
+// when full is set.
+func (s *SQLite) Compact(ctx context.Context, full bool) error {
+	var autoVacuum int
+	if err := s.db.QueryRowContext(ctx, `PRAGMA auto_vacuum`).Scan(&autoVacuum); err != nil {
+		return err
+	}
+	if autoVacuum != 2 && full {
+		if _, err := s.db.ExecContext(ctx, `PRAGMA auto_vacuum = INCREMENTAL`); err != nil {
+			return err
+		}
+		if _, err := s.db.ExecContext(ctx, `VACUUM`); err != nil {
+			return err
+		}
+	} else if autoVacuum == 2 {
+		// incremental_vacuum frees one page per step, so its rows must be drained
+		rows, err := s.db.QueryContext(ctx, `PRAGMA incremental_vacuum`)
+		if err != nil {
+			return err
+		}
+		for rows.Next() {
+		}
+		rows.Close()
+		if err := rows.Err(); err != nil {
+			return err
+		}
+	}
+
+	if s.fts {
+		for _, idx := range ftsIndexes {
+			if _, err := s.db.ExecContext(ctx, fmt.Sprintf(`INSERT INTO %[1]s(%[1]s) VALUES('optimize')`, idx.table)); err != nil {
+				return err
+			}
+		}
+	}
+
+	if _, err := s.db.ExecContext(ctx, `ANALYZE`); err != nil {
+		return err
+	}
+	_, err := s.db.ExecContext(ctx, `PRAGMA wal_checkpoint(TRUNCATE)`)
+	return err
+}
+
+// EnqueueSummaryJob queues summary generation for a session. A job still queued
+// for the session is updated with the new payload instead of adding another.
+func (s *SQLite) EnqueueSummaryJob(ctx context.Context, sessionID string, payload string) (*models.SummaryJob, error) {
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		return nil, err
+	}
+	defer tx.Rollback()
+
+	now := time.Now()
+	var id int64
+	err = tx.QueryRowContext(ctx,
+		`SELECT id FROM summary_jobs WHERE session_id = ? AND status = ? LIMIT 1`, sessionID, models.JobQueued).Scan(&id)
+	switch {
+	case err == sql.ErrNoRows:
+		result, err := tx.ExecContext(ctx, `
+			INSERT INTO summary_jobs (session_id, status, attempts, payload, run_after, created_at, updated_at)
+			VALUES (?, ?, 0, ?, ?, ?, ?)
+		`, sessionID, models.JobQueued, payload, now, now, now)
+		if err != nil {
+			return nil, err
+		}
+		if id, err = result.LastInsertId(); err != nil {
+			return nil, err
+		}
+	case err != nil:
+		return nil, err
+	default:
+		if _, err := tx.ExecContext(ctx, `
+			UPDATE summary_jobs SET payload = ?, attempts = 0, error = NULL, run_after = ?, updated_at = ?
+			WHERE id = ?
+		`, payload, now, now, id); err != nil {
+			return nil, err
+		}
+	}
+
+	job, err := scanSummaryJob(tx.QueryRowContext(ctx,
+		`SELECT `+summaryJobColumns+` FROM summary_jobs WHERE id = ?`, id))
+	if err != nil {
+		return nil, err
+	}
+	return job, tx.Commit()
+}
+
+// ClaimSummaryJob marks the oldest due job as running and returns it, or nil if
+// none is due. Jobs of a session that already has a running job are skipped.
+func (s *SQLite) ClaimSummaryJob(ctx context.Context, now time.Time) (*models.SummaryJob, error) {
+	return scanSummaryJob(s.db.QueryRowContext(ctx, `
+		UPDATE summary_jobs SET status = ?, attempts = attempts + 1, updated_at = ?
+		WHERE id = (
+			SELECT id FROM summary_jobs
+			WHERE status = ? AND run_after <= ?
+				AND session_id NOT IN (SELECT session_id FROM summary_jobs WHERE status = ?)
+			ORDER BY run_after, id
+			LIMIT 1
+		)
+		RETURNING `+summaryJobColumns,
+		models.JobRunning, now, models.JobQueued, now, models.JobRunning))
+}
+
+// CompleteSummaryJob marks a job done and drops its payload.
+func (s *SQLite) CompleteSummaryJob(ctx context.Context, id int64, summaryID int64) error {
+	_, err := s.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, summary_id = ?, error = NULL, payload = NULL, updated_at = ?
+		WHERE id = ?
+	`, models.JobDone, summaryID, time.Now(), id)
+	return err
+}
+
+// RetrySummaryJob puts a failed attempt back in the queue until runAfter.
+func (s *SQLite) RetrySummaryJob(ctx context.Context, id int64, errMsg string, runAfter time.Time) error {
+	_, err := s.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, error = ?, run_after = ?, updated_at = ?
+		WHERE id = ? AND status = ?
+	`, models.JobQueued, errMsg, runAfter, time.Now(), id, models.JobRunning)
+	return err
+}
+
+// FailSummaryJob marks a job permanently failed and drops its payload.
+func (s *SQLite) FailSummaryJob(ctx context.Context, id int64, errMsg string) error {
+	_, err := s.db.ExecContext(ctx, `
+		UPDATE summary_jobs SET status = ?, error = ?, payload = NULL, updated_at = ?
+		WHERE id = ?
+	`, models.JobFailed, errMsg, time.Now(), id)
+	return err
+}
+
+// RequeueRunningSummaryJobs returns jobs interrupted by a shutdown to the queue.
+func (s *SQLite) RequeueRunningSummaryJobs(ctx context.Context) (int64, error) {
+	result, err := s.db.ExecContext(ctx,
+		`UPDATE summary_jobs SET status = ?, updated_at = ? WHERE status = ?`,
+		models.JobQueued, time.Now(), models.JobRunning)
+	if err != nil {
+		return 0, err
+	}
+	return result.RowsAffected()
+}
+
+// PruneSummaryJobs deletes done and failed jobs last updated before the cutoff.
+func (s *SQLite) PruneSummaryJobs(ctx context.Context, before time.Time) (int64, error) {
+	return s.deleteBatches(ctx, `
+		DELETE FROM summary_jobs WHERE id IN (
+			SELECT id FROM summary_jobs WHERE `+finishedSummaryJobs+` AND updated_at < ? LIMIT ?
+		)
+	`, before)
+}
+
+// GetSummaryJob retrieves a summary job by ID.
+func (s *SQLite) GetSummaryJob(ctx context.Context, id int64) (*models.SummaryJob, error) {
+	return scanSummaryJob(s.queryRowContext(ctx,
+		`SELECT `+summaryJobColumns+` FROM summary_jobs WHERE id = ?`, id))
 }
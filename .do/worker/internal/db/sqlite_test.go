@@ -0,0 +1,152 @@
+package db
+
+import (
+	"context"
+	"fmt"
+	"sort"
+	"sync"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+func TestReadPoolDoesNotBlockOnOpenWrite(t *testing.T) {
+	s := newTestSQLite(t)
+	ctx := context.Background()
+	createTestSession(t, s, "s1", "alice", "", time.Now())
+
+	tx, err := s.db.BeginTx(ctx, nil)
+	if err != nil {
+		t.Fatal(err)
+	}
+	defer tx.Rollback()
+	if _, err := tx.ExecContext(ctx, sqliteInsertObservation,
+		"s1", "tester", "learning", "uncommitted", 3, "", time.Now(), "s1", "s1"); err != nil {
+		t.Fatal(err)
+	}
+
+	type result struct {
+		observations []models.Observation
+		err          error
+	}
+	done := make(chan result, 1)
+	go func() {
+		observations, err := s.GetObservations(ctx, "s1")
+		done <- result{observations, err}
+	}()
+
+	select {
+	case r := <-done:
+		if r.err != nil {
+			t.Fatalf("read during write transaction: %v", r.err)
+		}
+		if len(r.observations) != 0 {
+			t.Errorf("read saw %d uncommitted observations", len(r.observations))
+		}
+	case <-time.After(2 * time.Second):
+		t.Fatal("read blocked behind the open write transaction")
+	}
+
+	if err := tx.Commit(); err != nil {
+		t.Fatal(err)
+	}
+	observations, err := s.GetObservations(ctx, "s1")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(observations) != 1 {
+		t.Errorf("read after commit saw %d observations, want 1", len(observations))
+	}
+
+	// The pool is opened with _query_only and rejects writes
+	if _, err := s.read.ExecContext(ctx, `DELETE FROM observations`); err == nil {
+		t.Error("write through the read pool succeeded")
+	}
+}
+
+// latencies collects operation durations from parallel goroutines.
+type latencies struct {
+	mu      sync.Mutex
+	samples []time.Duration
+}
+
+func (l *latencies) add(d time.Duration) {
+	l.mu.Lock()
+	l.samples = append(l.samples, d)
+	l.mu.Unlock()
+}
+
+// report adds p50 and p99 in microseconds as benchmark metrics.
+func (l *latencies) report(b *testing.B, name string) {
+	if len(l.samples) == 0 {
+		return
+	}
+	sort.Slice(l.samples, func(i, j int) bool { return l.samples[i] < l.samples[j] })
+	at := func(p float64) float64 {
+		return float64(l.samples[int(float64(len(l.samples)-1)*p)].Microseconds())
+	}
+	b.ReportMetric(at(0.50), name+"-p50-µs")
+	b.ReportMetric(at(0.99), name+"-p99-µs")
+}
+
+// BenchmarkMixedReadWrite runs the hook traffic mix against the adapter from
+// parallel goroutines: one observation write per four context-inject reads
+// (latest session, recent observations, active plan, team context).
+// "single-conn" routes reads through the writer connection as the adapter
+// did before the read pool; "read-pool" is the current configuration.
+func BenchmarkMixedReadWrite(b *testing.B) {
+	users := []string{"alice", "bob", "carol", "dave"}
+	for _, mode := range []string{"single-conn", "read-pool"} {
+		b.Run(mode, func(b *testing.B) {
+			s := newTestSQLite(b)
+			seedObservations(b, s, users, 10_000)
+			if mode == "single-conn" {
+				s.read = s.db
+			}
+			ctx := context.Background()
+
+			var reads, writes latencies
+			var n atomic.Int64
+			b.SetParallelism(4)
+			b.ResetTimer()
+			b.RunParallel(func(pb *testing.PB) {
+				for pb.Next() {
+					i := n.Add(1)
+					user := users[i%int64(len(users))]
+					start := time.Now()
+					if i%5 == 0 {
+						obs := &models.Observation{SessionID: fmt.Sprintf("seed-%d", i%int64(len(users))), Type: "learning", Content: testContent(int(i), 12), Importance: 2}
+						if err := s.CreateObservation(ctx, obs); err != nil {
+							b.Error(err)
+							return
+						}
+						writes.add(time.Since(start))
+						continue
+					}
+					if _, err := s.GetLatestSession(ctx, user); err != nil {
+						b.Error(err)
+						return
+					}
+					if _, err := s.GetRecentObservations(ctx, user, 20); err != nil {
+						b.Error(err)
+						return
+					}
+					if _, err := s.GetActivePlan(ctx, user); err != nil {
+						b.Error(err)
+						return
+					}
+					if _, err := s.GetTeamContext(ctx, user); err != nil {
+						b.Error(err)
+						return
+					}
+					reads.add(time.Since(start))
+				}
+			})
+			b.StopTimer()
+			reads.report(b, "read")
+			writes.report(b, "write")
+		})
+	}
+}
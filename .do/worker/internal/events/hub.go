@@ -0,0 +1,207 @@
+// Package events provides the in-process pub/sub hub behind the live update stream.
+package events
+
+import (
+	"encoding/json"
+	"log"
+	"sync"
+	"time"
+)
+
+// Event types published by the write handlers.
+const (
+	SessionCreated     = "session.created"
+	SessionUpdated     = "session.updated"
+	ObservationCreated = "observation.created"
+	PromptCreated      = "prompt.created"
+	PromptUpdated      = "prompt.updated"
+	PlanCreated        = "plan.created"
+	SummaryCreated     = "summary.created"
+)
+
+// Event is a change notification with a JSON payload.
+type Event struct {
+	ID   uint64
+	Type string
+	Data []byte
+}
+
+// Hub fans published events out to subscribers and keeps a bounded history so
+// reconnecting clients can resume after their last event ID.
+//
+// Publishing never blocks: a subscriber whose buffer is full is closed, and the
+// client is expected to reconnect and resume from history.
+type Hub struct {
+	cfg Config
+
+	mu      sync.Mutex
+	lastID  uint64
+	history []Event // ring buffer of the most recent events
+	start   int     // index of the oldest event in history
+	subs    map[*Subscription]struct{}
+	closed  bool
+}
+
+// Config configures a Hub.
+type Config struct {
+	History int // events kept for resume
+	Buffer  int // events buffered per subscriber before it is dropped
+}
+
+// DefaultConfig returns the default hub configuration.
+func DefaultConfig() Config {
+	return Config{
+		History: 512,
+		Buffer:  64,
+	}
+}
+
+// Option configures a Hub.
+type Option func(*Config)
+
+// WithHistory sets how many recent events are kept for resume.
+func WithHistory(n int) Option {
+	return func(c *Config) {
+		if n > 0 {
+			c.History = n
+		}
+	}
+}
+
+// WithBuffer sets the per-subscriber buffer size.
+func WithBuffer(n int) Option {
+	return func(c *Config) {
+		if n > 0 {
+			c.Buffer = n
+		}
+	}
+}
+
+// Subscription receives events until it is closed.
+type Subscription struct {
+	C <-chan Event
+	c chan Event
+}
+
+// NewHub creates an event hub.
+func NewHub(opts ...Option) *Hub {
+	cfg := DefaultConfig()
+	for _, opt := range opts {
+		opt(&cfg)
+	}
+	return &Hub{
+		cfg: cfg,
+		// IDs continue from the clock so IDs from a previous process are older
+		// than any event here and resuming from them is detected as a gap
+		lastID:  uint64(time.Now().UnixMicro()),
+		history: make([]Event, 0, cfg.History),
+		subs:    make(map[*Subscription]struct{}),
+	}
+}
+
+// Publish encodes data and delivers it to every subscriber.
+func (h *Hub) Publish(eventType string, data interface{}) {
+	payload, err := json.Marshal(data)
+	if err != nil {
+		log.Printf("Failed to encode %s event: %v", eventType, err)
+		return
+	}
+
+	h.mu.Lock()
+	defer h.mu.Unlock()
+	if h.closed {
+		return
+	}
+
+	h.lastID++
+	event := Event{ID: h.lastID, Type: eventType, Data: payload}
+	if len(h.history) < h.cfg.History {
+		h.history = append(h.history, event)
+	} else {
+		h.history[h.start] = event
+		h.start = (h.start + 1) % len(h.history)
+	}
+
+	for sub := range h.subs {
+		select {
+		case sub.c <- event:
+		default:
+			// Slow consumer: drop it rather than block writers
+			h.remove(sub)
+		}
+	}
+}
+
+// Subscribe registers a subscriber for events published from now on.
+func (h *Hub) Subscribe() *Subscription {
+	h.mu.Lock()
+	defer h.mu.Unlock()
+	return h.add()
+}
+
+// Resume registers a subscriber and returns the events published after lastID.
+// ok is false when some of those events are no longer in history (or lastID is
+// unknown); the subscriber is still registered and the client should reload.
+func (h *Hub) Resume(lastID uint64) (sub *Subscription, missed []Event, ok bool) {
+	h.mu.Lock()
+	defer h.mu.Unlock()
+
+	oldest := h.lastID + 1
+	if len(h.history) > 0 {
+		oldest = h.history[h.start].ID
+	}
+	ok = lastID+1 >= oldest && lastID <= h.lastID
+	if ok {
+		for i := range h.history {
+			event := h.history[(h.start+i)%len(h.history)]
+			if event.ID > lastID {
+				missed = append(missed, event)
+			}
+		}
+	}
+	return h.add(), missed, ok
+}
+
+// Unsubscribe removes a subscriber and closes its channel.
+func (h *Hub) Unsubscribe(sub *Subscription) {
+	h.mu.Lock()
+	defer h.mu.Unlock()
+	h.remove(sub)
+}
+
+// Subscribers returns the number of connected subscribers.
+func (h *Hub) Subscribers() int {
+	h.mu.Lock()
+	defer h.mu.Unlock()
+	return len(h.subs)
+}
+
+// Close closes every subscription and stops accepting events.
+func (h *Hub) Close() {
+	h.mu.Lock()
+	defer h.mu.Unlock()
+	h.closed = true
+	for sub := range h.subs {
+		h.remove(sub)
+	}
+}
+
+// add registers a new subscriber. Callers hold mu.
+func (h *Hub) add() *Subscription {
+	c := make(chan Event, h.cfg.Buffer)
+	sub := &Subscription{C: c, c: c}
+	if h.closed {
+		close(c)
+		return sub
+	}
+	h.subs[sub] = struct{}{}
+	return sub
+}
+
+// remove unregisters a subscriber once. Callers hold mu.
+func (h *Hub) remove(sub *Subscription) {
+	if _, ok := h.subs[sub]; ok {
+		delete(h.subs, sub)
+		close(sub.c)
+	}
+}
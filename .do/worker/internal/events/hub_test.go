@@ -0,0 +1,121 @@
+package events
+
+import (
+	"testing"
+	"time"
+)
+
+// publishN publishes n events and returns their IDs in order.
+func publishN(h *Hub, n int) []uint64 {
+	ids := make([]uint64, 0, n)
+	for i := 0; i < n; i++ {
+		h.Publish(ObservationCreated, i)
+		ids = append(ids, h.lastID)
+	}
+	return ids
+}
+
+func TestResumeAcrossRingWraparound(t *testing.T) {
+	h := NewHub(WithHistory(4))
+	defer h.Close()
+	// 10 events through a ring of 4 leaves events 7-10 with start mid-slice
+	ids := publishN(h, 10)
+
+	tests := []struct {
+		name   string
+		lastID uint64
+		want   []uint64
+		ok     bool
+	}{
+		{"caught up", ids[9], nil, true},
+		{"inside ring", ids[7], ids[8:], true},
+		{"just before oldest", ids[5], ids[6:], true},
+		{"evicted", ids[4], nil, false},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			sub, missed, ok := h.Resume(tt.lastID)
+			defer h.Unsubscribe(sub)
+			if ok != tt.ok {
+				t.Fatalf("ok = %v, want %v", ok, tt.ok)
+			}
+			if len(missed) != len(tt.want) {
+				t.Fatalf("missed %d events, want %d", len(missed), len(tt.want))
+			}
+			for i, event := range missed {
+				if event.ID != tt.want[i] {
+					t.Errorf("missed[%d].ID = %d, want %d", i, event.ID, tt.want[i])
+				}
+			}
+		})
+	}
+}
+
+func TestResumeResetsUnknownIDs(t *testing.T) {
+	previous := NewHub()
+	stale := publishN(previous, 3)
+	previous.Close()
+	time.Sleep(time.Millisecond)
+
+	h := NewHub()
+	defer h.Close()
+	ids := publishN(h, 3)
+
+	tests := []struct {
+		name   string
+		lastID uint64
+	}{
+		{"zero", 0},
+		{"before restart", stale[2]},
+		{"ahead of hub", ids[2] + 1},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			sub, missed, ok := h.Resume(tt.lastID)
+			defer h.Unsubscribe(sub)
+			if ok || len(missed) != 0 {
+				t.Fatalf("Resume(%d) = %d missed, ok %v; want a reset", tt.lastID, len(missed), ok)
+			}
+		})
+	}
+
+	// The client reloads but stays subscribed to new events
+	sub, _, _ := h.Resume(stale[2])
+	h.Publish(SessionCreated, "after reset")
+	if event := <-sub.C; event.Type != SessionCreated {
+		t.Errorf("received %q after reset, want %q", event.Type, SessionCreated)
+	}
+}
+
+func TestPublishDropsSlowSubscriber(t *testing.T) {
+	h := NewHub(WithBuffer(2))
+	defer h.Close()
+	slow := h.Subscribe()
+	fast := h.Subscribe()
+
+	done := make(chan struct{})
+	go func() {
+		defer close(done)
+		for i := 0; i < 5; i++ {
+			h.Publish(ObservationCreated, i)
+			<-fast.C
+		}
+	}()
+	select {
+	case <-done:
+	case <-time.After(2 * time.Second):
+		t.Fatal("Publish blocked on a subscriber that stopped reading")
+	}
+
+	// The slow subscriber keeps what fit in its buffer, then its channel closes
+	var received int
+	for range slow.C {
+		received++
+	}
+	if received != 2 {
+		t.Errorf("slow subscriber received %d events, want 2", received)
+	}
+	if n := h.Subscribers(); n != 1 {
+		t.Errorf("Subscribers() = %d, want 1", n)
+	}
+}
@@ -0,0 +1,239 @@
+// Package jobs runs durable background summary generation for the Do Worker Service.
+package jobs
+
+import (
+	"context"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"log"
+	"sync"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// Handler generates the summary for a claimed job and returns the new summary's ID.
+// lastAttempt is true when a failure will not be retried, so the handler can fall
+// back to a degraded result instead of failing.
+type Handler func(ctx context.Context, job *models.SummaryJob, lastAttempt bool) (int64, error)
+
+// Pool runs queued summary jobs on a bounded number of workers. Jobs live in the
+// database, so queued work and retries survive a restart.
+type Pool struct {
+	db      db.Adapter
+	handler Handler
+	cfg     Config
+
+	wake   chan struct{}
+	ctx    context.Context
+	cancel context.CancelFunc
+	wg     sync.WaitGroup
+}
+
+// Config configures the job pool.
+type Config struct {
+	Workers      int           // concurrently running jobs
+	MaxAttempts  int           // attempts before a job fails
+	Backoff      time.Duration // delay before the first retry; doubles per attempt
+	MaxBackoff   time.Duration // upper bound on the retry delay
+	JobTimeout   time.Duration // deadline for a single attempt
+	PollInterval time.Duration // how often idle workers look for due jobs
+}
+
+// DefaultConfig returns the default job pool configuration.
+func DefaultConfig() Config {
+	return Config{
+		Workers:      2,
+		MaxAttempts:  5,
+		Backoff:      2 * time.Second,
+		MaxBackoff:   5 * time.Minute,
+		JobTimeout:   2 * time.Minute,
+		PollInterval: 30 * time.Second,
+	}
+}
+
+// Option configures a Pool.
+type Option func(*Config)
+
+// WithWorkers sets the number of concurrently running jobs.
+func WithWorkers(n int) Option {
+	return func(c *Config) {
+		if n > 0 {
+			c.Workers = n
+		}
+	}
+}
+
+// WithMaxAttempts sets how many times a job is attempted before it fails.
+func WithMaxAttempts(n int) Option {
+	return func(c *Config) {
+		if n > 0 {
+			c.MaxAttempts = n
+		}
+	}
+}
+
+// WithBackoff sets the delay before the first retry.
+func WithBackoff(d time.Duration) Option {
+	return func(c *Config) {
+		if d > 0 {
+			c.Backoff = d
+		}
+	}
+}
+
+// permanentError marks a failure that retrying cannot fix.
+type permanentError struct {
+	err error
+}
+
+func (e *permanentError) Error() string { return e.err.Error() }
+func (e *permanentError) Unwrap() error { return e.err }
+
+// Permanent wraps err so the job fails immediately instead of being retried.
+func Permanent(err error) error {
+	return &permanentError{err: err}
+}
+
+// NewPool creates a job pool, requeues jobs interrupted by the last shutdown
+// and starts the workers.
+func NewPool(adapter db.Adapter, handler Handler, opts ...Option) *Pool {
+	cfg := DefaultConfig()
+	for _, opt := range opts {
+		opt(&cfg)
+	}
+
+	ctx, cancel := context.WithCancel(context.Background())
+	p := &Pool{
+		db:      adapter,
+		handler: handler,
+		cfg:     cfg,
+		wake:    make(chan struct{}, 1),
+		ctx:     ctx,
+		cancel:  cancel,
+	}
+
+	if n, err := adapter.RequeueRunningSummaryJobs(ctx); err != nil {
+		log.Printf("Failed to requeue interrupted summary jobs: %v", err)
+	} else if n > 0 {
+		log.Printf("Requeued %d interrupted summary jobs", n)
+	}
+
+	for i := 0; i < cfg.Workers; i++ {
+		p.wg.Add(1)
+		go p.work()
+	}
+
+	return p
+}
+
+// Enqueue queues summary generation for req.SessionID and wakes a worker.
+// A job still waiting for the same session is replaced rather than duplicated.
+func (p *Pool) Enqueue(ctx context.Context, req *models.GenerateSummaryRequest) (*models.SummaryJob, error) {
+	payload, err := json.Marshal(req)
+	if err != nil {
+		return nil, err
+	}
+	job, err := p.db.EnqueueSummaryJob(ctx, req.SessionID, string(payload))
+	if err != nil {
+		return nil, err
+	}
+	p.notify()
+	return job, nil
+}
+
+// Close stops the workers. Attempts in flight are cancelled and left running in
+// the database; the next NewPool requeues them.
+func (p *Pool) Close() {
+	p.cancel()
+	p.wg.Wait()
+}
+
+// notify wakes one idle worker without blocking.
+func (p *Pool) notify() {
+	select {
+	case p.wake <- struct{}{}:
+	default:
+	}
+}
+
+// work claims and runs due jobs until Close.
+func (p *Pool) work() {
+	defer p.wg.Done()
+
+	ticker := time.NewTicker(p.cfg.PollInterval)
+	defer ticker.Stop()
+
+	for {
+		job, err := p.db.ClaimSummaryJob(p.ctx, time.Now())
+		if err != nil && p.ctx.Err() == nil {
+			log.Printf("Failed to claim summary job: %v", err)
+		}
+		if job != nil {
+			// More jobs may be due; let another idle worker look
+			p.notify()
+			p.run(job)
+			continue
+		}
+
+		select {
+		case <-p.wake:
+		case <-ticker.C:
+		case <-p.ctx.Done():
+			return
+		}
+	}
+}
+
+// run executes one attempt and records its outcome.
+func (p *Pool) run(job *models.SummaryJob) {
+	lastAttempt := job.Attempts >= p.cfg.MaxAttempts
+	summaryID, err := p.attempt(job, lastAttempt)
+	if p.ctx.Err() != nil {
+		return
+	}
+
+	// Record the outcome even if the attempt ran out of time
+	ctx := context.Background()
+	var permanent *permanentError
+	switch {
+	case err == nil:
+		err = p.db.CompleteSummaryJob(ctx, job.ID, summaryID)
+	case lastAttempt || errors.As(err, &permanent):
+		log.Printf("Summary job %d for session %s failed after %d attempts: %v", job.ID, job.SessionID, job.Attempts, err)
+		err = p.db.FailSummaryJob(ctx, job.ID, err.Error())
+	default:
+		delay := p.backoff(job.Attempts)
+		err = p.db.RetrySummaryJob(ctx, job.ID, err.Error(), time.Now().Add(delay))
+		time.AfterFunc(delay, p.notify)
+	}
+	if err != nil {
+		log.Printf("Failed to update summary job %d: %v", job.ID, err)
+	}
+}
+
+// attempt calls the handler with a per-attempt deadline, converting panics to errors.
+func (p *Pool) attempt(job *models.SummaryJob, lastAttempt bool) (summaryID int64, err error) {
+	ctx, cancel := context.WithTimeout(p.ctx, p.cfg.JobTimeout)
+	defer cancel()
+	defer func() {
+		if r := recover(); r != nil {
+			err = fmt.Errorf("panic: %v", r)
+		}
+	}()
+	return p.handler(ctx, job, lastAttempt)
+}
+
+// backoff returns the retry delay after the given number of attempts.
+func (p *Pool) backoff(attempts int) time.Duration {
+	delay := p.cfg.Backoff
+	for i := 1; i < attempts && delay < p.cfg.MaxBackoff; i++ {
+		delay *= 2
+	}
+	if delay > p.cfg.MaxBackoff {
+		delay = p.cfg.MaxBackoff
+	}
+	return delay
+}
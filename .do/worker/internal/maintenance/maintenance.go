@@ -0,0 +1,217 @@
+// Package maintenance provides retention, transcript archiving and compaction
+// for the Do Worker Service database.
+package maintenance
+
+import (
+	"context"
+	"log"
+	"sync"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// Runner applies retention policies, archives old transcripts and compacts
+// the database, either on demand or periodically in the background.
+type Runner struct {
+	db  db.Adapter
+	cfg Config
+
+	runMu  sync.Mutex // serializes runs
+	ticker *time.Ticker
+	done   chan struct{}
+}
+
+// Config configures retention and compaction.
+type Config struct {
+	Policies     []db.RetentionPolicy // per-table age and row limits
+	ArchiveAfter time.Duration        // summary age before transcripts are compressed; 0 disables archiving
+	ArchiveBatch int                  // summaries archived per transaction
+	JobRetention time.Duration        // age after which done and failed summary jobs are deleted; 0 keeps them
+	Interval     time.Duration        // background run interval; 0 disables the background job
+
+	// OnPrune is called after a run that deleted rows, e.g. to drop caches.
+	OnPrune func(report *models.MaintenanceReport)
+}
+
+// DefaultConfig returns the default maintenance configuration.
+// No rows are deleted unless a policy is configured.
+func DefaultConfig() Config {
+	return Config{
+		ArchiveAfter: 30 * 24 * time.Hour,
+		ArchiveBatch: 100,
+		JobRetention: 7 * 24 * time.Hour,
+		Interval:     24 * time.Hour,
+	}
+}
+
+// Option configures a Runner.
+type Option func(*Config)
+
+// WithPolicy adds a retention policy. Policies without limits are ignored.
+func WithPolicy(policy db.RetentionPolicy) Option {
+	return func(c *Config) {
+		if policy.MaxAge > 0 || policy.MaxRows > 0 {
+			c.Policies = append(c.Policies, policy)
+		}
+	}
+}
+
+// WithArchiveAfter sets the summary age after which transcripts are archived.
+func WithArchiveAfter(d time.Duration) Option {
+	return func(c *Config) {
+		if d > 0 {
+			c.ArchiveAfter = d
+		}
+	}
+}
+
+// WithJobRetention sets how long finished summary jobs are kept. A negative
+// duration keeps them forever.
+func WithJobRetention(d time.Duration) Option {
+	return func(c *Config) {
+		if d < 0 {
+			c.JobRetention = 0
+		} else if d > 0 {
+			c.JobRetention = d
+		}
+	}
+}
+
+// WithInterval sets the background run interval. A negative interval disables it.
+func WithInterval(d time.Duration) Option {
+	return func(c *Config) {
+		if d < 0 {
+			c.Interval = 0
+		} else if d > 0 {
+			c.Interval = d
+		}
+	}
+}
+
+// WithPruneHandler sets the callback invoked after rows were deleted.
+func WithPruneHandler(fn func(report *models.MaintenanceReport)) Option {
+	return func(c *Config) {
+		c.OnPrune = fn
+	}
+}
+
+// NewRunner creates a maintenance runner and starts its background job.
+func NewRunner(adapter db.Adapter, opts ...Option) *Runner {
+	cfg := DefaultConfig()
+	for _, opt := range opts {
+		opt(&cfg)
+	}
+
+	r := &Runner{
+		db:   adapter,
+		cfg:  cfg,
+		done: make(chan struct{}),
+	}
+
+	if cfg.Interval > 0 {
+		r.ticker = time.NewTicker(cfg.Interval)
+		go r.loop()
+	}
+
+	return r
+}
+
+// Close stops the background job.
+func (r *Runner) Close() {
+	close(r.done)
+	if r.ticker != nil {
+		r.ticker.Stop()
+	}
+	// Wait for an in-flight run to finish
+	r.runMu.Lock()
+	r.runMu.Unlock()
+}
+
+// loop runs maintenance on every tick until Close.
+func (r *Runner) loop() {
+	for {
+		select {
+		case <-r.ticker.C:
+			report, err := r.Run(context.Background(), false)
+			if err != nil {
+				log.Printf("Maintenance run failed: %v", err)
+				continue
+			}
+			log.Printf("Maintenance: pruned %v, archived %d summaries, reclaimed %d bytes",
+				report.Pruned, report.ArchivedSummaries, report.BytesReclaimed)
+		case <-r.done:
+			return
+		}
+	}
+}
+
+// Run prunes, archives and compacts once, reporting the space reclaimed.
+// Full compaction may rewrite whole tables and is only requested explicitly
+// (godo worker compact); background runs pass false.
+func (r *Runner) Run(ctx context.Context, full bool) (*models.MaintenanceReport, error) {
+	r.runMu.Lock()
+	defer r.runMu.Unlock()
+
+	report := &models.MaintenanceReport{
+		Pruned:    make(map[string]int64),
+		StartedAt: time.Now(),
+	}
+
+	before, err := r.db.StorageSize(ctx)
+	if err != nil {
+		return nil, err
+	}
+	report.BytesBefore = before
+
+	var pruned int64
+	for _, policy := range r.cfg.Policies {
+		n, err := r.db.PruneTable(ctx, policy)
+		report.Pruned[policy.Table] += n
+		pruned += n
+		if err != nil {
+			return report, err
+		}
+	}
+	if pruned > 0 && r.cfg.OnPrune != nil {
+		r.cfg.OnPrune(report)
+	}
+
+	// Finished jobs are only kept for the status endpoint
+	if r.cfg.JobRetention > 0 {
+		n, err := r.db.PruneSummaryJobs(ctx, time.Now().Add(-r.cfg.JobRetention))
+		report.Pruned["summary_jobs"] = n
+		if err != nil {
+			return report, err
+		}
+	}
+
+	if r.cfg.ArchiveAfter > 0 {
+		cutoff := time.Now().Add(-r.cfg.ArchiveAfter)
+		for {
+			n, err := r.db.ArchiveTranscripts(ctx, cutoff, r.cfg.ArchiveBatch)
+			report.ArchivedSummaries += n
+			if err != nil {
+				return report, err
+			}
+			if n == 0 || n < r.cfg.ArchiveBatch {
+				break
+			}
+		}
+	}
+
+	if err := r.db.Compact(ctx, full); err != nil {
+		return report, err
+	}
+
+	after, err := r.db.StorageSize(ctx)
+	if err != nil {
+		return report, err
+	}
+	report.BytesAfter = after
+	report.BytesReclaimed = before - after
+	report.DurationMillis = time.Since(report.StartedAt).Milliseconds()
+
+	return report, nil
+}
@@ -0,0 +1,76 @@
+package maintenance
+
+import (
+	"context"
+	"path/filepath"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+)
+
+// recordingAdapter records the full flag of every Compact call.
+type recordingAdapter struct {
+	db.Adapter
+
+	mu    sync.Mutex
+	calls []bool
+}
+
+func (a *recordingAdapter) Compact(ctx context.Context, full bool) error {
+	a.mu.Lock()
+	a.calls = append(a.calls, full)
+	a.mu.Unlock()
+	return a.Adapter.Compact(ctx, full)
+}
+
+func (a *recordingAdapter) compactCalls() []bool {
+	a.mu.Lock()
+	defer a.mu.Unlock()
+	return append([]bool(nil), a.calls...)
+}
+
+func newRecordingAdapter(t *testing.T) *recordingAdapter {
+	t.Helper()
+	adapter, err := db.New(db.Config{Type: "sqlite", Path: filepath.Join(t.TempDir(), "memory.db")})
+	if err != nil {
+		t.Fatal(err)
+	}
+	t.Cleanup(func() { adapter.Close() })
+	return &recordingAdapter{Adapter: adapter}
+}
+
+func TestBackgroundRunSkipsFullCompaction(t *testing.T) {
+	adapter := newRecordingAdapter(t)
+	r := NewRunner(adapter, WithInterval(10*time.Millisecond))
+
+	deadline := time.Now().Add(5 * time.Second)
+	for len(adapter.compactCalls()) == 0 && time.Now().Before(deadline) {
+		time.Sleep(5 * time.Millisecond)
+	}
+	r.Close()
+
+	calls := adapter.compactCalls()
+	if len(calls) == 0 {
+		t.Fatal("background job never ran")
+	}
+	for _, full := range calls {
+		if full {
+			t.Fatal("background run requested full compaction")
+		}
+	}
+}
+
+func TestExplicitRunCompactsFully(t *testing.T) {
+	adapter := newRecordingAdapter(t)
+	r := NewRunner(adapter, WithInterval(-1))
+	defer r.Close()
+
+	if _, err := r.Run(context.Background(), true); err != nil {
+		t.Fatal(err)
+	}
+	if calls := adapter.compactCalls(); len(calls) != 1 || !calls[0] {
+		t.Errorf("Compact calls = %v, want [true]", calls)
+	}
+}
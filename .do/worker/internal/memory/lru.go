@@ -0,0 +1,148 @@
+package memory
+
+import (
+	"container/list"
+	"sync"
+	"time"
+)
+
+// LRU is a size-bounded cache with optional TTL expiry, safe for concurrent use.
+type LRU struct {
+	mu    sync.Mutex
+	size  int
+	ttl   time.Duration
+	items map[string]*list.Element
+	order *list.List // front is most recently used
+	gen   uint64     // bumped by every Delete, DeleteFunc and Clear
+}
+
+// lruEntry is a cached value with its expiry time.
+type lruEntry struct {
+	key     string
+	value   interface{}
+	expires time.Time
+}
+
+// NewLRU creates a cache holding at most size entries.
+// Entries expire after ttl; a ttl of 0 disables expiry.
+func NewLRU(size int, ttl time.Duration) *LRU {
+	if size <= 0 {
+		size = 1
+	}
+	return &LRU{
+		size:  size,
+		ttl:   ttl,
+		items: make(map[string]*list.Element),
+		order: list.New(),
+	}
+}
+
+// Get returns a cached value and marks it as recently used.
+func (c *LRU) Get(key string) (interface{}, bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	el, ok := c.items[key]
+	if !ok {
+		return nil, false
+	}
+	entry := el.Value.(*lruEntry)
+	if c.ttl > 0 && time.Now().After(entry.expires) {
+		c.remove(el)
+		return nil, false
+	}
+	c.order.MoveToFront(el)
+	return entry.value, true
+}
+
+// Set stores a value, evicting the least recently used entry when full.
+func (c *LRU) Set(key string, value interface{}) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.set(key, value)
+}
+
+// Generation returns the invalidation generation. Read it before loading the
+// data for a value and pass it to SetIf.
+func (c *LRU) Generation() uint64 {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return c.gen
+}
+
+// SetIf stores a value only if nothing was deleted since gen was read. The
+// check and the insert happen under one lock, so an invalidation either lands
+// first and rejects the value or runs after it and removes it.
+func (c *LRU) SetIf(key string, value interface{}, gen uint64) bool {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if c.gen != gen {
+		return false
+	}
+	c.set(key, value)
+	return true
+}
+
+// set stores a value. Caller must hold c.mu.
+func (c *LRU) set(key string, value interface{}) {
+	expires := time.Now().Add(c.ttl)
+	if el, ok := c.items[key]; ok {
+		entry := el.Value.(*lruEntry)
+		entry.value = value
+		entry.expires = expires
+		c.order.MoveToFront(el)
+		return
+	}
+
+	c.items[key] = c.order.PushFront(&lruEntry{key: key, value: value, expires: expires})
+	for c.order.Len() > c.size {
+		c.remove(c.order.Back())
+	}
+}
+
+// Delete removes a value from the cache.
+func (c *LRU) Delete(key string) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.gen++
+
+	if el, ok := c.items[key]; ok {
+		c.remove(el)
+	}
+}
+
+// DeleteFunc removes every entry whose key matches.
+func (c *LRU) DeleteFunc(match func(key string) bool) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.gen++
+
+	for key, el := range c.items {
+		if match(key) {
+			c.remove(el)
+		}
+	}
+}
+
+// Clear removes all entries.
+func (c *LRU) Clear() {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	c.gen++
+
+	c.items = make(map[string]*list.Element)
+	c.order.Init()
+}
+
+// Len returns the number of cached entries, including expired ones not yet evicted.
+func (c *LRU) Len() int {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	return c.order.Len()
+}
+
+// remove unlinks an element. Caller must hold c.mu.
+func (c *LRU) remove(el *list.Element) {
+	c.order.Remove(el)
+	delete(c.items, el.Value.(*lruEntry).key)
+}
@@ -0,0 +1,78 @@
+package memory
+
+import (
+	"testing"
+	"time"
+)
+
+func TestLRUEvictsLeastRecentlyUsed(t *testing.T) {
+	c := NewLRU(2, time.Hour)
+	c.Set("a", 1)
+	c.Set("b", 2)
+	c.Get("a") // a is now most recently used
+	c.Set("c", 3)
+
+	if _, ok := c.Get("b"); ok {
+		t.Error("b was not evicted")
+	}
+	for _, key := range []string{"a", "c"} {
+		if _, ok := c.Get(key); !ok {
+			t.Errorf("%s was evicted", key)
+		}
+	}
+	if c.Len() != 2 {
+		t.Errorf("Len() = %d, want 2", c.Len())
+	}
+
+	// Overwriting an entry does not grow the cache
+	c.Set("a", 10)
+	if v, _ := c.Get("a"); v != 10 || c.Len() != 2 {
+		t.Errorf("after overwrite: a = %v, Len() = %d", v, c.Len())
+	}
+}
+
+func TestLRUExpiresEntries(t *testing.T) {
+	c := NewLRU(10, 20*time.Millisecond)
+	c.Set("a", 1)
+	if _, ok := c.Get("a"); !ok {
+		t.Fatal("fresh entry missing")
+	}
+	time.Sleep(40 * time.Millisecond)
+	if _, ok := c.Get("a"); ok {
+		t.Error("expired entry returned")
+	}
+	if c.Len() != 0 {
+		t.Errorf("Len() = %d after expiry, want 0", c.Len())
+	}
+}
+
+func TestLRUSetIfRejectsAfterInvalidation(t *testing.T) {
+	c := NewLRU(10, time.Hour)
+
+	gen := c.Generation()
+	if !c.SetIf("a", 1, gen) {
+		t.Fatal("SetIf with the current generation was rejected")
+	}
+
+	for name, invalidate := range map[string]func(){
+		"Delete":     func() { c.Delete("other") },
+		"DeleteFunc": func() { c.DeleteFunc(func(string) bool { return false }) },
+		"Clear":      func() { c.Clear() },
+	} {
+		gen := c.Generation()
+		invalidate()
+		if c.SetIf("stale", 1, gen) {
+			t.Errorf("SetIf accepted a value loaded before %s", name)
+		}
+		if _, ok := c.Get("stale"); ok {
+			t.Errorf("stale value cached after %s", name)
+		}
+	}
+
+	// Plain writes do not invalidate in-flight loads
+	gen = c.Generation()
+	c.Set("b", 2)
+	if !c.SetIf("c", 3, gen) {
+		t.Error("SetIf rejected after an unrelated Set")
+	}
+}
@@ -46,14 +46,9 @@ func (m *ObservationManager) Record(ctx context.Context, sessionID string, obsTy
 		opt(obs)
 	}
 
-	// Use batch queue for lower importance observations
-	if obs.Importance < 4 {
-		m.store.QueueObservation(*obs)
-		return obs, nil
-	}
-
-	// Write high importance observations immediately
-	if err := m.db.CreateObservation(ctx, obs); err != nil {
+	// Written through the batch queue: concurrent records share one
+	// transaction, and the caller still gets the stored id or the row's error
+	if err := m.store.WriteObservation(ctx, obs); err != nil {
 		return nil, err
 	}
 
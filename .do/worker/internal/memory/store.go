@@ -3,7 +3,12 @@ package memory
 
 import (
 	"context"
+	"errors"
+	"fmt"
+	"log"
+	"strings"
 	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/do-focus/worker/internal/db"
@@ -13,26 +18,153 @@ import (
 // Store manages in-memory caching and batch operations.
 type Store struct {
 	db    db.Adapter
-	cache *sync.Map
+	cache *LRU
+	cfg   StoreConfig
+
+	// Cache statistics
+	cacheStats sync.Map // CacheKey -> *cacheCounters
 
 	// Batch queue for observations
 	obsBatch    []models.Observation
+	obsWaiters  []chan<- flushResult // parallel to obsBatch, nil where nobody waits
 	obsMu       sync.Mutex
+	flushMu     sync.Mutex    // serializes flushes
+	slots       chan struct{} // one slot per queued observation (backpressure)
+	flushNow    chan struct{}
 	batchTicker *time.Ticker
 	done        chan struct{}
 }
 
+// StoreConfig configures the observation batch queue and cache.
+type StoreConfig struct {
+	BatchSize     int           // queued observations that trigger an immediate flush
+	FlushInterval time.Duration // periodic flush interval
+	MaxQueue      int           // queued observations before writers block
+	MaxRetries    int           // retries for a failed batch write
+	CacheSize     int           // maximum cached entries (LRU eviction)
+	CacheTTL      time.Duration // cached entry lifetime, 0 for no expiry
+
+	// OnFlush is called with the rows written by a flush, with IDs set where
+	// the adapter reports them.
+	OnFlush func(written []models.Observation)
+
+	// OnFlushError is called with the rows that could not be written after all
+	// retries and a row-by-row fallback. Defaults to logging the failure.
+	OnFlushError func(failed []models.Observation, err error)
+}
+
+// flushResult is the outcome of writing one observation a caller waits on.
+type flushResult struct {
+	obs models.Observation
+	err error
+}
+
+// DefaultStoreConfig returns the default batch queue configuration.
+func DefaultStoreConfig() StoreConfig {
+	return StoreConfig{
+		BatchSize:     50,
+		FlushInterval: 5 * time.Second,
+		MaxQueue:      1000,
+		MaxRetries:    3,
+		CacheSize:     512,
+		CacheTTL:      5 * time.Minute,
+	}
+}
+
+// StoreOption configures a Store.
+type StoreOption func(*StoreConfig)
+
+// WithBatchSize sets the queue length that triggers an immediate flush.
+func WithBatchSize(n int) StoreOption {
+	return func(c *StoreConfig) {
+		if n > 0 {
+			c.BatchSize = n
+		}
+	}
+}
+
+// WithFlushInterval sets the periodic flush interval.
+func WithFlushInterval(d time.Duration) StoreOption {
+	return func(c *StoreConfig) {
+		if d > 0 {
+			c.FlushInterval = d
+		}
+	}
+}
+
+// WithMaxQueue sets the queue capacity before producers are blocked.
+func WithMaxQueue(n int) StoreOption {
+	return func(c *StoreConfig) {
+		if n > 0 {
+			c.MaxQueue = n
+		}
+	}
+}
+
+// WithMaxRetries sets how many times a failed batch write is retried.
+func WithMaxRetries(n int) StoreOption {
+	return func(c *StoreConfig) {
+		if n >= 0 {
+			c.MaxRetries = n
+		}
+	}
+}
+
+// WithCacheSize sets the maximum number of cached entries.
+func WithCacheSize(n int) StoreOption {
+	return func(c *StoreConfig) {
+		if n > 0 {
+			c.CacheSize = n
+		}
+	}
+}
+
+// WithCacheTTL sets how long cached entries live.
+func WithCacheTTL(d time.Duration) StoreOption {
+	return func(c *StoreConfig) {
+		if d > 0 {
+			c.CacheTTL = d
+		}
+	}
+}
+
+// WithFlushHandler sets the handler for rows written by a flush.
+func WithFlushHandler(fn func(written []models.Observation)) StoreOption {
+	return func(c *StoreConfig) {
+		c.OnFlush = fn
+	}
+}
+
+// WithFlushErrorHandler sets the handler for rows that could not be written.
+func WithFlushErrorHandler(fn func(failed []models.Observation, err error)) StoreOption {
+	return func(c *StoreConfig) {
+		c.OnFlushError = fn
+	}
+}
+
 // NewStore creates a new memory store.
-func NewStore(adapter db.Adapter) *Store {
+func NewStore(adapter db.Adapter, opts ...StoreOption) *Store {
+	cfg := DefaultStoreConfig()
+	for _, opt := range opts {
+		opt(&cfg)
+	}
+	if cfg.MaxQueue < cfg.BatchSize {
+		cfg.MaxQueue = cfg.BatchSize
+	}
+
 	s := &Store{
-		db:       adapter,
-		cache:    &sync.Map{},
-		obsBatch: make([]models.Observation, 0, 100),
-		done:     make(chan struct{}),
+		db:         adapter,
+		cache:      NewLRU(cfg.CacheSize, cfg.CacheTTL),
+		cfg:        cfg,
+		obsBatch:   make([]models.Observation, 0, cfg.BatchSize),
+		obsWaiters: make([]chan<- flushResult, 0, cfg.BatchSize),
+		slots:      make(chan struct{}, cfg.MaxQueue),
+		flushNow:   make(chan struct{}, 1),
+		done:       make(chan struct{}),
 	}
 
 	// Start batch flusher
-	s.batchTicker = time.NewTicker(5 * time.Second)
+	s.batchTicker = time.NewTicker(cfg.FlushInterval)
 	go s.batchFlusher()
 
 	return s
@@ -45,12 +177,19 @@ func (s *Store) Close() error {
 	return s.flushObservations()
 }
 
+// Flush writes all queued observations now.
+func (s *Store) Flush() error {
+	return s.flushObservations()
+}
+
 // batchFlusher periodically flushes batched observations.
 func (s *Store) batchFlusher() {
 	for {
 		select {
 		case <-s.batchTicker.C:
 			_ = s.flushObservations()
+		case <-s.flushNow:
+			_ = s.flushObservations()
 		case <-s.done:
 			return
 		}
@@ -58,41 +197,170 @@ func (s *Store) batchFlusher() {
 }
 
 // QueueObservation adds an observation to the batch queue.
-func (s *Store) QueueObservation(obs models.Observation) {
+// When the queue is full it blocks until a flush frees space or ctx is done.
+func (s *Store) QueueObservation(ctx context.Context, obs models.Observation) error {
+	full, err := s.enqueue(ctx, obs, nil)
+	if err != nil {
+		return err
+	}
+
+	// Flush immediately if batch is large enough
+	if full {
+		s.requestFlush()
+	}
+	return nil
+}
+
+// WriteObservation queues obs and waits until the batch containing it is
+// written, then sets its ID. It requests a flush rather than waiting for the
+// interval, so concurrent writers share one transaction. The error is that of
+// obs's own row. If ctx is done first the row may still be written.
+func (s *Store) WriteObservation(ctx context.Context, obs *models.Observation) error {
+	done := make(chan flushResult, 1)
+	if _, err := s.enqueue(ctx, *obs, done); err != nil {
+		return err
+	}
+	s.requestFlush()
+
+	select {
+	case result := <-done:
+		if result.err != nil {
+			return result.err
+		}
+		*obs = result.obs
+		return nil
+	case <-ctx.Done():
+		return ctx.Err()
+	}
+}
+
+// enqueue appends obs to the batch once a queue slot is free and reports
+// whether the batch has reached BatchSize. done, if not nil, receives the
+// row's outcome.
+func (s *Store) enqueue(ctx context.Context, obs models.Observation, done chan<- flushResult) (bool, error) {
+	select {
+	case s.slots <- struct{}{}:
+	case <-ctx.Done():
+		return false, fmt.Errorf("observation queue full: %w", ctx.Err())
+	}
+
+	if obs.CreatedAt.IsZero() {
+		obs.CreatedAt = time.Now()
+	}
+
 	s.obsMu.Lock()
 	defer s.obsMu.Unlock()
-
 	s.obsBatch = append(s.obsBatch, obs)
+	s.obsWaiters = append(s.obsWaiters, done)
+	return len(s.obsBatch) >= s.cfg.BatchSize, nil
+}
 
-	// Flush immediately if batch is large enough
-	if len(s.obsBatch) >= 50 {
-		go func() {
-			_ = s.flushObservations()
-		}()
+// requestFlush wakes the batch flusher without blocking.
+func (s *Store) requestFlush() {
+	select {
+	case s.flushNow <- struct{}{}:
+	default:
 	}
 }
 
-// flushObservations writes all queued observations to the database.
+// Pending returns the number of queued observations not yet written.
+func (s *Store) Pending() int {
+	return len(s.slots)
+}
+
+// flushObservations writes all queued observations to the database in one batch.
+// A batch that still fails after retries is written row by row, so one bad row
+// does not discard the rest; only rows that fail on their own are reported.
 func (s *Store) flushObservations() error {
+	s.flushMu.Lock()
+	defer s.flushMu.Unlock()
+
 	s.obsMu.Lock()
 	if len(s.obsBatch) == 0 {
 		s.obsMu.Unlock()
 		return nil
 	}
 
-	batch := s.obsBatch
-	s.obsBatch = make([]models.Observation, 0, 100)
+	batch, waiters := s.obsBatch, s.obsWaiters
+	s.obsBatch = make([]models.Observation, 0, s.cfg.BatchSize)
+	s.obsWaiters = make([]chan<- flushResult, 0, s.cfg.BatchSize)
 	s.obsMu.Unlock()
 
+	// Free queue slots once the batch is written or reported
+	defer func() {
+		for range batch {
+			<-s.slots
+		}
+	}()
+
 	ctx := context.Background()
+	var err error
+	for attempt := 0; attempt <= s.cfg.MaxRetries; attempt++ {
+		if attempt > 0 {
+			time.Sleep(time.Duration(1<<(attempt-1)) * 100 * time.Millisecond)
+		}
+		if err = s.db.CreateObservationsBatch(ctx, batch); err == nil {
+			s.flushed(batch)
+			notify(batch, waiters, nil)
+			return nil
+		}
+	}
+
+	rowErrs := s.writeRows(ctx, batch)
+	var written, failed []models.Observation
+	for i, rowErr := range rowErrs {
+		if rowErr != nil {
+			failed = append(failed, batch[i])
+		} else {
+			written = append(written, batch[i])
+		}
+	}
+	s.flushed(written)
+	notify(batch, waiters, rowErrs)
+	if len(failed) == 0 {
+		return nil
+	}
+
+	err = fmt.Errorf("batch: %w; rows: %w", err, errors.Join(rowErrs...))
+	if s.cfg.OnFlushError != nil {
+		s.cfg.OnFlushError(failed, err)
+	} else {
+		log.Printf("Failed to write %d of %d observations after %d retries: %v", len(failed), len(batch), s.cfg.MaxRetries, err)
+	}
+	return fmt.Errorf("failed to flush %d observations: %w", len(failed), err)
+}
+
+// writeRows writes a failed batch one row at a time and returns each row's
+// error, nil for the rows that were written.
+func (s *Store) writeRows(ctx context.Context, batch []models.Observation) []error {
+	errs := make([]error, len(batch))
 	for i := range batch {
-		if err := s.db.CreateObservation(ctx, &batch[i]); err != nil {
-			// Log error but continue with other observations
+		batch[i].ID = 0 // drop ids assigned by the rolled-back batch
+		errs[i] = s.db.CreateObservationsBatch(ctx, batch[i:i+1])
+	}
+	return errs
+}
+
+// notify sends each waiting writer its row as written and the row's error.
+// rowErrs is nil when the whole batch was written.
+func notify(batch []models.Observation, waiters []chan<- flushResult, rowErrs []error) {
+	for i, done := range waiters {
+		if done == nil {
 			continue
 		}
+		result := flushResult{obs: batch[i]}
+		if rowErrs != nil {
+			result.err = rowErrs[i]
+		}
+		done <- result
 	}
+}
 
-	return nil
+// flushed reports written rows to the flush handler.
+func (s *Store) flushed(written []models.Observation) {
+	if len(written) > 0 && s.cfg.OnFlush != nil {
+		s.cfg.OnFlush(written)
+	}
 }
 
 // CacheKey represents a cache key type.
@@ -101,16 +369,50 @@ type CacheKey string
 const (
 	CacheKeySession CacheKey = "session"
 	CacheKeyPlan    CacheKey = "plan"
+	CacheKeyContext CacheKey = "context"
 )
 
+// cacheCounters tracks hits and misses for one cache key type.
+type cacheCounters struct {
+	hits   atomic.Uint64
+	misses atomic.Uint64
+}
+
+// counters returns the statistics counters for a cache key type.
+func (s *Store) counters(key CacheKey) *cacheCounters {
+	if c, ok := s.cacheStats.Load(key); ok {
+		return c.(*cacheCounters)
+	}
+	c, _ := s.cacheStats.LoadOrStore(key, &cacheCounters{})
+	return c.(*cacheCounters)
+}
+
 // SetCache stores a value in the cache.
 func (s *Store) SetCache(key CacheKey, id string, value interface{}) {
-	s.cache.Store(string(key)+":"+id, value)
+	s.cache.Set(string(key)+":"+id, value)
+}
+
+// CacheGeneration returns the current invalidation generation.
+// Read it before loading data and pass it to SetCacheIfCurrent.
+func (s *Store) CacheGeneration() uint64 {
+	return s.cache.Generation()
+}
+
+// SetCacheIfCurrent stores a value only if no invalidation happened since gen was read,
+// so a response built concurrently with a write is never cached stale.
+func (s *Store) SetCacheIfCurrent(key CacheKey, id string, value interface{}, gen uint64) bool {
+	return s.cache.SetIf(string(key)+":"+id, value, gen)
 }
 
 // GetCache retrieves a value from the cache.
 func (s *Store) GetCache(key CacheKey, id string) (interface{}, bool) {
-	return s.cache.Load(string(key) + ":" + id)
+	value, ok := s.cache.Get(string(key) + ":" + id)
+	if ok {
+		s.counters(key).hits.Add(1)
+	} else {
+		s.counters(key).misses.Add(1)
+	}
+	return value, ok
 }
 
 // DeleteCache removes a value from the cache.
@@ -118,10 +420,34 @@ func (s *Store) DeleteCache(key CacheKey, id string) {
 	s.cache.Delete(string(key) + ":" + id)
 }
 
+// DeleteCacheFunc removes all values of a key type whose id matches.
+func (s *Store) DeleteCacheFunc(key CacheKey, match func(id string) bool) {
+	prefix := string(key) + ":"
+	s.cache.DeleteFunc(func(k string) bool {
+		return strings.HasPrefix(k, prefix) && match(strings.TrimPrefix(k, prefix))
+	})
+}
+
 // ClearCache removes all cached values.
 func (s *Store) ClearCache() {
-	s.cache.Range(func(key, value interface{}) bool {
-		s.cache.Delete(key)
+	s.cache.Clear()
+}
+
+// CacheStats returns hit/miss counters per cache key type.
+func (s *Store) CacheStats() map[string]models.CacheStats {
+	stats := make(map[string]models.CacheStats)
+	s.cacheStats.Range(func(key, value interface{}) bool {
+		c := value.(*cacheCounters)
+		stats[string(key.(CacheKey))] = models.CacheStats{
+			Hits:   c.hits.Load(),
+			Misses: c.misses.Load(),
+		}
 		return true
 	})
+	return stats
+}
+
+// CacheLen returns the number of cached entries.
+func (s *Store) CacheLen() int {
+	return s.cache.Len()
 }
@@ -0,0 +1,211 @@
+package memory
+
+import (
+	"context"
+	"errors"
+	"path/filepath"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// newTestAdapter opens a SQLite adapter on a fresh file with one session.
+func newTestAdapter(t *testing.T) db.Adapter {
+	t.Helper()
+	adapter, err := db.New(db.Config{Type: "sqlite", Path: filepath.Join(t.TempDir(), "memory.db")})
+	if err != nil {
+		t.Fatal(err)
+	}
+	t.Cleanup(func() { adapter.Close() })
+	session := &models.Session{ID: "s1", UserName: "alice", StartedAt: time.Now()}
+	if err := adapter.CreateSession(context.Background(), session); err != nil {
+		t.Fatal(err)
+	}
+	return adapter
+}
+
+// rejectingAdapter fails any batch containing an observation with bad content,
+// like a constraint violation on one row of a multi-row INSERT.
+type rejectingAdapter struct {
+	db.Adapter
+	bad string
+
+	mu      sync.Mutex
+	batches int
+}
+
+func (a *rejectingAdapter) CreateObservationsBatch(ctx context.Context, observations []models.Observation) error {
+	a.mu.Lock()
+	a.batches++
+	a.mu.Unlock()
+	for _, obs := range observations {
+		if obs.Content == a.bad {
+			return errors.New("constraint violation")
+		}
+	}
+	return a.Adapter.CreateObservationsBatch(ctx, observations)
+}
+
+func TestFlushFallsBackToRowsAndReportsOnlyFailedRows(t *testing.T) {
+	adapter := &rejectingAdapter{Adapter: newTestAdapter(t), bad: "bad row"}
+
+	var written, failed []models.Observation
+	store := NewStore(adapter,
+		WithBatchSize(100),
+		WithFlushInterval(time.Hour),
+		WithMaxRetries(1),
+		WithFlushHandler(func(rows []models.Observation) { written = append(written, rows...) }),
+		WithFlushErrorHandler(func(rows []models.Observation, err error) { failed = append(failed, rows...) }),
+	)
+	defer store.Close()
+
+	ctx := context.Background()
+	for _, content := range []string{"first", "bad row", "second", "third"} {
+		if err := store.QueueObservation(ctx, models.Observation{SessionID: "s1", Type: "learning", Content: content, Importance: 2}); err != nil {
+			t.Fatal(err)
+		}
+	}
+	if err := store.Flush(); err == nil {
+		t.Fatal("Flush succeeded, want an error for the bad row")
+	}
+
+	if len(failed) != 1 || failed[0].Content != "bad row" {
+		t.Errorf("failed rows = %+v, want only the bad row", failed)
+	}
+	if len(written) != 3 {
+		t.Fatalf("written rows = %d, want 3", len(written))
+	}
+	for _, obs := range written {
+		if obs.ID == 0 {
+			t.Errorf("written row %q has no id", obs.Content)
+		}
+	}
+	// 2 batch attempts, then one write per row
+	if adapter.batches != 2+4 {
+		t.Errorf("adapter saw %d batch calls, want 6", adapter.batches)
+	}
+
+	stored, err := adapter.GetObservations(ctx, "s1")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(stored) != 3 {
+		t.Errorf("stored %d observations, want 3", len(stored))
+	}
+	if store.Pending() != 0 {
+		t.Errorf("Pending() = %d after flush, want 0", store.Pending())
+	}
+}
+
+// blockingAdapter holds batch writes until release is closed.
+type blockingAdapter struct {
+	db.Adapter
+	release chan struct{}
+}
+
+func (a *blockingAdapter) CreateObservationsBatch(ctx context.Context, observations []models.Observation) error {
+	<-a.release
+	return a.Adapter.CreateObservationsBatch(ctx, observations)
+}
+
+func TestQueueObservationBlocksWhenFull(t *testing.T) {
+	adapter := &blockingAdapter{Adapter: newTestAdapter(t), release: make(chan struct{})}
+	store := NewStore(adapter, WithBatchSize(2), WithMaxQueue(2), WithFlushInterval(time.Hour))
+	defer store.Close()
+
+	ctx := context.Background()
+	for i := 0; i < 2; i++ {
+		if err := store.QueueObservation(ctx, models.Observation{SessionID: "s1", Type: "learning", Content: "queued", Importance: 1}); err != nil {
+			t.Fatal(err)
+		}
+	}
+
+	timeout, cancel := context.WithTimeout(ctx, 50*time.Millisecond)
+	defer cancel()
+	if err := store.QueueObservation(timeout, models.Observation{SessionID: "s1", Type: "learning", Content: "overflow"}); !errors.Is(err, context.DeadlineExceeded) {
+		t.Fatalf("QueueObservation on a full queue = %v, want deadline exceeded", err)
+	}
+	if store.Pending() != 2 {
+		t.Errorf("Pending() = %d, want 2", store.Pending())
+	}
+
+	// Once the flush completes producers are admitted again
+	close(adapter.release)
+	unblocked, cancel2 := context.WithTimeout(ctx, 5*time.Second)
+	defer cancel2()
+	if err := store.QueueObservation(unblocked, models.Observation{SessionID: "s1", Type: "learning", Content: "after flush"}); err != nil {
+		t.Fatalf("QueueObservation after flush: %v", err)
+	}
+}
+
+func TestWriteObservationSharesBatchAndReturnsRowResult(t *testing.T) {
+	release := make(chan struct{})
+	adapter := &rejectingAdapter{Adapter: &blockingAdapter{Adapter: newTestAdapter(t), release: release}, bad: "bad row"}
+
+	var mu sync.Mutex
+	var flushes []int
+	store := NewStore(adapter,
+		WithFlushInterval(time.Hour),
+		WithMaxRetries(0),
+		WithFlushHandler(func(rows []models.Observation) {
+			mu.Lock()
+			flushes = append(flushes, len(rows))
+			mu.Unlock()
+		}),
+		WithFlushErrorHandler(func([]models.Observation, error) {}),
+	)
+	defer store.Close()
+
+	type result struct {
+		obs models.Observation
+		err error
+	}
+	results := make(map[string]chan result)
+	write := func(content string) {
+		done := make(chan result, 1)
+		results[content] = done
+		go func() {
+			obs := models.Observation{SessionID: "s1", Type: "learning", Content: content, Importance: 2}
+			err := store.WriteObservation(context.Background(), &obs)
+			done <- result{obs, err}
+		}()
+	}
+
+	// The first write holds the flusher; the rest queue up behind it
+	write("first")
+	for store.Pending() != 1 {
+		time.Sleep(time.Millisecond)
+	}
+	for _, content := range []string{"second", "bad row", "third"} {
+		write(content)
+	}
+	for store.Pending() != 4 {
+		time.Sleep(time.Millisecond)
+	}
+	close(release)
+
+	ids := make(map[int64]bool)
+	for content, done := range results {
+		r := <-done
+		if content == "bad row" {
+			if r.err == nil {
+				t.Errorf("bad row: no error")
+			}
+			continue
+		}
+		if r.err != nil || r.obs.ID == 0 || ids[r.obs.ID] {
+			t.Errorf("%s: id %d, err %v; want a new id", content, r.obs.ID, r.err)
+		}
+		ids[r.obs.ID] = true
+	}
+
+	// One flush for the first row, one shared by the three queued behind it
+	mu.Lock()
+	defer mu.Unlock()
+	if len(flushes) != 2 || flushes[0] != 1 || flushes[1] != 2 {
+		t.Errorf("flushes wrote %v rows, want [1 2]", flushes)
+	}
+}
@@ -0,0 +1,272 @@
+// Package metrics collects worker latencies, counters and gauges and exposes
+// them in the Prometheus text exposition format.
+package metrics
+
+import (
+	"fmt"
+	"io"
+	"math"
+	"sort"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
+	"time"
+)
+
+// DefaultBuckets are latency histogram upper bounds in seconds.
+var DefaultBuckets = []float64{0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10}
+
+// collector writes one metric family.
+type collector interface {
+	write(w io.Writer)
+}
+
+// Registry holds the metric families served by /metrics.
+type Registry struct {
+	mu         sync.Mutex
+	collectors []collector
+}
+
+// NewRegistry creates an empty registry.
+func NewRegistry() *Registry {
+	return &Registry{}
+}
+
+// Write writes every registered family in the Prometheus text format.
+func (r *Registry) Write(w io.Writer) {
+	r.mu.Lock()
+	collectors := append([]collector(nil), r.collectors...)
+	r.mu.Unlock()
+
+	for _, c := range collectors {
+		c.write(w)
+	}
+}
+
+func (r *Registry) register(c collector) {
+	r.mu.Lock()
+	defer r.mu.Unlock()
+	r.collectors = append(r.collectors, c)
+}
+
+// histogram is a fixed-bucket latency histogram safe for concurrent use.
+type histogram struct {
+	buckets []float64
+	counts  []atomic.Uint64 // per bucket, plus +Inf
+	count   atomic.Uint64
+	sumNs   atomic.Uint64
+}
+
+func newHistogram(buckets []float64) *histogram {
+	return &histogram{
+		buckets: buckets,
+		counts:  make([]atomic.Uint64, len(buckets)+1),
+	}
+}
+
+func (h *histogram) observe(d time.Duration) {
+	seconds := d.Seconds()
+	i := sort.SearchFloat64s(h.buckets, seconds)
+	h.counts[i].Add(1)
+	h.count.Add(1)
+	h.sumNs.Add(uint64(d))
+}
+
+// HistogramVec is a family of latency histograms partitioned by label values.
+type HistogramVec struct {
+	name    string
+	help    string
+	labels  []string
+	buckets []float64
+
+	mu     sync.RWMutex
+	series map[string]*labeledHistogram
+}
+
+type labeledHistogram struct {
+	values []string
+	*histogram
+}
+
+// NewHistogramVec registers a histogram family with the given label names.
+func (r *Registry) NewHistogramVec(name, help string, labels ...string) *HistogramVec {
+	v := &HistogramVec{
+		name:    name,
+		help:    help,
+		labels:  labels,
+		buckets: DefaultBuckets,
+		series:  make(map[string]*labeledHistogram),
+	}
+	r.register(v)
+	return v
+}
+
+// Observe records a duration for the given label values.
+func (v *HistogramVec) Observe(d time.Duration, values ...string) {
+	key := strings.Join(values, "\xff")
+
+	v.mu.RLock()
+	h, ok := v.series[key]
+	v.mu.RUnlock()
+	if !ok {
+		v.mu.Lock()
+		if h, ok = v.series[key]; !ok {
+			h = &labeledHistogram{values: values, histogram: newHistogram(v.buckets)}
+			v.series[key] = h
+		}
+		v.mu.Unlock()
+	}
+	h.observe(d)
+}
+
+func (v *HistogramVec) write(w io.Writer) {
+	fmt.Fprintf(w, "# HELP %s %s\n# TYPE %s histogram\n", v.name, v.help, v.name)
+	for _, h := range v.sorted() {
+		labels := formatLabels(v.labels, h.values)
+		var cumulative uint64
+		for i, bound := range h.buckets {
+			cumulative += h.counts[i].Load()
+			fmt.Fprintf(w, "%s_bucket%s %d\n", v.name, withLabel(labels, "le", formatFloat(bound)), cumulative)
+		}
+		cumulative += h.counts[len(h.buckets)].Load()
+		fmt.Fprintf(w, "%s_bucket%s %d\n", v.name, withLabel(labels, "le", "+Inf"), cumulative)
+		fmt.Fprintf(w, "%s_sum%s %s\n", v.name, labels, formatFloat(time.Duration(h.sumNs.Load()).Seconds()))
+		fmt.Fprintf(w, "%s_count%s %d\n", v.name, labels, h.count.Load())
+	}
+}
+
+func (v *HistogramVec) sorted() []*labeledHistogram {
+	v.mu.RLock()
+	defer v.mu.RUnlock()
+	keys := make([]string, 0, len(v.series))
+	for key := range v.series {
+		keys = append(keys, key)
+	}
+	sort.Strings(keys)
+	series := make([]*labeledHistogram, len(keys))
+	for i, key := range keys {
+		series[i] = v.series[key]
+	}
+	return series
+}
+
+// CounterVec is a family of monotonically increasing counters partitioned by label values.
+type CounterVec struct {
+	name   string
+	help   string
+	labels []string
+	values sync.Map // joined label values -> *labeledCounter
+}
+
+type labeledCounter struct {
+	values []string
+	n      atomic.Uint64
+}
+
+// NewCounterVec registers a counter family with the given label names.
+func (r *Registry) NewCounterVec(name, help string, labels ...string) *CounterVec {
+	v := &CounterVec{name: name, help: help, labels: labels}
+	r.register(v)
+	return v
+}
+
+// Inc increments the counter for the given label values.
+func (v *CounterVec) Inc(values ...string) {
+	key := strings.Join(values, "\xff")
+	c, ok := v.values.Load(key)
+	if !ok {
+		c, _ = v.values.LoadOrStore(key, &labeledCounter{values: values})
+	}
+	c.(*labeledCounter).n.Add(1)
+}
+
+func (v *CounterVec) write(w io.Writer) {
+	fmt.Fprintf(w, "# HELP %s %s\n# TYPE %s counter\n", v.name, v.help, v.name)
+	var keys []string
+	v.values.Range(func(key, _ any) bool {
+		keys = append(keys, key.(string))
+		return true
+	})
+	sort.Strings(keys)
+	for _, key := range keys {
+		c, _ := v.values.Load(key)
+		counter := c.(*labeledCounter)
+		fmt.Fprintf(w, "%s%s %d\n", v.name, formatLabels(v.labels, counter.values), counter.n.Load())
+	}
+}
+
+// funcFamily is a gauge or counter whose values are read at scrape time.
+type funcFamily struct {
+	name  string
+	help  string
+	kind  string // gauge or counter
+	label string
+	fn    func() map[string]float64
+}
+
+// GaugeFunc registers a gauge read from fn on every scrape.
+func (r *Registry) GaugeFunc(name, help string, fn func() float64) {
+	r.register(&funcFamily{name: name, help: help, kind: "gauge", fn: func() map[string]float64 {
+		return map[string]float64{"": fn()}
+	}})
+}
+
+// GaugeVecFunc registers a gauge family with one label whose values are read from fn.
+func (r *Registry) GaugeVecFunc(name, help, label string, fn func() map[string]float64) {
+	r.register(&funcFamily{name: name, help: help, kind: "gauge", label: label, fn: fn})
+}
+
+// CounterVecFunc registers a counter family with one label whose totals are read from fn.
+func (r *Registry) CounterVecFunc(name, help, label string, fn func() map[string]float64) {
+	r.register(&funcFamily{name: name, help: help, kind: "counter", label: label, fn: fn})
+}
+
+func (f *funcFamily) write(w io.Writer) {
+	fmt.Fprintf(w, "# HELP %s %s\n# TYPE %s %s\n", f.name, f.help, f.name, f.kind)
+	values := f.fn()
+	keys := make([]string, 0, len(values))
+	for key := range values {
+		keys = append(keys, key)
+	}
+	sort.Strings(keys)
+	for _, key := range keys {
+		labels := ""
+		if f.label != "" {
+			labels = formatLabels([]string{f.label}, []string{key})
+		}
+		fmt.Fprintf(w, "%s%s %s\n", f.name, labels, formatFloat(values[key]))
+	}
+}
+
+// formatLabels renders {name="value",...}, or nothing without labels.
+func formatLabels(names, values []string) string {
+	if len(names) == 0 {
+		return ""
+	}
+	parts := make([]string, len(names))
+	for i, name := range names {
+		value := ""
+		if i < len(values) {
+			value = values[i]
+		}
+		parts[i] = name + "=" + strconv.Quote(value)
+	}
+	return "{" + strings.Join(parts, ",") + "}"
+}
+
+// withLabel appends one label to a rendered label set.
+func withLabel(labels, name, value string) string {
+	label := name + "=" + strconv.Quote(value)
+	if labels == "" {
+		return "{" + label + "}"
+	}
+	return labels[:len(labels)-1] + "," + label + "}"
+}
+
+func formatFloat(f float64) string {
+	if math.IsInf(f, 1) {
+		return "+Inf"
+	}
+	return strconv.FormatFloat(f, 'g', -1, 64)
+}
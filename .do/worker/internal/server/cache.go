@@ -0,0 +1,93 @@
+package server
+
+import (
+	"context"
+	"crypto/sha256"
+	"encoding/hex"
+	"fmt"
+	"net/http"
+	"strings"
+
+	"github.com/do-focus/worker/internal/memory"
+	"github.com/do-focus/worker/pkg/models"
+	"github.com/gin-gonic/gin"
+)
+
+// cachedContext is a rendered /api/context/inject response body with its ETag.
+type cachedContext struct {
+	body []byte
+	etag string
+}
+
+// newCachedContext wraps a rendered response body and derives its ETag.
+func newCachedContext(body []byte) *cachedContext {
+	sum := sha256.Sum256(body)
+	return &cachedContext{
+		body: body,
+		etag: `"` + hex.EncodeToString(sum[:8]) + `"`,
+	}
+}
+
+// contextCacheID builds the cache id for a context-inject request.
+// The user name comes first so a user's entries can be invalidated by prefix.
+func contextCacheID(userName string, level int, obsLimit int) string {
+	return fmt.Sprintf("%s|%d|%d", userName, level, obsLimit)
+}
+
+// serveCachedContext writes a rendered context, answering 304 when the client's ETag matches.
+func serveCachedContext(c *gin.Context, entry *cachedContext, cacheStatus string) {
+	c.Header("ETag", entry.etag)
+	c.Header("Cache-Control", "no-cache")
+	c.Header("X-Cache", cacheStatus)
+
+	if etagMatches(c.GetHeader("If-None-Match"), entry.etag) {
+		c.Status(http.StatusNotModified)
+		return
+	}
+	c.Data(http.StatusOK, "application/json; charset=utf-8", entry.body)
+}
+
+// etagMatches reports whether an If-None-Match header matches etag.
+func etagMatches(header string, etag string) bool {
+	for _, candidate := range strings.Split(header, ",") {
+		candidate = strings.TrimPrefix(strings.TrimSpace(candidate), "W/")
+		if candidate == etag || candidate == "*" {
+			return true
+		}
+	}
+	return false
+}
+
+// invalidateUserContext drops cached context for a user. With team set, every
+// full-level entry is dropped too, since those embed other users' activity.
+func (s *Server) invalidateUserContext(userName string, team bool) {
+	prefix := userName + "|"
+	full := fmt.Sprintf("|%d|", models.LevelFull)
+	s.store.DeleteCacheFunc(memory.CacheKeyContext, func(id string) bool {
+		return strings.HasPrefix(id, prefix) || (team && strings.Contains(id, full))
+	})
+}
+
+// invalidateSessionContext invalidates cached context for the owner of a session.
+func (s *Server) invalidateSessionContext(ctx context.Context, sessionID string, team bool) {
+	if sessionID == "" {
+		return
+	}
+	if userName := s.sessionUser(ctx, sessionID); userName != "" {
+		s.invalidateUserContext(userName, team)
+	}
+}
+
+// sessionUser returns the user owning a session, using the session cache.
+func (s *Server) sessionUser(ctx context.Context, sessionID string) string {
+	if cached, ok := s.store.GetCache(memory.CacheKeySession, sessionID); ok {
+		return cached.(*models.Session).UserName
+	}
+
+	session, err := s.db.GetSession(ctx, sessionID)
+	if err != nil || session == nil {
+		return ""
+	}
+	s.store.SetCache(memory.CacheKeySession, sessionID, session)
+	return session.UserName
+}
@@ -0,0 +1,97 @@
+package server
+
+import (
+	"net/http"
+	"sort"
+	"testing"
+
+	"github.com/do-focus/worker/internal/memory"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+func TestInvalidateUserContext(t *testing.T) {
+	ids := []string{
+		contextCacheID("alice", int(models.LevelMinimal), 0),
+		contextCacheID("alice", int(models.LevelFull), 50),
+		contextCacheID("alice2", int(models.LevelStandard), 20),
+		contextCacheID("bob", int(models.LevelStandard), 20),
+		contextCacheID("bob", int(models.LevelFull), 50),
+	}
+	tests := []struct {
+		name string
+		team bool
+		want []string
+	}{
+		{"user", false, []string{"alice2|2|20", "bob|2|20", "bob|3|50"}},
+		{"team", true, []string{"alice2|2|20", "bob|2|20"}},
+	}
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			s := newTestServer(t)
+			for _, id := range ids {
+				s.store.SetCache(memory.CacheKeyContext, id, newCachedContext([]byte(id)))
+			}
+
+			s.invalidateUserContext("alice", tt.team)
+
+			var kept []string
+			for _, id := range ids {
+				if _, ok := s.store.GetCache(memory.CacheKeyContext, id); ok {
+					kept = append(kept, id)
+				}
+			}
+			sort.Strings(kept)
+			if len(kept) != len(tt.want) {
+				t.Fatalf("kept %v, want %v", kept, tt.want)
+			}
+			for i := range kept {
+				if kept[i] != tt.want[i] {
+					t.Fatalf("kept %v, want %v", kept, tt.want)
+				}
+			}
+		})
+	}
+}
+
+func TestContextInjectRevalidates(t *testing.T) {
+	s := newTestServer(t)
+	createSession(t, s, "s1", "alice")
+	const path = "/api/context/inject?user=alice"
+
+	w := request(t, s, http.MethodGet, path, nil)
+	etag := w.Header().Get("ETag")
+	if w.Code != http.StatusOK || etag == "" {
+		t.Fatalf("first request: status %d, ETag %q", w.Code, etag)
+	}
+	if got := w.Header().Get("X-Cache"); got != "MISS" {
+		t.Errorf("first request X-Cache = %q, want MISS", got)
+	}
+
+	w = request(t, s, http.MethodGet, path, nil, "If-None-Match", etag)
+	if w.Code != http.StatusNotModified {
+		t.Fatalf("matching If-None-Match: status %d, want 304", w.Code)
+	}
+	if w.Body.Len() != 0 {
+		t.Errorf("304 response has a body: %s", w.Body)
+	}
+
+	w = request(t, s, http.MethodGet, path, nil, "If-None-Match", `"stale"`)
+	if w.Code != http.StatusOK || w.Body.Len() == 0 {
+		t.Errorf("mismatched If-None-Match: status %d, body %d bytes", w.Code, w.Body.Len())
+	}
+
+	// A write for the user changes the rendered context and its ETag
+	w = request(t, s, http.MethodPost, "/api/observations", models.CreateObservationRequest{
+		SessionID: "s1", Type: "decision", Content: "use ETags for context", Importance: 5,
+	})
+	if w.Code != http.StatusCreated {
+		t.Fatalf("create observation: %d %s", w.Code, w.Body)
+	}
+	w = request(t, s, http.MethodGet, path, nil, "If-None-Match", etag)
+	if w.Code != http.StatusOK {
+		t.Errorf("after invalidation: status %d, want 200", w.Code)
+	}
+	if w.Header().Get("ETag") == etag {
+		t.Error("ETag unchanged after the context changed")
+	}
+}
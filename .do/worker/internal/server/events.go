@@ -0,0 +1,103 @@
+package server
+
+import (
+	"fmt"
+	"net/http"
+	"strconv"
+	"time"
+
+	"github.com/do-focus/worker/internal/events"
+	"github.com/do-focus/worker/pkg/models"
+	"github.com/gin-gonic/gin"
+)
+
+// sseHeartbeat is how often an idle event stream sends a comment line, keeping
+// proxies from closing it and detecting disconnected clients.
+const sseHeartbeat = 15 * time.Second
+
+// sseRetryMillis is the reconnect delay suggested to EventSource clients.
+const sseRetryMillis = 3000
+
+// handleEvents streams change events as server-sent events.
+//
+// Clients resume with the Last-Event-ID header (sent automatically by
+// EventSource on reconnect) or the last_event_id query parameter. When the
+// missed events are no longer available a "reset" event tells the client to
+// reload its lists.
+func (s *Server) handleEvents(c *gin.Context) {
+	lastEventID := c.GetHeader("Last-Event-ID")
+	if lastEventID == "" {
+		lastEventID = c.Query("last_event_id")
+	}
+
+	var sub *events.Subscription
+	var missed []events.Event
+	reset := false
+	if lastEventID == "" {
+		sub = s.events.Subscribe()
+	} else {
+		lastID, err := strconv.ParseUint(lastEventID, 10, 64)
+		var ok bool
+		sub, missed, ok = s.events.Resume(lastID)
+		reset = err != nil || !ok
+	}
+	defer s.events.Unsubscribe(sub)
+
+	c.Header("Content-Type", "text/event-stream")
+	c.Header("Cache-Control", "no-cache")
+	c.Header("Connection", "keep-alive")
+	c.Header("X-Accel-Buffering", "no")
+	c.Status(http.StatusOK)
+
+	w := c.Writer
+	fmt.Fprintf(w, "retry: %d\n\n", sseRetryMillis)
+	if reset {
+		fmt.Fprint(w, "event: reset\ndata: {}\n\n")
+	}
+	for _, event := range missed {
+		writeEvent(w, event)
+	}
+	w.Flush()
+
+	heartbeat := time.NewTicker(sseHeartbeat)
+	defer heartbeat.Stop()
+
+	for {
+		select {
+		case event, ok := <-sub.C:
+			if !ok {
+				// Dropped as a slow consumer or shutting down; the client resumes
+				return
+			}
+			writeEvent(w, event)
+			// Write whatever else is already buffered before flushing
+			for n := len(sub.C); n > 0; n-- {
+				if event, ok = <-sub.C; !ok {
+					break
+				}
+				writeEvent(w, event)
+			}
+			w.Flush()
+		case <-heartbeat.C:
+			fmt.Fprint(w, ": ping\n\n")
+			w.Flush()
+		case <-c.Request.Context().Done():
+			return
+		}
+	}
+}
+
+// writeEvent writes one event in text/event-stream format. The payload is
+// compact JSON, so it never spans lines.
+func writeEvent(w gin.ResponseWriter, event events.Event) {
+	fmt.Fprintf(w, "id: %d\nevent: %s\ndata: %s\n\n", event.ID, event.Type, event.Data)
+}
+
+// summaryEvent returns the summary without its transcript fields, which can be
+// hundreds of kilobytes; clients load them with GET /api/summaries/:id.
+func summaryEvent(summary *models.Summary) models.Summary {
+	event := *summary
+	event.SourceMessage = ""
+	event.FullTranscript = ""
+	return event
+}
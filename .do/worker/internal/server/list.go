@@ -0,0 +1,118 @@
+package server
+
+import (
+	"encoding/json"
+	"net/http"
+	"strconv"
+	"strings"
+	"time"
+
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/pkg/models"
+	"github.com/gin-gonic/gin"
+)
+
+// nextCursorHeader carries the cursor of the next page in JSON list responses.
+const nextCursorHeader = "X-Next-Cursor"
+
+// ndjsonFlushRows is how many streamed rows are written between flushes.
+const ndjsonFlushRows = 100
+
+// pageFromQuery reads the limit and cursor query parameters of a list endpoint.
+// It writes a 400 response and returns false when the cursor is malformed or
+// the request still pages with offset, which would otherwise repeat the first
+// page forever. Streaming requests may pass limit=0 to read every remaining row.
+func pageFromQuery(c *gin.Context, defaultLimit int) (db.Page, bool) {
+	if _, ok := c.GetQuery("offset"); ok {
+		c.JSON(http.StatusBadRequest, models.ErrorResponse{
+			Error:   "invalid_request",
+			Message: "offset is no longer supported; pass the " + nextCursorHeader + " header of the previous page as cursor",
+		})
+		return db.Page{}, false
+	}
+
+	limit, err := strconv.Atoi(c.Query("limit"))
+	if err != nil || limit < 0 || (limit == 0 && !wantsNDJSON(c)) {
+		limit = defaultLimit
+	}
+
+	after, err := db.DecodeCursor(c.Query("cursor"))
+	if err != nil {
+		c.JSON(http.StatusBadRequest, models.ErrorResponse{
+			Error:   "invalid_request",
+			Message: err.Error(),
+		})
+		return db.Page{}, false
+	}
+	return db.Page{After: after, Limit: limit}, true
+}
+
+// wantsNDJSON reports whether the client asked for a newline-delimited JSON stream.
+func wantsNDJSON(c *gin.Context) bool {
+	return c.Query("format") == "ndjson" || strings.Contains(c.GetHeader("Accept"), "application/x-ndjson")
+}
+
+// serveList writes one page of a keyset-paginated list.
+//
+// JSON responses are a plain array with the next page's cursor in X-Next-Cursor.
+// NDJSON responses encode each row as it is read from the database; when more
+// rows remain, the last line is a models.StreamEnd carrying the next cursor.
+func serveList[T any](c *gin.Context, page db.Page, list func(fn func(*T) error) error, cursorOf func(*T) db.Cursor) {
+	if wantsNDJSON(c) {
+		streamList(c, page, list, cursorOf)
+		return
+	}
+
+	var items []T
+	if err := list(db.Collect(&items)); err != nil {
+		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+			Error:   "database_error",
+			Message: err.Error(),
+		})
+		return
+	}
+
+	if page.Limit > 0 && len(items) == page.Limit {
+		c.Header(nextCursorHeader, cursorOf(&items[len(items)-1]).Encode())
+	}
+	c.JSON(http.StatusOK, items)
+}
+
+// streamList writes rows as NDJSON straight from the database cursor.
+func streamList[T any](c *gin.Context, page db.Page, list func(fn func(*T) error) error, cursorOf func(*T) db.Cursor) {
+	c.Header("Content-Type", "application/x-ndjson")
+	c.Status(http.StatusOK)
+
+	enc := json.NewEncoder(c.Writer)
+	var last db.Cursor
+	rows := 0
+	err := list(func(row *T) error {
+		if err := enc.Encode(row); err != nil {
+			return err
+		}
+		last = cursorOf(row)
+		rows++
+		if rows%ndjsonFlushRows == 0 {
+			c.Writer.Flush()
+		}
+		return nil
+	})
+	if err != nil {
+		// Headers are already sent; report the failure in-band
+		_ = enc.Encode(models.ErrorResponse{
+			Error:   "database_error",
+			Message: err.Error(),
+		})
+		return
+	}
+
+	if page.Limit > 0 && rows == page.Limit {
+		_ = enc.Encode(models.StreamEnd{NextCursor: last.Encode()})
+	}
+	c.Writer.Flush()
+}
+
+// idCursor builds the cursor for a row with an integer id.
+func idCursor(createdAt time.Time, id int64) db.Cursor {
+	return db.Cursor{CreatedAt: createdAt, ID: strconv.FormatInt(id, 10)}
+}
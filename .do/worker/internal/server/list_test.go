@@ -0,0 +1,47 @@
+package server
+
+import (
+	"encoding/json"
+	"net/http"
+	"strings"
+	"testing"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+func TestListRejectsOffset(t *testing.T) {
+	s := newTestServer(t)
+	createSession(t, s, "s1", "alice")
+
+	for _, path := range []string{
+		"/api/sessions?offset=20",
+		"/api/observations?limit=50&offset=50",
+		"/api/summaries?offset=0",
+		"/api/prompts?offset=10",
+		"/api/plans?offset=",
+	} {
+		w := request(t, s, http.MethodGet, path, nil)
+		if w.Code != http.StatusBadRequest {
+			t.Errorf("GET %s: status %d, want 400", path, w.Code)
+			continue
+		}
+		var resp models.ErrorResponse
+		if err := json.Unmarshal(w.Body.Bytes(), &resp); err != nil {
+			t.Fatal(err)
+		}
+		if resp.Error != "invalid_request" || !strings.Contains(resp.Message, "cursor") || !strings.Contains(resp.Message, nextCursorHeader) {
+			t.Errorf("GET %s: %+v, want a pointer to cursor paging", path, resp)
+		}
+	}
+
+	// Cursor paging is unaffected
+	createSession(t, s, "s2", "alice")
+	w := request(t, s, http.MethodGet, "/api/sessions?limit=1", nil)
+	cursor := w.Header().Get(nextCursorHeader)
+	if w.Code != http.StatusOK || cursor == "" {
+		t.Fatalf("first page: status %d, cursor %q", w.Code, cursor)
+	}
+	if w := request(t, s, http.MethodGet, "/api/sessions?limit=1&cursor="+cursor, nil); w.Code != http.StatusOK {
+		t.Errorf("next page: status %d %s", w.Code, w.Body)
+	}
+}
@@ -0,0 +1,158 @@
+package server
+
+import (
+	"log"
+	"math/rand"
+	"net/http"
+	"net/http/pprof"
+	"runtime"
+	"strconv"
+	"time"
+
+	"github.com/do-focus/worker/internal/metrics"
+	"github.com/gin-gonic/gin"
+)
+
+// serverMetrics holds the instruments recorded by the server.
+type serverMetrics struct {
+	registry *metrics.Registry
+	http     *metrics.HistogramVec
+	db       *metrics.HistogramVec
+	dbErrors *metrics.CounterVec
+}
+
+// newServerMetrics registers the request and database instruments. Queue, cache
+// and stream gauges are added by registerGauges once those components exist.
+func newServerMetrics() *serverMetrics {
+	registry := metrics.NewRegistry()
+	return &serverMetrics{
+		registry: registry,
+		http: registry.NewHistogramVec("do_http_request_duration_seconds",
+			"HTTP request latency by route.", "method", "route", "status"),
+		db: registry.NewHistogramVec("do_db_query_duration_seconds",
+			"Database adapter call latency by method.", "method"),
+		dbErrors: registry.NewCounterVec("do_db_query_errors_total",
+			"Database adapter calls that returned an error.", "method"),
+	}
+}
+
+// observeDB records one database adapter call; it is the db.QueryObserver.
+func (m *serverMetrics) observeDB(method string, elapsed time.Duration, err error) {
+	m.db.Observe(elapsed, method)
+	if err != nil {
+		m.dbErrors.Inc(method)
+	}
+}
+
+// registerGauges adds the gauges read from server components at scrape time.
+func (s *Server) registerGauges() {
+	r := s.metrics.registry
+	r.GaugeFunc("do_observation_queue_depth", "Observations queued but not yet written.", func() float64 {
+		return float64(s.store.Pending())
+	})
+	r.CounterVecFunc("do_cache_hits_total", "Cache hits by cache.", "cache", func() map[string]float64 {
+		hits := make(map[string]float64)
+		for name, stats := range s.store.CacheStats() {
+			hits[name] = float64(stats.Hits)
+		}
+		return hits
+	})
+	r.CounterVecFunc("do_cache_misses_total", "Cache misses by cache.", "cache", func() map[string]float64 {
+		misses := make(map[string]float64)
+		for name, stats := range s.store.CacheStats() {
+			misses[name] = float64(stats.Misses)
+		}
+		return misses
+	})
+	r.GaugeVecFunc("do_cache_hit_ratio", "Cache hits over lookups by cache.", "cache", func() map[string]float64 {
+		ratios := make(map[string]float64)
+		for name, stats := range s.store.CacheStats() {
+			if lookups := stats.Hits + stats.Misses; lookups > 0 {
+				ratios[name] = float64(stats.Hits) / float64(lookups)
+			}
+		}
+		return ratios
+	})
+	r.GaugeFunc("do_cache_entries", "Entries in the LRU cache.", func() float64 {
+		return float64(s.store.CacheLen())
+	})
+	r.GaugeFunc("do_event_subscribers", "Connected live update streams.", func() float64 {
+		return float64(s.events.Subscribers())
+	})
+	r.GaugeFunc("go_goroutines", "Number of goroutines.", func() float64 {
+		return float64(runtime.NumGoroutine())
+	})
+	r.GaugeFunc("go_memstats_heap_alloc_bytes", "Bytes of allocated heap objects.", func() float64 {
+		var stats runtime.MemStats
+		runtime.ReadMemStats(&stats)
+		return float64(stats.HeapAlloc)
+	})
+}
+
+// middleware records request latency per route template. Long-lived event
+// streams are left out so their connection time does not skew latency.
+func (m *serverMetrics) middleware() gin.HandlerFunc {
+	return func(c *gin.Context) {
+		start := time.Now()
+		c.Next()
+
+		route := c.FullPath()
+		switch route {
+		case "":
+			route = "unmatched"
+		case "/api/events":
+			return
+		}
+		m.http.Observe(time.Since(start), c.Request.Method, route, strconv.Itoa(c.Writer.Status()))
+	}
+}
+
+// handleMetrics serves all metrics in the Prometheus text format.
+func (s *Server) handleMetrics(c *gin.Context) {
+	c.Header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+	c.Status(http.StatusOK)
+	s.metrics.registry.Write(c.Writer)
+}
+
+// accessLogger returns the request logging middleware for DO_ACCESS_LOG:
+// "on" (default) logs every request, "off" none, and a fraction such as 0.1
+// logs that share of requests. Server errors are always logged.
+func accessLogger(setting string) gin.HandlerFunc {
+	switch setting {
+	case "", "on":
+		return gin.Logger()
+	case "off":
+		return nil
+	}
+
+	rate, err := strconv.ParseFloat(setting, 64)
+	if err != nil || rate < 0 || rate > 1 {
+		log.Printf("Invalid DO_ACCESS_LOG %q, logging every request", setting)
+		return gin.Logger()
+	}
+	return gin.LoggerWithConfig(gin.LoggerConfig{
+		Skip: func(c *gin.Context) bool {
+			return c.Writer.Status() < http.StatusInternalServerError && rand.Float64() >= rate
+		},
+	})
+}
+
+// startPprof serves net/http/pprof on its own listener (DO_PPROF_ADDR) so
+// profiling is never exposed on the API port.
+func startPprof(addr string) *http.Server {
+	mux := http.NewServeMux()
+	mux.HandleFunc("/debug/pprof/", pprof.Index)
+	mux.HandleFunc("/debug/pprof/cmdline", pprof.Cmdline)
+	mux.HandleFunc("/debug/pprof/profile", pprof.Profile)
+	mux.HandleFunc("/debug/pprof/symbol", pprof.Symbol)
+	mux.HandleFunc("/debug/pprof/trace", pprof.Trace)
+
+	srv := &http.Server{Addr: addr, Handler: mux}
+	go func() {
+		log.Printf("pprof listening on http://%s/debug/pprof/", addr)
+		if err := srv.ListenAndServe(); err != nil && err != http.ErrServerClosed {
+			log.Printf("pprof listener failed: %v", err)
+		}
+	}()
+	return srv
+}
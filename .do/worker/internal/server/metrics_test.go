@@ -0,0 +1,181 @@
+package server
+
+import (
+	"bytes"
+	"math"
+	"net/http"
+	"net/http/httptest"
+	"regexp"
+	"strconv"
+	"strings"
+	"testing"
+
+	"github.com/gin-gonic/gin"
+)
+
+var (
+	sampleLine = regexp.MustCompile(`^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (\S+)$`)
+	leLabel    = regexp.MustCompile(`,?le="([^"]*)"`)
+)
+
+// histogramSeries is one label set of a histogram family as scraped.
+type histogramSeries struct {
+	bounds  []float64
+	counts  []float64
+	sum     float64
+	count   float64
+	sawSum  bool
+	sawCnt  bool
+	ordered bool // _sum and _count came after the buckets
+}
+
+func TestMetricsHistogramsAreWellFormed(t *testing.T) {
+	s := newTestServer(t)
+	createSession(t, s, "s1", "alice")
+	for _, path := range []string{"/health", "/api/context/inject?user=alice", "/api/sessions?limit=1", "/no/such/route"} {
+		request(t, s, http.MethodGet, path, nil)
+	}
+
+	w := request(t, s, http.MethodGet, "/metrics", nil)
+	if w.Code != http.StatusOK {
+		t.Fatalf("status %d", w.Code)
+	}
+	if ct := w.Header().Get("Content-Type"); !strings.HasPrefix(ct, "text/plain; version=0.0.4") {
+		t.Errorf("Content-Type = %q", ct)
+	}
+
+	types := make(map[string]string)
+	series := make(map[string]*histogramSeries) // family + labels without le
+	for n, line := range strings.Split(strings.TrimSuffix(w.Body.String(), "\n"), "\n") {
+		if strings.HasPrefix(line, "# TYPE ") {
+			fields := strings.Fields(line)
+			if len(fields) != 4 {
+				t.Fatalf("line %d: malformed TYPE %q", n+1, line)
+			}
+			types[fields[2]] = fields[3]
+			continue
+		}
+		if strings.HasPrefix(line, "#") {
+			continue
+		}
+		m := sampleLine.FindStringSubmatch(line)
+		if m == nil {
+			t.Fatalf("line %d: malformed sample %q", n+1, line)
+		}
+		name, labels := m[1], m[2]
+		value, err := strconv.ParseFloat(m[3], 64)
+		if err != nil {
+			t.Fatalf("line %d: bad value in %q", n+1, line)
+		}
+
+		family, suffix := name, ""
+		for _, sfx := range []string{"_bucket", "_sum", "_count"} {
+			if base := strings.TrimSuffix(name, sfx); base != name && types[base] == "histogram" {
+				family, suffix = base, sfx
+			}
+		}
+		if _, ok := types[family]; !ok {
+			t.Fatalf("line %d: sample %s before its TYPE line", n+1, name)
+		}
+		if suffix == "" {
+			continue
+		}
+
+		key := family + leLabel.ReplaceAllString(labels, "")
+		key = strings.Replace(key, "{}", "", 1)
+		h := series[key]
+		if h == nil {
+			h = &histogramSeries{ordered: true}
+			series[key] = h
+		}
+		switch suffix {
+		case "_bucket":
+			le := leLabel.FindStringSubmatch(labels)
+			if le == nil {
+				t.Fatalf("line %d: bucket without le: %q", n+1, line)
+			}
+			bound := math.Inf(1)
+			if le[1] != "+Inf" {
+				if bound, err = strconv.ParseFloat(le[1], 64); err != nil {
+					t.Fatalf("line %d: bad le in %q", n+1, line)
+				}
+			}
+			if h.sawSum || h.sawCnt {
+				h.ordered = false
+			}
+			h.bounds = append(h.bounds, bound)
+			h.counts = append(h.counts, value)
+		case "_sum":
+			h.sum, h.sawSum = value, true
+		case "_count":
+			h.count, h.sawCnt = value, true
+		}
+	}
+
+	for _, family := range []string{"do_http_request_duration_seconds", "do_db_query_duration_seconds"} {
+		if types[family] != "histogram" {
+			t.Errorf("%s has TYPE %q, want histogram", family, types[family])
+		}
+	}
+	if _, ok := series[`do_http_request_duration_seconds{method="GET",route="/health",status="200"}`]; !ok {
+		t.Error("no request histogram for GET /health")
+	}
+	if _, ok := series[`do_db_query_duration_seconds{method="GetLatestSession"}`]; !ok {
+		t.Error("no DB histogram for GetLatestSession")
+	}
+
+	for key, h := range series {
+		if len(h.bounds) == 0 || !h.sawSum || !h.sawCnt || !h.ordered {
+			t.Errorf("%s: want buckets then _sum and _count, got %d buckets, sum %v, count %v", key, len(h.bounds), h.sawSum, h.sawCnt)
+			continue
+		}
+		for i := 1; i < len(h.bounds); i++ {
+			if h.bounds[i] <= h.bounds[i-1] {
+				t.Errorf("%s: le %v after %v, want increasing bounds", key, h.bounds[i], h.bounds[i-1])
+			}
+			if h.counts[i] < h.counts[i-1] {
+				t.Errorf("%s: bucket le=%v count %v below le=%v count %v, want cumulative", key, h.bounds[i], h.counts[i], h.bounds[i-1], h.counts[i-1])
+			}
+		}
+		last := len(h.bounds) - 1
+		if !math.IsInf(h.bounds[last], 1) {
+			t.Errorf("%s: last bucket le=%v, want +Inf", key, h.bounds[last])
+		}
+		if h.counts[last] != h.count {
+			t.Errorf("%s: +Inf bucket %v != _count %v", key, h.counts[last], h.count)
+		}
+		if h.count == 0 || h.sum < 0 {
+			t.Errorf("%s: count %v sum %v", key, h.count, h.sum)
+		}
+	}
+}
+
+func TestSampledAccessLogKeepsServerErrors(t *testing.T) {
+	var buf bytes.Buffer
+	previous := gin.DefaultWriter
+	gin.DefaultWriter = &buf
+	t.Cleanup(func() { gin.DefaultWriter = previous })
+
+	router := gin.New()
+	router.Use(accessLogger("0"))
+	router.GET("/ok", func(c *gin.Context) { c.Status(http.StatusOK) })
+	router.GET("/missing", func(c *gin.Context) { c.Status(http.StatusNotFound) })
+	router.GET("/fail", func(c *gin.Context) { c.Status(http.StatusInternalServerError) })
+	router.GET("/unavailable", func(c *gin.Context) { c.Status(http.StatusServiceUnavailable) })
+
+	for _, path := range []string{"/ok", "/missing", "/fail", "/unavailable"} {
+		router.ServeHTTP(httptest.NewRecorder(), httptest.NewRequest(http.MethodGet, path, nil))
+	}
+
+	logged := buf.String()
+	for _, path := range []string{"/fail", "/unavailable"} {
+		if !strings.Contains(logged, path) {
+			t.Errorf("server error on %s was not logged:\n%s", path, logged)
+		}
+	}
+	for _, path := range []string{"/ok", "/missing"} {
+		if strings.Contains(logged, path) {
+			t.Errorf("%s logged at rate 0:\n%s", path, logged)
+		}
+	}
+}
@@ -10,6 +10,10 @@ import (
 	"strings"
 	"time"
 
+	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/internal/events"
+	"github.com/do-focus/worker/internal/jobs"
+	"github.com/do-focus/worker/internal/memory"
 	"github.com/do-focus/worker/pkg/models"
 	"github.com/gin-gonic/gin"
 )
@@ -22,6 +26,9 @@ func (s *Server) setupRoutes() {
 	// Health check
 	s.router.GET("/health", s.handleHealth)
 
+	// Prometheus metrics
+	s.router.GET("/metrics", s.handleMetrics)
+
 	// API routes
 	api := s.router.Group("/api")
 	{
@@ -41,8 +48,10 @@ func (s *Server) setupRoutes() {
 
 		// Summaries
 		api.GET("/summaries", s.handleGetSummaries)
+		api.GET("/summaries/:id", s.handleGetSummary)
 		api.POST("/summaries", s.handleCreateSummary)
 		api.POST("/summaries/generate", s.handleGenerateSummary)
+		api.GET("/summaries/jobs/:id", s.handleGetSummaryJob)
 
 		// User Prompts
 		api.GET("/prompts", s.handleGetUserPrompts)
@@ -61,6 +70,12 @@ func (s *Server) setupRoutes() {
 
 		// Projects
 		api.GET("/projects", s.getProjects)
+
+		// Live updates (server-sent events)
+		api.GET("/events", s.handleEvents)
+
+		// Maintenance
+		api.POST("/maintenance/compact", s.handleCompact)
 	}
 }
 
@@ -84,6 +99,7 @@ func (s *Server) handleHealth(c *gin.Context) {
 		DBType:   dbType,
 		DBStatus: dbStatus,
 		Version:  Version,
+		Cache:    s.store.CacheStats(),
 	})
 }
 
@@ -92,6 +108,9 @@ func (s *Server) handleHealth(c *gin.Context) {
 // - level 1: minimal (session only)
 // - level 2: standard (session + observations) [default]
 // - level 3: full (session + observations + plan + team)
+//
+// Rendered responses are cached per (user, level, obs_limit) until a write
+// invalidates them, and carry an ETag so hooks can revalidate with If-None-Match.
 func (s *Server) handleContextInject(c *gin.Context) {
 	ctx := c.Request.Context()
 
@@ -113,6 +132,29 @@ func (s *Server) handleContextInject(c *gin.Context) {
 		level = 3
 	}
 
+	// Observation limit (level 2+)
+	limit := 0
+	if level >= 2 {
+		limitStr := c.DefaultQuery("obs_limit", "20")
+		limit, _ = strconv.Atoi(limitStr)
+		if limit <= 0 {
+			limit = 20
+		}
+		// Adjust limit based on level
+		if level == 2 {
+			if limit > 20 {
+				limit = 20
+			}
+		}
+	}
+
+	cacheID := contextCacheID(userName, level, limit)
+	if cached, ok := s.store.GetCache(memory.CacheKeyContext, cacheID); ok {
+		serveCachedContext(c, cached.(*cachedContext), "HIT")
+		return
+	}
+	gen := s.store.CacheGeneration()
+
 	// Get latest session (always included)
 	session, err := s.db.GetLatestSession(ctx, userName)
 	if err != nil {
@@ -129,18 +171,6 @@ func (s *Server) handleContextInject(c *gin.Context) {
 
 	// Level 2+: Include observations
 	if level >= 2 {
-		limitStr := c.DefaultQuery("obs_limit", "20")
-		limit, _ := strconv.Atoi(limitStr)
-		if limit <= 0 {
-			limit = 20
-		}
-		// Adjust limit based on level
-		if level == 2 {
-			if limit > 20 {
-				limit = 20
-			}
-		}
-
 		observations, err = s.db.GetRecentObservations(ctx, userName, limit)
 		if err != nil {
 			c.JSON(http.StatusInternalServerError, models.ErrorResponse{
@@ -175,13 +205,24 @@ func (s *Server) handleContextInject(c *gin.Context) {
 	// Build markdown response
 	markdown := buildContextMarkdown(session, observations, plan, teamContext)
 
-	c.JSON(http.StatusOK, models.ContextInjectResponse{
+	body, err := json.Marshal(models.ContextInjectResponse{
 		Session:      session,
 		Observations: observations,
 		ActivePlan:   plan,
 		TeamContext:  teamContext,
 		Markdown:     markdown,
 	})
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+			Error:   "encoding_error",
+			Message: err.Error(),
+		})
+		return
+	}
+
+	entry := newCachedContext(body)
+	s.store.SetCacheIfCurrent(memory.CacheKeyContext, cacheID, entry, gen)
+	serveCachedContext(c, entry, "MISS")
 }
 
 // handleCreateSession handles session creation (idempotent).
@@ -217,6 +258,10 @@ func (s *Server) handleCreateSession(c *gin.Context) {
 		return
 	}
 
+	s.store.SetCache(memory.CacheKeySession, session.ID, session)
+	s.invalidateUserContext(session.UserName, false)
+	s.events.Publish(events.SessionCreated, session)
+
 	c.JSON(http.StatusCreated, session)
 }
 
@@ -238,27 +283,29 @@ func (s *Server) handleEndSession(c *gin.Context) {
 		return
 	}
 
+	// Ended sessions feed team context, so full-level entries of other users are stale too
+	s.invalidateSessionContext(c.Request.Context(), id, true)
+	s.store.DeleteCache(memory.CacheKeySession, id)
+
+	if session, err := s.db.GetSession(c.Request.Context(), id); err == nil && session != nil {
+		s.events.Publish(events.SessionUpdated, session)
+	}
+
 	c.JSON(http.StatusOK, gin.H{"status": "ended"})
 }
 
-// handleGetSessions handles session list retrieval.
+// handleGetSessions handles session list retrieval (newest first, cursor-paginated).
 func (s *Server) handleGetSessions(c *gin.Context) {
-	limitStr := c.DefaultQuery("limit", "20")
-	limit, _ := strconv.Atoi(limitStr)
-	if limit <= 0 {
-		limit = 20
-	}
-
-	sessions, err := s.db.GetRecentSessions(c.Request.Context(), limit)
-	if err != nil {
-		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-			Error:   "database_error",
-			Message: err.Error(),
-		})
+	page, ok := pageFromQuery(c, 20)
+	if !ok {
 		return
 	}
 
-	c.JSON(http.StatusOK, sessions)
+	serveList(c, page, func(fn func(*models.Session) error) error {
+		return s.db.ListSessions(c.Request.Context(), page, fn)
+	}, func(session *models.Session) db.Cursor {
+		return db.Cursor{CreatedAt: session.CreatedAt, ID: session.ID}
+	})
 }
 
 // handleGetSession handles single session retrieval.
@@ -285,25 +332,20 @@ func (s *Server) handleGetSession(c *gin.Context) {
 	c.JSON(http.StatusOK, session)
 }
 
-// handleGetObservations handles observation list retrieval.
+// handleGetObservations handles observation list retrieval (newest first, cursor-paginated).
 func (s *Server) handleGetObservations(c *gin.Context) {
 	sessionID := c.Query("session_id")
 	obsType := c.Query("type")
-	limitStr := c.DefaultQuery("limit", "50")
-	limit, _ := strconv.Atoi(limitStr)
-	offsetStr := c.DefaultQuery("offset", "0")
-	offset, _ := strconv.Atoi(offsetStr)
-
-	observations, err := s.db.GetObservationsFiltered(c.Request.Context(), sessionID, obsType, limit, offset)
-	if err != nil {
-		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-			Error:   "database_error",
-			Message: err.Error(),
-		})
+	page, ok := pageFromQuery(c, 50)
+	if !ok {
 		return
 	}
 
-	c.JSON(http.StatusOK, observations)
+	serveList(c, page, func(fn func(*models.Observation) error) error {
+		return s.db.ListObservations(c.Request.Context(), sessionID, obsType, page, fn)
+	}, func(obs *models.Observation) db.Cursor {
+		return idCursor(obs.CreatedAt, obs.ID)
+	})
 }
 
 // handleSearchObservations handles observation search.
@@ -332,14 +374,34 @@ func (s *Server) handleSearchObservations(c *gin.Context) {
 	c.JSON(http.StatusOK, results)
 }
 
-// handleGetSummaries handles summary list retrieval.
+// handleGetSummaries handles summary list retrieval (newest first, cursor-paginated).
 func (s *Server) handleGetSummaries(c *gin.Context) {
 	daysStr := c.DefaultQuery("days", "7")
 	days, _ := strconv.Atoi(daysStr)
-	limitStr := c.DefaultQuery("limit", "100")
-	limit, _ := strconv.Atoi(limitStr)
+	page, ok := pageFromQuery(c, 100)
+	if !ok {
+		return
+	}
+
+	serveList(c, page, func(fn func(*models.Summary) error) error {
+		return s.db.ListSummaries(c.Request.Context(), days, page, fn)
+	}, func(sum *models.Summary) db.Cursor {
+		return idCursor(sum.CreatedAt, sum.ID)
+	})
+}
+
+// handleGetSummary handles single summary retrieval, including archived transcripts.
+func (s *Server) handleGetSummary(c *gin.Context) {
+	id, err := strconv.ParseInt(c.Param("id"), 10, 64)
+	if err != nil {
+		c.JSON(http.StatusBadRequest, models.ErrorResponse{
+			Error:   "invalid_request",
+			Message: "Invalid summary id",
+		})
+		return
+	}
 
-	summaries, err := s.db.GetAllSummaries(c.Request.Context(), days, limit)
+	summary, err := s.db.GetSummary(c.Request.Context(), id)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
 			Error:   "database_error",
@@ -348,16 +410,20 @@ func (s *Server) handleGetSummaries(c *gin.Context) {
 		return
 	}
 
-	c.JSON(http.StatusOK, summaries)
-}
+	if summary == nil {
+		c.JSON(http.StatusNotFound, models.ErrorResponse{
+			Error:   "not_found",
+			Message: "Summary not found",
+		})
+		return
+	}
 
-// handleGetPlans handles plan list retrieval.
-func (s *Server) handleGetPlans(c *gin.Context) {
-	sessionID := c.Query("session_id")
-	limitStr := c.DefaultQuery("limit", "50")
-	limit, _ := strconv.Atoi(limitStr)
+	c.JSON(http.StatusOK, summary)
+}
 
-	plans, err := s.db.GetAllPlans(c.Request.Context(), sessionID, limit)
+// handleCompact runs retention, transcript archiving and full compaction immediately.
+func (s *Server) handleCompact(c *gin.Context) {
+	report, err := s.maintenance.Run(c.Request.Context(), true)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
 			Error:   "database_error",
@@ -366,7 +432,22 @@ func (s *Server) handleGetPlans(c *gin.Context) {
 		return
 	}
 
-	c.JSON(http.StatusOK, plans)
+	c.JSON(http.StatusOK, report)
+}
+
+// handleGetPlans handles plan list retrieval (newest first, cursor-paginated).
+func (s *Server) handleGetPlans(c *gin.Context) {
+	sessionID := c.Query("session_id")
+	page, ok := pageFromQuery(c, 50)
+	if !ok {
+		return
+	}
+
+	serveList(c, page, func(fn func(*models.Plan) error) error {
+		return s.db.ListPlans(c.Request.Context(), sessionID, page, fn)
+	}, func(plan *models.Plan) db.Cursor {
+		return idCursor(plan.CreatedAt, plan.ID)
+	})
 }
 
 // handleCreateObservation handles observation creation.
@@ -385,23 +466,12 @@ func (s *Server) handleCreateObservation(c *gin.Context) {
 		req.Importance = 3
 	}
 
-	// Convert tags to JSON
-	var tagsJSON string
-	if len(req.Tags) > 0 {
-		tagsBytes, _ := json.Marshal(req.Tags)
-		tagsJSON = string(tagsBytes)
-	}
-
-	obs := &models.Observation{
-		SessionID:  req.SessionID,
-		AgentName:  req.AgentName,
-		Type:       req.Type,
-		Content:    req.Content,
-		Importance: req.Importance,
-		Tags:       tagsJSON,
-	}
-
-	if err := s.db.CreateObservation(c.Request.Context(), obs); err != nil {
+	obs, err := s.observations.Record(c.Request.Context(), req.SessionID, memory.ObservationType(req.Type), req.Content,
+		memory.WithAgent(req.AgentName),
+		memory.WithImportance(req.Importance),
+		memory.WithTags(req.Tags...),
+	)
+	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
 			Error:   "database_error",
 			Message: err.Error(),
@@ -409,9 +479,25 @@ func (s *Server) handleCreateObservation(c *gin.Context) {
 		return
 	}
 
+	// observationsFlushed has invalidated the context and published the row
 	c.JSON(http.StatusCreated, obs)
 }
 
+// observationsFlushed invalidates cached context for observations written from
+// the batch queue and publishes them.
+func (s *Server) observationsFlushed(written []models.Observation) {
+	ctx := context.Background()
+	invalidated := make(map[string]bool)
+	for i := range written {
+		obs := &written[i]
+		if !invalidated[obs.SessionID] {
+			invalidated[obs.SessionID] = true
+			s.invalidateSessionContext(ctx, obs.SessionID, false)
+		}
+		s.events.Publish(events.ObservationCreated, obs)
+	}
+}
+
 // handleCreateSummary handles summary creation.
 func (s *Server) handleCreateSummary(c *gin.Context) {
 	var req models.CreateSummaryRequest
@@ -437,6 +523,9 @@ func (s *Server) handleCreateSummary(c *gin.Context) {
 		return
 	}
 
+	s.invalidateSessionContext(c.Request.Context(), summary.SessionID, false)
+	s.events.Publish(events.SummaryCreated, summaryEvent(summary))
+
 	c.JSON(http.StatusCreated, summary)
 }
 
@@ -468,6 +557,10 @@ func (s *Server) handleCreatePlan(c *gin.Context) {
 		return
 	}
 
+	// Plans feed the active-plan and team sections
+	s.invalidateSessionContext(c.Request.Context(), plan.SessionID, true)
+	s.events.Publish(events.PlanCreated, plan)
+
 	c.JSON(http.StatusCreated, plan)
 }
 
@@ -504,7 +597,8 @@ func (s *Server) getProjects(c *gin.Context) {
 	c.JSON(http.StatusOK, projects)
 }
 
-// handleGenerateSummary generates a rule-based summary from session observations.
+// handleGenerateSummary queues summary generation for a session and returns the
+// job immediately with 202 Accepted; poll GET /api/summaries/jobs/:id for the result.
 func (s *Server) handleGenerateSummary(c *gin.Context) {
 	ctx := c.Request.Context()
 
@@ -517,7 +611,7 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 		return
 	}
 
-	// 1. Verify session exists
+	// Verify session exists
 	session, err := s.db.GetSession(ctx, req.SessionID)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
@@ -534,8 +628,40 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 		return
 	}
 
-	// 2. Get observations for the session
-	observations, err := s.db.GetObservationsFiltered(ctx, req.SessionID, "", 100, 0)
+	// Truncate before queueing so job rows stay bounded:
+	// source message (includes tool_use) to 50KB, full transcript to 500KB
+	if len(req.LastAssistantMessage) > 50000 {
+		req.LastAssistantMessage = req.LastAssistantMessage[:50000] + "\n...(truncated)"
+	}
+	if len(req.FullTranscript) > 500000 {
+		req.FullTranscript = req.FullTranscript[:500000] + "\n...(truncated)"
+	}
+
+	job, err := s.summaryJobs.Enqueue(ctx, &req)
+	if err != nil {
+		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
+			Error:   "database_error",
+			Message: err.Error(),
+		})
+		return
+	}
+
+	c.Header("Location", fmt.Sprintf("/api/summaries/jobs/%d", job.ID))
+	c.JSON(http.StatusAccepted, job)
+}
+
+// handleGetSummaryJob returns the status of a summary generation job.
+func (s *Server) handleGetSummaryJob(c *gin.Context) {
+	id, err := strconv.ParseInt(c.Param("id"), 10, 64)
+	if err != nil {
+		c.JSON(http.StatusBadRequest, models.ErrorResponse{
+			Error:   "invalid_request",
+			Message: "Invalid job ID",
+		})
+		return
+	}
+
+	job, err := s.db.GetSummaryJob(c.Request.Context(), id)
 	if err != nil {
 		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
 			Error:   "database_error",
@@ -543,9 +669,45 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 		})
 		return
 	}
+	if job == nil {
+		c.JSON(http.StatusNotFound, models.ErrorResponse{
+			Error:   "not_found",
+			Message: "Summary job not found",
+		})
+		return
+	}
+
+	c.JSON(http.StatusOK, job)
+}
+
+// runSummaryJob generates and stores the summary for a queued job.
+// LLM failures are retried; the last attempt falls back to the rule-based summary.
+func (s *Server) runSummaryJob(ctx context.Context, job *models.SummaryJob, lastAttempt bool) (int64, error) {
+	var req models.GenerateSummaryRequest
+	if err := json.Unmarshal([]byte(job.Payload), &req); err != nil {
+		return 0, jobs.Permanent(fmt.Errorf("invalid job payload: %w", err))
+	}
+
+	// 1. Verify session exists
+	session, err := s.db.GetSession(ctx, req.SessionID)
+	if err != nil {
+		return 0, err
+	}
+	if session == nil {
+		return 0, jobs.Permanent(fmt.Errorf("session not found: %s", req.SessionID))
+	}
+
+	// 2. Get observations for the session, including queued ones
+	_ = s.store.Flush()
+	var observations []models.Observation
+	err = s.db.ListObservations(ctx, req.SessionID, "", db.Page{Limit: 100}, db.Collect(&observations))
+	if err != nil {
+		return 0, err
+	}
 
 	// 3. Get user prompts for request extraction
-	userPrompts, _ := s.db.GetUserPrompts(ctx, req.SessionID, 10)
+	var userPrompts []models.UserPrompt
+	_ = s.db.ListUserPrompts(ctx, req.SessionID, db.Page{Limit: 10}, db.Collect(&userPrompts))
 	var promptTexts []string
 	for _, p := range userPrompts {
 		promptTexts = append(promptTexts, p.PromptText)
@@ -555,12 +717,14 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 	var structured StructuredSummary
 	apiKey := os.Getenv("ANTHROPIC_API_KEY")
 	if apiKey != "" && req.LastAssistantMessage != "" {
-		// Try LLM-based summary
 		llmSummary, err := generateLLMSummary(ctx, req.LastAssistantMessage, promptTexts, apiKey)
-		if err == nil && llmSummary != nil {
+		switch {
+		case err == nil && llmSummary != nil:
 			structured = *llmSummary
-		} else {
-			// Fallback to rule-based
+		case !lastAttempt:
+			return 0, fmt.Errorf("LLM summary: %w", err)
+		default:
+			// Out of retries: fall back to rule-based
 			structured = generateStructuredSummary(observations, req.LastAssistantMessage, promptTexts)
 		}
 	} else {
@@ -571,19 +735,7 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 	filesReadJSON, _ := json.Marshal(structured.FilesRead)
 	filesEditedJSON, _ := json.Marshal(structured.FilesEdited)
 
-	// 6. Save summary to DB with structured fields
-	// Truncate source message to 50KB for storage (includes tool_use)
-	sourceMsg := req.LastAssistantMessage
-	if len(sourceMsg) > 50000 {
-		sourceMsg = sourceMsg[:50000] + "\n...(truncated)"
-	}
-
-	// Truncate full transcript to 500KB for storage
-	fullTranscript := req.FullTranscript
-	if len(fullTranscript) > 500000 {
-		fullTranscript = fullTranscript[:500000] + "\n...(truncated)"
-	}
-
+	// 6. Save summary to DB with structured fields (truncated when queued)
 	summary := &models.Summary{
 		SessionID:      req.SessionID,
 		Type:           "session",
@@ -595,19 +747,18 @@ func (s *Server) handleGenerateSummary(c *gin.Context) {
 		NextSteps:      strPtr(structured.NextSteps),
 		FilesRead:      string(filesReadJSON),
 		FilesEdited:    string(filesEditedJSON),
-		SourceMessage:  sourceMsg,
-		FullTranscript: fullTranscript,
+		SourceMessage:  req.LastAssistantMessage,
+		FullTranscript: req.FullTranscript,
 	}
 
 	if err := s.db.CreateSummary(ctx, summary); err != nil {
-		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-			Error:   "database_error",
-			Message: err.Error(),
-		})
-		return
+		return 0, err
 	}
 
-	c.JSON(http.StatusCreated, summary)
+	s.invalidateUserContext(session.UserName, false)
+	s.events.Publish(events.SummaryCreated, summaryEvent(summary))
+
+	return summary.ID, nil
 }
 
 // StructuredSummary holds parsed summary fields.
@@ -1185,7 +1336,7 @@ IMPORTANT: Output ONLY the XML summary, nothing else.`
 		return nil, err
 	}
 
-	req, err := http.NewRequestWithContext(ctx, "POST", "https://api.anthropic.com/v1/messages", strings.NewReader(string(jsonBody)))
+	req, err := http.NewRequestWithContext(ctx, "POST", llmBaseURL()+"/v1/messages", strings.NewReader(string(jsonBody)))
 	if err != nil {
 		return nil, err
 	}
@@ -1223,6 +1374,15 @@ IMPORTANT: Output ONLY the XML summary, nothing else.`
 	return parseSummaryXML(result.Content[0].Text)
 }
 
+// llmBaseURL returns the Anthropic API base URL. ANTHROPIC_BASE_URL overrides it,
+// e.g. to point at a local stub.
+func llmBaseURL() string {
+	if url := os.Getenv("ANTHROPIC_BASE_URL"); url != "" {
+		return strings.TrimRight(url, "/")
+	}
+	return "https://api.anthropic.com"
+}
+
 // parseSummaryXML parses the XML summary response from LLM.
 func parseSummaryXML(text string) (*StructuredSummary, error) {
 	summary := &StructuredSummary{}
@@ -1286,28 +1446,19 @@ func formatSummaryAsMarkdown(s StructuredSummary) string {
 	return strings.Join(parts, "\n\n")
 }
 
-// handleGetUserPrompts handles user prompt list retrieval.
+// handleGetUserPrompts handles user prompt list retrieval (cursor-paginated).
 func (s *Server) handleGetUserPrompts(c *gin.Context) {
-	ctx := c.Request.Context()
-
-	limitStr := c.DefaultQuery("limit", "100")
-	limit, _ := strconv.Atoi(limitStr)
-	if limit <= 0 {
-		limit = 100
-	}
-
 	sessionID := c.Query("session_id")
-
-	prompts, err := s.db.GetUserPrompts(ctx, sessionID, limit)
-	if err != nil {
-		c.JSON(http.StatusInternalServerError, models.ErrorResponse{
-			Error:   "database_error",
-			Message: err.Error(),
-		})
+	page, ok := pageFromQuery(c, 100)
+	if !ok {
 		return
 	}
 
-	c.JSON(http.StatusOK, prompts)
+	serveList(c, page, func(fn func(*models.UserPrompt) error) error {
+		return s.db.ListUserPrompts(c.Request.Context(), sessionID, page, fn)
+	}, func(p *models.UserPrompt) db.Cursor {
+		return idCursor(p.CreatedAt, p.ID)
+	})
 }
 
 // handleCreateUserPrompt handles user prompt creation.
@@ -1338,6 +1489,8 @@ func (s *Server) handleCreateUserPrompt(c *gin.Context) {
 		return
 	}
 
+	s.events.Publish(events.PromptCreated, prompt)
+
 	c.JSON(http.StatusCreated, prompt)
 }
 
@@ -1371,6 +1524,11 @@ func (s *Server) handleUpdateLatestPromptResponse(c *gin.Context) {
 		return
 	}
 
+	s.events.Publish(events.PromptUpdated, models.PromptResponseEvent{
+		SessionID: req.SessionID,
+		Response:  response,
+	})
+
 	c.JSON(http.StatusOK, gin.H{"status": "updated"})
 }
 
@@ -2,18 +2,33 @@
 package server
 
 import (
+	"net/http"
 	"os"
+	"strconv"
+	"strings"
 	"time"
 
 	"github.com/do-focus/worker/internal/db"
+	"github.com/do-focus/worker/internal/events"
+	"github.com/do-focus/worker/internal/jobs"
+	"github.com/do-focus/worker/internal/maintenance"
+	"github.com/do-focus/worker/internal/memory"
+	"github.com/do-focus/worker/pkg/models"
 	"github.com/gin-contrib/cors"
 	"github.com/gin-gonic/gin"
 )
 
 // Server represents the HTTP server.
 type Server struct {
-	router *gin.Engine
-	db     db.Adapter
+	router       *gin.Engine
+	db           db.Adapter
+	store        *memory.Store
+	observations *memory.ObservationManager
+	maintenance  *maintenance.Runner
+	summaryJobs  *jobs.Pool
+	events       *events.Hub
+	metrics      *serverMetrics
+	pprof        *http.Server // nil unless DO_PPROF_ADDR is set
 }
 
 // New creates a new server instance.
@@ -40,11 +55,13 @@ func New() (*Server, error) {
 		dbCfg.Port = "3306"
 	}
 
-	// Initialize database
+	// Initialize database, timing every adapter call for /metrics
 	dbAdapter, err := db.New(dbCfg)
 	if err != nil {
 		return nil, err
 	}
+	instruments := newServerMetrics()
+	dbAdapter = db.Instrument(dbAdapter, instruments.observeDB)
 
 	// Set Gin mode
 	if os.Getenv("GIN_MODE") == "" {
@@ -54,23 +71,78 @@ func New() (*Server, error) {
 	// Create router
 	router := gin.New()
 	router.Use(gin.Recovery())
-	router.Use(gin.Logger())
+	if logger := accessLogger(os.Getenv("DO_ACCESS_LOG")); logger != nil {
+		router.Use(logger)
+	}
+	router.Use(instruments.middleware())
 
 	// CORS configuration for web viewer
 	router.Use(cors.New(cors.Config{
 		AllowOrigins:     []string{"http://localhost:3777", "http://127.0.0.1:3777"},
 		AllowMethods:     []string{"GET", "POST", "PUT", "DELETE", "OPTIONS"},
-		AllowHeaders:     []string{"Origin", "Content-Type", "Accept"},
-		ExposeHeaders:    []string{"Content-Length"},
+		AllowHeaders:     []string{"Origin", "Content-Type", "Accept", "Last-Event-ID"},
+		ExposeHeaders:    []string{"Content-Length", nextCursorHeader},
 		AllowCredentials: true,
 		MaxAge:           12 * time.Hour,
 	}))
 
-	s := &Server{
-		router: router,
-		db:     dbAdapter,
+	// Memory store: observation batch queue and rendered context cache
+	var s *Server
+	store := memory.NewStore(dbAdapter,
+		memory.WithBatchSize(envInt("DO_OBS_BATCH_SIZE")),
+		memory.WithFlushInterval(envDuration("DO_OBS_FLUSH_INTERVAL")),
+		memory.WithCacheSize(envInt("DO_CACHE_SIZE")),
+		memory.WithCacheTTL(envDuration("DO_CACHE_TTL")),
+		memory.WithFlushHandler(func(written []models.Observation) {
+			s.observationsFlushed(written)
+		}),
+	)
+
+	// Retention and compaction: DO_RETENTION_<TABLE>_MAX_AGE / _MAX_ROWS per table
+	maintenanceOpts := []maintenance.Option{
+		maintenance.WithArchiveAfter(envDuration("DO_ARCHIVE_AFTER")),
+		maintenance.WithJobRetention(envDuration("DO_SUMMARY_JOB_RETENTION")),
+		maintenance.WithInterval(envDuration("DO_MAINTENANCE_INTERVAL")),
+		maintenance.WithPruneHandler(func(*models.MaintenanceReport) {
+			// Pruned rows may still appear in rendered context
+			store.ClearCache()
+		}),
+	}
+	for _, table := range db.RetentionTables {
+		prefix := "DO_RETENTION_" + strings.ToUpper(table)
+		maintenanceOpts = append(maintenanceOpts, maintenance.WithPolicy(db.RetentionPolicy{
+			Table:   table,
+			MaxAge:  envDuration(prefix + "_MAX_AGE"),
+			MaxRows: envInt(prefix + "_MAX_ROWS"),
+		}))
+	}
+
+	s = &Server{
+		router:       router,
+		db:           dbAdapter,
+		store:        store,
+		observations: memory.NewObservationManager(dbAdapter, store),
+		maintenance:  maintenance.NewRunner(dbAdapter, maintenanceOpts...),
+		events: events.NewHub(
+			events.WithHistory(envInt("DO_EVENTS_HISTORY")),
+			events.WithBuffer(envInt("DO_EVENTS_BUFFER")),
+		),
+		metrics: instruments,
+	}
+	s.registerGauges()
+
+	// Opt-in profiling listener, e.g. DO_PPROF_ADDR=127.0.0.1:6060
+	if addr := os.Getenv("DO_PPROF_ADDR"); addr != "" {
+		s.pprof = startPprof(addr)
 	}
 
+	// Background summary generation
+	s.summaryJobs = jobs.NewPool(dbAdapter, s.runSummaryJob,
+		jobs.WithWorkers(envInt("DO_SUMMARY_WORKERS")),
+		jobs.WithMaxAttempts(envInt("DO_SUMMARY_MAX_ATTEMPTS")),
+		jobs.WithBackoff(envDuration("DO_SUMMARY_RETRY_BACKOFF")),
+	)
+
 	// Setup routes
 	s.setupRoutes()
 
@@ -84,5 +156,32 @@ func (s *Server) Run(addr string) error {
 
 // Close closes the server and its resources.
 func (s *Server) Close() error {
+	if s.pprof != nil {
+		s.pprof.Close()
+	}
+	s.events.Close()
+	s.summaryJobs.Close()
+	s.maintenance.Close()
+	if err := s.store.Close(); err != nil {
+		s.db.Close()
+		return err
+	}
 	return s.db.Close()
 }
+
+// envInt reads an integer environment variable, returning 0 if unset or invalid.
+func envInt(name string) int {
+	n, _ := strconv.Atoi(os.Getenv(name))
+	return n
+}
+
+// envDuration reads a duration environment variable (e.g. "5s"), returning 0 if unset or invalid.
+// "off" returns -1 so options can tell an explicit disable from unset.
+func envDuration(name string) time.Duration {
+	value := os.Getenv(name)
+	if value == "off" {
+		return -1
+	}
+	d, _ := time.ParseDuration(value)
+	return d
+}
@@ -0,0 +1,121 @@
+package server
+
+import (
+	"bytes"
+	"context"
+	"encoding/json"
+	"net/http"
+	"net/http/httptest"
+	"path/filepath"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/internal/events"
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// newTestServer starts a server on a fresh SQLite database with background
+// maintenance disabled. env holds name/value pairs overriding the defaults.
+func newTestServer(t *testing.T, env ...string) *Server {
+	t.Helper()
+	s := startServer(t, env...)
+	t.Cleanup(func() { s.Close() })
+	return s
+}
+
+// startServer is newTestServer for tests that close the server themselves.
+func startServer(t *testing.T, env ...string) *Server {
+	t.Helper()
+	t.Setenv("DO_DB_TYPE", "sqlite")
+	t.Setenv("DO_DB_PATH", filepath.Join(t.TempDir(), "memory.db"))
+	t.Setenv("DO_MAINTENANCE_INTERVAL", "off")
+	t.Setenv("DO_ACCESS_LOG", "off")
+	t.Setenv("ANTHROPIC_API_KEY", "")
+	for i := 0; i+1 < len(env); i += 2 {
+		t.Setenv(env[i], env[i+1])
+	}
+	s, err := New()
+	if err != nil {
+		t.Fatal(err)
+	}
+	return s
+}
+
+// request sends a request to the server and returns the recorded response.
+func request(t *testing.T, s *Server, method, path string, body interface{}, header ...string) *httptest.ResponseRecorder {
+	t.Helper()
+	var buf bytes.Buffer
+	if body != nil {
+		if err := json.NewEncoder(&buf).Encode(body); err != nil {
+			t.Fatal(err)
+		}
+	}
+	req := httptest.NewRequest(method, path, &buf)
+	req.Header.Set("Content-Type", "application/json")
+	for i := 0; i+1 < len(header); i += 2 {
+		req.Header.Set(header[i], header[i+1])
+	}
+	w := httptest.NewRecorder()
+	s.router.ServeHTTP(w, req)
+	return w
+}
+
+// createSession creates a session through the API.
+func createSession(t *testing.T, s *Server, id, user string) {
+	t.Helper()
+	w := request(t, s, http.MethodPost, "/api/sessions", models.CreateSessionRequest{ID: id, UserName: user})
+	if w.Code != http.StatusCreated {
+		t.Fatalf("create session: %d %s", w.Code, w.Body)
+	}
+}
+
+func TestCreateObservationReturnsID(t *testing.T) {
+	s := newTestServer(t)
+	createSession(t, s, "s1", "alice")
+	sub := s.events.Subscribe()
+	defer s.events.Unsubscribe(sub)
+
+	// Both importance levels go through the batch queue and answer once written
+	for _, req := range []models.CreateObservationRequest{
+		{SessionID: "s1", Type: "learning", Content: "low importance", Importance: 2},
+		{SessionID: "s1", Type: "decision", Content: "high importance", Importance: 5},
+	} {
+		w := request(t, s, http.MethodPost, "/api/observations", req)
+		if w.Code != http.StatusCreated {
+			t.Fatalf("importance %d: status %d, want 201", req.Importance, w.Code)
+		}
+		var created models.Observation
+		if err := json.Unmarshal(w.Body.Bytes(), &created); err != nil || created.ID == 0 {
+			t.Fatalf("importance %d: response %s has no id", req.Importance, w.Body)
+		}
+		if s.store.Pending() != 0 {
+			t.Errorf("Pending() = %d after 201, want 0", s.store.Pending())
+		}
+	}
+
+	observations, err := s.db.GetObservations(context.Background(), "s1")
+	if err != nil {
+		t.Fatal(err)
+	}
+	if len(observations) != 2 {
+		t.Fatalf("stored %d observations, want 2", len(observations))
+	}
+
+	var published []string
+	timeout := time.After(time.Second)
+	for len(published) < 2 {
+		select {
+		case event := <-sub.C:
+			if event.Type == events.ObservationCreated {
+				var obs models.Observation
+				json.Unmarshal(event.Data, &obs)
+				if obs.ID == 0 {
+					t.Errorf("published observation %q without id", obs.Content)
+				}
+				published = append(published, obs.Content)
+			}
+		case <-timeout:
+			t.Fatalf("published %v, want both observations", published)
+		}
+	}
+}
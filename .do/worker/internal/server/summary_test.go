@@ -0,0 +1,216 @@
+package server
+
+import (
+	"encoding/json"
+	"fmt"
+	"io"
+	"net/http"
+	"net/http/httptest"
+	"path/filepath"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/do-focus/worker/pkg/models"
+)
+
+// llmStub is a fake Anthropic Messages API recording when it was called.
+type llmStub struct {
+	*httptest.Server
+
+	mu    sync.Mutex
+	calls []time.Time
+}
+
+// newLLMStub starts a stub that answers every request with respond.
+func newLLMStub(t *testing.T, respond func(w http.ResponseWriter, r *http.Request)) *llmStub {
+	t.Helper()
+	stub := &llmStub{}
+	stub.Server = httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		stub.mu.Lock()
+		stub.calls = append(stub.calls, time.Now())
+		stub.mu.Unlock()
+		if r.URL.Path != "/v1/messages" || r.Header.Get("x-api-key") != "test-key" {
+			http.Error(w, "unexpected request", http.StatusBadRequest)
+			return
+		}
+		respond(w, r)
+	}))
+	t.Cleanup(stub.Close)
+	return stub
+}
+
+func (s *llmStub) callTimes() []time.Time {
+	s.mu.Lock()
+	defer s.mu.Unlock()
+	return append([]time.Time(nil), s.calls...)
+}
+
+// respondSummary answers with a well-formed XML summary.
+func respondSummary(w http.ResponseWriter, _ *http.Request) {
+	text := "<summary><request>stub request</request><completed>stub completed</completed></summary>"
+	json.NewEncoder(w).Encode(map[string]interface{}{
+		"content": []map[string]string{{"type": "text", "text": text}},
+	})
+}
+
+// generateSummary queues summary generation and returns the accepted job.
+func generateSummary(t *testing.T, s *Server, sessionID string) models.SummaryJob {
+	t.Helper()
+	w := request(t, s, http.MethodPost, "/api/summaries/generate", models.GenerateSummaryRequest{
+		SessionID: sessionID, LastAssistantMessage: "I fixed the flaky test.",
+	})
+	if w.Code != http.StatusAccepted {
+		t.Fatalf("generate: status %d, want 202: %s", w.Code, w.Body)
+	}
+	var job models.SummaryJob
+	if err := json.Unmarshal(w.Body.Bytes(), &job); err != nil {
+		t.Fatal(err)
+	}
+	if want := fmt.Sprintf("/api/summaries/jobs/%d", job.ID); w.Header().Get("Location") != want {
+		t.Errorf("Location = %q, want %q", w.Header().Get("Location"), want)
+	}
+	return job
+}
+
+// waitForJob polls the status endpoint until the job is done or failed.
+func waitForJob(t *testing.T, s *Server, id int64) models.SummaryJob {
+	t.Helper()
+	deadline := time.Now().Add(10 * time.Second)
+	for {
+		w := request(t, s, http.MethodGet, fmt.Sprintf("/api/summaries/jobs/%d", id), nil)
+		if w.Code != http.StatusOK {
+			t.Fatalf("job status: %d %s", w.Code, w.Body)
+		}
+		var job models.SummaryJob
+		if err := json.Unmarshal(w.Body.Bytes(), &job); err != nil {
+			t.Fatal(err)
+		}
+		if job.Status == models.JobDone || job.Status == models.JobFailed {
+			return job
+		}
+		if time.Now().After(deadline) {
+			t.Fatalf("job %d still %s", id, job.Status)
+		}
+		time.Sleep(10 * time.Millisecond)
+	}
+}
+
+// getSummary fetches a summary through the API.
+func getSummary(t *testing.T, s *Server, id int64) models.Summary {
+	t.Helper()
+	w := request(t, s, http.MethodGet, fmt.Sprintf("/api/summaries/%d", id), nil)
+	if w.Code != http.StatusOK {
+		t.Fatalf("get summary: %d %s", w.Code, w.Body)
+	}
+	var summary models.Summary
+	if err := json.Unmarshal(w.Body.Bytes(), &summary); err != nil {
+		t.Fatal(err)
+	}
+	return summary
+}
+
+func TestGenerateSummaryRunsInBackground(t *testing.T) {
+	stub := newLLMStub(t, respondSummary)
+	s := newTestServer(t, "ANTHROPIC_API_KEY", "test-key", "ANTHROPIC_BASE_URL", stub.URL)
+	createSession(t, s, "s1", "alice")
+
+	job := generateSummary(t, s, "s1")
+	if job.Status != models.JobQueued {
+		t.Errorf("accepted job status = %s, want queued", job.Status)
+	}
+
+	done := waitForJob(t, s, job.ID)
+	if done.Status != models.JobDone || done.SummaryID == nil {
+		t.Fatalf("job = %+v, want done with a summary", done)
+	}
+	summary := getSummary(t, s, *done.SummaryID)
+	if summary.Request == nil || *summary.Request != "stub request" {
+		t.Errorf("summary request = %v, want the LLM's", summary.Request)
+	}
+	if n := len(stub.callTimes()); n != 1 {
+		t.Errorf("LLM called %d times, want 1", n)
+	}
+
+	w := request(t, s, http.MethodGet, "/api/summaries/jobs/999999", nil)
+	if w.Code != http.StatusNotFound {
+		t.Errorf("unknown job: status %d, want 404", w.Code)
+	}
+}
+
+func TestGenerateSummaryRetriesThenFallsBack(t *testing.T) {
+	const backoff = 50 * time.Millisecond
+	stub := newLLMStub(t, func(w http.ResponseWriter, _ *http.Request) {
+		http.Error(w, "overloaded", http.StatusServiceUnavailable)
+	})
+	s := newTestServer(t,
+		"ANTHROPIC_API_KEY", "test-key",
+		"ANTHROPIC_BASE_URL", stub.URL,
+		"DO_SUMMARY_MAX_ATTEMPTS", "3",
+		"DO_SUMMARY_RETRY_BACKOFF", backoff.String(),
+	)
+	createSession(t, s, "s1", "alice")
+	w := request(t, s, http.MethodPost, "/api/prompts", models.CreateUserPromptRequest{SessionID: "s1", PromptNumber: 1, PromptText: "fix the flaky test"})
+	if w.Code != http.StatusCreated {
+		t.Fatalf("create prompt: %d %s", w.Code, w.Body)
+	}
+
+	job := waitForJob(t, s, generateSummary(t, s, "s1").ID)
+	if job.Status != models.JobDone || job.SummaryID == nil {
+		t.Fatalf("job = %+v, want done with the rule-based summary", job)
+	}
+	if job.Attempts != 3 {
+		t.Errorf("attempts = %d, want 3", job.Attempts)
+	}
+
+	// One call per attempt, with the delay doubling between them
+	calls := stub.callTimes()
+	if len(calls) != 3 {
+		t.Fatalf("LLM called %d times, want 3", len(calls))
+	}
+	for i, want := range []time.Duration{backoff, 2 * backoff} {
+		if gap := calls[i+1].Sub(calls[i]); gap < want {
+			t.Errorf("retry %d after %v, want at least %v", i+1, gap, want)
+		}
+	}
+
+	summary := getSummary(t, s, *job.SummaryID)
+	if summary.Request == nil || *summary.Request != "fix the flaky test" {
+		t.Errorf("summary request = %v, want the rule-based one from the first prompt", summary.Request)
+	}
+}
+
+func TestSummaryJobsResumeAfterRestart(t *testing.T) {
+	path := filepath.Join(t.TempDir(), "memory.db")
+	started := make(chan struct{}, 1)
+	hang := newLLMStub(t, func(w http.ResponseWriter, r *http.Request) {
+		select {
+		case started <- struct{}{}:
+		default:
+		}
+		// The server only notices the client hanging up once the body is read
+		io.Copy(io.Discard, r.Body)
+		<-r.Context().Done()
+	})
+
+	first := startServer(t, "DO_DB_PATH", path, "ANTHROPIC_API_KEY", "test-key", "ANTHROPIC_BASE_URL", hang.URL)
+	createSession(t, first, "s1", "alice")
+	job := generateSummary(t, first, "s1")
+	select {
+	case <-started:
+	case <-time.After(10 * time.Second):
+		t.Fatal("job never started")
+	}
+	// Shutting down mid-attempt leaves the job marked running
+	first.Close()
+
+	stub := newLLMStub(t, respondSummary)
+	second := newTestServer(t, "DO_DB_PATH", path, "ANTHROPIC_API_KEY", "test-key", "ANTHROPIC_BASE_URL", stub.URL)
+	done := waitForJob(t, second, job.ID)
+	if done.Status != models.JobDone {
+		t.Fatalf("job after restart = %+v, want done", done)
+	}
+	if done.Attempts != 2 {
+		t.Errorf("attempts = %d, want 2 (interrupted attempt plus the resumed one)", done.Attempts)
+	}
+}
@@ -92,6 +92,7 @@ type Summary struct {
 	DiscoveryTokens int     `json:"discovery_tokens" db:"discovery_tokens"`
 	SourceMessage   string  `json:"source_message,omitempty" db:"source_message"`   // Original assistant message
 	FullTranscript  string  `json:"full_transcript,omitempty" db:"full_transcript"` // Complete session transcript (JSONL)
+	Archived        bool    `json:"archived,omitempty" db:"-"`                      // Transcript moved to summary_archives; load via GET /api/summaries/:id
 }
 
 // Plan represents a development plan.
@@ -123,6 +124,28 @@ type Project struct {
 	LastActivity time.Time `json:"last_activity"`
 }
 
+// Summary job statuses.
+const (
+	JobQueued  = "queued"
+	JobRunning = "running"
+	JobDone    = "done"
+	JobFailed  = "failed"
+)
+
+// SummaryJob is a durable summary generation request processed in the background.
+type SummaryJob struct {
+	ID        int64     `json:"id" db:"id"`
+	SessionID string    `json:"session_id" db:"session_id"`
+	Status    string    `json:"status" db:"status"` // queued, running, done, failed
+	Attempts  int       `json:"attempts" db:"attempts"`
+	SummaryID *int64    `json:"summary_id,omitempty" db:"summary_id"`
+	Error     string    `json:"error,omitempty" db:"error"`
+	Payload   string    `json:"-" db:"payload"` // JSON-encoded GenerateSummaryRequest
+	RunAfter  time.Time `json:"run_after" db:"run_after"`
+	CreatedAt time.Time `json:"created_at" db:"created_at"`
+	UpdatedAt time.Time `json:"updated_at" db:"updated_at"`
+}
+
 // =============================================================================
 // Token Economics & Level Configuration
 // =============================================================================
@@ -166,10 +189,40 @@ type ContextInjectResponse struct {
 
 // HealthResponse is the health check response.
 type HealthResponse struct {
-	Status   string `json:"status"`
-	DBType   string `json:"db_type"`
-	DBStatus string `json:"db_status"`
-	Version  string `json:"version"`
+	Status   string                `json:"status"`
+	DBType   string                `json:"db_type"`
+	DBStatus string                `json:"db_status"`
+	Version  string                `json:"version"`
+	Cache    map[string]CacheStats `json:"cache,omitempty"`
+}
+
+// CacheStats holds hit/miss counters for a cache.
+type CacheStats struct {
+	Hits   uint64 `json:"hits"`
+	Misses uint64 `json:"misses"`
+}
+
+// MaintenanceReport is the result of a retention and compaction run.
+type MaintenanceReport struct {
+	Pruned            map[string]int64 `json:"pruned"` // rows deleted per table
+	ArchivedSummaries int              `json:"archived_summaries"`
+	BytesBefore       int64            `json:"bytes_before"`
+	BytesAfter        int64            `json:"bytes_after"`
+	BytesReclaimed    int64            `json:"bytes_reclaimed"`
+	StartedAt         time.Time        `json:"started_at"`
+	DurationMillis    int64            `json:"duration_ms"`
+}
+
+// PromptResponseEvent is the payload of a prompt.updated event: the response
+// recorded for the latest prompt of a session.
+type PromptResponseEvent struct {
+	SessionID string `json:"session_id"`
+	Response  string `json:"response"`
+}
+
+// StreamEnd is the last line of an NDJSON list page when more rows remain.
+type StreamEnd struct {
+	NextCursor string `json:"next_cursor"`
 }
 
 // ErrorResponse is a standard error response.
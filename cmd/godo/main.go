@@ -56,6 +56,7 @@ Usage:
   godo worker start     Start the memory worker
   godo worker stop      Stop the memory worker
   godo worker status    Show worker status
+  godo worker compact   Prune, archive and compact the memory database
   godo selfupdate       Update godo itself
   godo capture          Capture terminal buffer to file
   godo version          Show version
@@ -673,7 +674,7 @@ func registerProject(projectPath string) error {
 // runWorker handles worker subcommands: start, stop, status
 func runWorker() {
 	if len(os.Args) < 3 {
-		fmt.Println("Usage: godo worker [start|stop|status]")
+		fmt.Println("Usage: godo worker [start|stop|status|compact]")
 		os.Exit(1)
 	}
 
@@ -684,9 +685,11 @@ func runWorker() {
 		workerStop()
 	case "status":
 		workerStatus()
+	case "compact":
+		workerCompact()
 	default:
 		fmt.Printf("Unknown worker command: %s\n", os.Args[2])
-		fmt.Println("Usage: godo worker [start|stop|status]")
+		fmt.Println("Usage: godo worker [start|stop|status|compact]")
 		os.Exit(1)
 	}
 }
@@ -809,6 +812,64 @@ func workerStop() {
 	fmt.Printf("✓ Worker stopped (PID: %d)\n", pid)
 }
 
+func workerCompact() {
+	if !isWorkerRunning() {
+		fmt.Println("✗ Worker is not running")
+		fmt.Println("  Start with: godo worker start")
+		os.Exit(1)
+	}
+
+	fmt.Println("Compacting memory database...")
+	client := &http.Client{Timeout: 30 * time.Minute}
+	resp, err := client.Post("http://127.0.0.1:3778/api/maintenance/compact", "application/json", nil)
+	if err != nil {
+		fmt.Printf("✗ Compaction failed: %v\n", err)
+		os.Exit(1)
+	}
+	defer resp.Body.Close()
+
+	var report struct {
+		Pruned            map[string]int64 `json:"pruned"`
+		ArchivedSummaries int              `json:"archived_summaries"`
+		BytesBefore       int64            `json:"bytes_before"`
+		BytesAfter        int64            `json:"bytes_after"`
+		BytesReclaimed    int64            `json:"bytes_reclaimed"`
+		DurationMillis    int64            `json:"duration_ms"`
+		Message           string           `json:"message"`
+	}
+	if err := json.NewDecoder(resp.Body).Decode(&report); err != nil {
+		fmt.Printf("✗ Compaction failed: %v\n", err)
+		os.Exit(1)
+	}
+	if resp.StatusCode != http.StatusOK {
+		fmt.Printf("✗ Compaction failed: %s\n", report.Message)
+		os.Exit(1)
+	}
+
+	fmt.Printf("✓ Reclaimed %s (%s → %s) in %dms\n",
+		formatBytes(report.BytesReclaimed), formatBytes(report.BytesBefore), formatBytes(report.BytesAfter), report.DurationMillis)
+	for table, n := range report.Pruned {
+		fmt.Printf("  Pruned %s: %d rows\n", table, n)
+	}
+	fmt.Printf("  Archived transcripts: %d\n", report.ArchivedSummaries)
+}
+
+func formatBytes(n int64) string {
+	if n < 0 {
+		return "-" + formatBytes(-n)
+	}
+	const unit = 1024
+	if n < unit {
+		return fmt.Sprintf("%d B", n)
+	}
+	div, exp := int64(unit), 0
+	for m := n / unit; m >= unit; m /= unit {
+		div *= unit
+		exp++
+	}
+	return fmt.Sprintf("%.1f %cB", float64(n)/float64(div), "KMGT"[exp])
+}
+
 func workerStatus() {
 	if isWorkerRunning() {
 		pid := getWorkerPID()
@@ -829,9 +890,34 @@ func workerStatus() {
 				}
 			}
 		}
+		printWorkerMetrics()
 	} else {
 		fmt.Println("✗ Worker is not running")
 		fmt.Println("  Start with: godo worker start")
 	}
 }
 
+// printWorkerMetrics prints the batch queue depth and cache hit ratios from /metrics
+func printWorkerMetrics() {
+	resp, err := http.Get("http://127.0.0.1:3778/metrics")
+	if err != nil {
+		return
+	}
+	defer resp.Body.Close()
+
+	scanner := bufio.NewScanner(resp.Body)
+	for scanner.Scan() {
+		line := scanner.Text()
+		switch {
+		case strings.HasPrefix(line, "do_observation_queue_depth "):
+			fmt.Printf("  Queue: %s pending observations\n", strings.TrimPrefix(line, "do_observation_queue_depth "))
+		case strings.HasPrefix(line, "do_cache_hit_ratio{"):
+			// do_cache_hit_ratio{cache="context"} 0.93
+			name, value, ok := strings.Cut(strings.TrimPrefix(line, "do_cache_hit_ratio{cache="), "} ")
+			if ok {
+				fmt.Printf("  Cache %s hit ratio: %s\n", strings.Trim(name, `"`), value)
+			}
+		}
+	}
+}
+